@@ -0,0 +1,60 @@
+"""Benchmark the start-up time of the `cowid` CLI.
+
+Each command is run in a fresh Python process (as with any `cowid` call), and the best and median wall times are
+reported.
+
+Example usage:
+
+```
+python benchmark_cli_import.py --repeat 10
+```
+"""
+
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+
+COMMANDS = {
+    "import": ["-c", "import cowidev.cmd.__main__"],
+    "cowid --help": ["-m", "cowidev.cmd", "--help"],
+    "cowid check --help": ["-m", "cowidev.cmd", "check", "--help"],
+}
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the start-up time of the `cowid` CLI.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Number of runs of each command.",
+    )
+    args = parser.parse_args()
+    return args
+
+
+def time_command(args, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, *args], check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - t0)
+    return min(times), statistics.median(times)
+
+
+def main():
+    args = _parse_args()
+    for name, command in COMMANDS.items():
+        best, median = time_command(command, args.repeat)
+        print(f"{name:<20} best: {best:.3f} s, median: {median:.3f} s ({args.repeat} runs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,7 @@ from cowidev import PATHS
 from cowidev.cases_deaths.params import (
     zero_day,
     DATASET_NAME,
-    AGGREGATE_REGIONS_SPEC,
+    get_aggregate_regions_spec,
     METRICS_BASE,
     COLUMNS_BASE,
     METRICS_PER_MILLION,
@@ -17,7 +17,7 @@ from cowidev.cases_deaths.params import (
 
 def export_grapher_file(df, logger):
     # The rest of the CSVs
-    succeed = _export_grapher_file(df, PATHS.DATA_CASES_DEATHS_DIR, DATASET_NAME)
+    succeed = export_data(df, PATHS.DATA_CASES_DEATHS_DIR, DATASET_NAME)
     if succeed:
         logger.info(
             "Successfully exported CSVs to %s\n" % colored(os.path.abspath(PATHS.DATA_CASES_DEATHS_DIR), "magenta")
@@ -27,20 +27,21 @@ def export_grapher_file(df, logger):
         raise ValueError("Case/Death export failed.")
 
 
-def _export_grapher_file(df, output_path, grapher_name):
+def export_data(df, output_path, grapher_name, aggregates_spec=None):
+    """Export the output of `cowidev.cases_deaths.transform.process_data`: grapher file, full_data.csv and one
+    wide-format file per metric."""
+    if aggregates_spec is None:
+        aggregates_spec = get_aggregate_regions_spec()
     # Grapher
-    df_grapher = df.copy()
-    df_grapher["date"] = pd.to_datetime(df_grapher["date"]).map(lambda date: (date - zero_day).days)
-    df_grapher = (
-        df_grapher[GRAPHER_COL_NAMES.keys()]
-        .rename(columns=GRAPHER_COL_NAMES)
-        .to_csv(os.path.join(output_path, "%s.csv" % grapher_name), index=False)
+    df_grapher = df[GRAPHER_COL_NAMES.keys()].assign(date=(pd.to_datetime(df["date"]) - zero_day).dt.days)
+    df_grapher.rename(columns=GRAPHER_COL_NAMES).to_csv(
+        os.path.join(output_path, "%s.csv" % grapher_name), index=False
     )
 
     # Table & public extracts for external users
     # Excludes aggregates
     excluded_aggregates = list(
-        set(AGGREGATE_REGIONS_SPEC.keys())
+        set(aggregates_spec.keys())
         - set(
             [
                 "World",
@@ -1,6 +1,11 @@
 from datetime import datetime
+from functools import lru_cache
 
-from cowidev.cases_deaths.utils import load_eu_country_names, load_owid_continents, load_wb_income_groups
+from cowidev.cases_deaths.utils import (
+    load_eu_country_names,
+    get_locations_by_continent,
+    get_locations_by_wb_income_group,
+)
 from cowidev.utils.slackapi import SlackAPI
 
 
@@ -22,34 +27,35 @@ ZERO_DAY = "2020-01-21"
 zero_day = datetime.strptime(ZERO_DAY, "%Y-%m-%d")
 
 
-########################################################################################
-# Functions to load region data
-########################################################################################
-
-LOCATIONS_BY_CONTINENT = load_owid_continents().groupby("continent")["location"].apply(list).to_dict()
-LOCATIONS_BY_WB_INCOME_GROUP = load_wb_income_groups().groupby("income_group")["location"].apply(list).to_dict()
-
-
 ########################################################################################
 # Specs on various regions
 ########################################################################################
-AGGREGATE_REGIONS_SPEC = {
-    # World
-    "World": {"include": None, "exclude": None},
-    "World excl. China": {"exclude": ["China"]},
-    "World excl. China and South Korea": {"exclude": ["China", "South Korea"]},
-    "World excl. China, South Korea, Japan and Singapore": {"exclude": ["China", "South Korea", "Japan", "Singapore"]},
-    # European Union
-    "European Union": {"include": load_eu_country_names()},
-    # OWID continents
-    **{continent: {"include": locations, "exclude": None} for continent, locations in LOCATIONS_BY_CONTINENT.items()},
-    "Asia excl. China": {"include": list(set(LOCATIONS_BY_CONTINENT["Asia"]) - set(["China"]))},
-    # World Bank income groups
-    **{
-        income_group: {"include": locations, "exclude": None}
-        for income_group, locations in LOCATIONS_BY_WB_INCOME_GROUP.items()
-    },
-}
+@lru_cache(maxsize=None)
+def get_aggregate_regions_spec():
+    """Regions to aggregate (built on first use, as it requires loading region data)."""
+    locations_by_continent = get_locations_by_continent()
+    return {
+        # World
+        "World": {"include": None, "exclude": None},
+        "World excl. China": {"exclude": ["China"]},
+        "World excl. China and South Korea": {"exclude": ["China", "South Korea"]},
+        "World excl. China, South Korea, Japan and Singapore": {
+            "exclude": ["China", "South Korea", "Japan", "Singapore"]
+        },
+        # European Union
+        "European Union": {"include": load_eu_country_names()},
+        # OWID continents
+        **{
+            continent: {"include": locations, "exclude": None}
+            for continent, locations in locations_by_continent.items()
+        },
+        "Asia excl. China": {"include": list(set(locations_by_continent["Asia"]) - set(["China"]))},
+        # World Bank income groups
+        **{
+            income_group: {"include": locations, "exclude": None}
+            for income_group, locations in get_locations_by_wb_income_group().items()
+        },
+    }
 
 
 ########################################################################################
@@ -90,6 +96,16 @@ LARGE_DATA_CORRECTIONS = [
 ]
 
 
+########################################################################################
+# Population
+########################################################################################
+# Population values used for per-capita metrics, overriding those from the UN
+POPULATION_FIXES = {
+    # Should not include overseas territories for the WHO
+    "France": 64626624,
+}
+
+
 ########################################################################################
 # Doubling days
 ########################################################################################
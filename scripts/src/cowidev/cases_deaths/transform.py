@@ -1,13 +1,23 @@
+"""Cases/Deaths metrics engine.
+
+Computes all derived metrics (aggregates, growth, per-capita, rolling averages, CFR, etc.) from daily and cumulative
+cases and deaths by location. Used by both the WHO (`cowid casedeath`) and JHU (`cowid jhu`) pipelines, which only
+differ in their source-specific parameters (see `process_data`).
+
+All metrics are computed with grouped vectorized operations, on rows sorted by (location, date).
+"""
 import pandas as pd
 import numpy as np
 
 from cowidev.megafile.steps.test import get_testing
 from cowidev.cases_deaths.params import (
     LARGE_DATA_CORRECTIONS,
-    AGGREGATE_REGIONS_SPEC,
+    POPULATION_FIXES,
+    get_aggregate_regions_spec,
     DOUBLING_DAYS_SPEC,
     ROLLING_AVG_SPEC,
     DAYS_SINCE_SPEC,
+    METRICS_BASE,
 )
 from cowidev.cases_deaths.utils import load_population
 
@@ -15,33 +25,46 @@ from cowidev.cases_deaths.utils import load_population
 # ================================================
 # Main functions
 # ================================================
-def process_data(df):
+def process_data(
+    df,
+    data_corrections=LARGE_DATA_CORRECTIONS,
+    aggregates_spec=None,
+    population=None,
+    population_fixes=POPULATION_FIXES,
+):
+    """Compute all metrics.
+
+    Args:
+        df (pd.DataFrame): Input data, with columns date, location, new_cases, new_deaths, total_cases and
+                           total_deaths.
+        data_corrections (list, optional): (location, date, metric) triplets where the daily metric should be set to
+                                           NaN. Defaults to LARGE_DATA_CORRECTIONS.
+        aggregates_spec (dict, optional): Regions to aggregate. Defaults to `get_aggregate_regions_spec()`.
+        population (pd.DataFrame, optional): Population table (location, population_year, population). Loaded with
+                                             `load_population` if None.
+        population_fixes (dict, optional): Population values to use for per-capita metrics instead of those in
+                                           `population`, by location. Defaults to POPULATION_FIXES.
+
+    Returns:
+        pd.DataFrame: Data with all metrics, sorted by location and date.
+    """
+    if population is None:
+        population = load_population()
     df = (
         df[["date", "location", "new_cases", "new_deaths", "total_cases", "total_deaths"]]
         .pipe(format_date)
-        .pipe(discard_rows)
-        .pipe(inject_owid_aggregates)
+        .pipe(discard_rows, data_corrections)
+        .pipe(inject_owid_aggregates, aggregates_spec)
         .pipe(inject_weekly_growth)
         .pipe(inject_biweekly_growth)
         .pipe(inject_doubling_days)
-        .pipe(
-            inject_per_million,
-            [
-                "new_cases",
-                "new_deaths",
-                "total_cases",
-                "total_deaths",
-                "weekly_cases",
-                "weekly_deaths",
-                "biweekly_cases",
-                "biweekly_deaths",
-            ],
-        )
+        .pipe(inject_population, population)
+        .pipe(inject_per_million, METRICS_BASE, population_fixes)
         .pipe(inject_rolling_avg)
         .pipe(inject_cfr)
         .pipe(inject_days_since)
         .pipe(inject_exemplars)
-        .sort_values(by=["location", "date"])
+        .pipe(drop_population)
     )
     return df
 
@@ -53,14 +76,13 @@ def process_data(df):
 
 def format_date(df: pd.DataFrame) -> pd.DataFrame:
     print("Formatting date…")
-    df["date"] = pd.to_datetime(df["date"], format="%Y-%m-%d")
-    return df
+    return df.assign(date=pd.to_datetime(df["date"], format="%Y-%m-%d"))
 
 
 # ================================================
 # Discard rows
 # ================================================
-def discard_rows(df):
+def discard_rows(df, data_corrections=LARGE_DATA_CORRECTIONS):
     print("Discarding rows…")
     # For all rows where new_cases or new_deaths is negative, we keep the cumulative value but set
     # the daily change to NA. This also sets the 7-day rolling average to NA for the next 7 days.
@@ -68,62 +90,72 @@ def discard_rows(df):
     df.loc[df.new_deaths < 0, "new_deaths"] = np.nan
 
     # Custom data corrections
-    for ldc in LARGE_DATA_CORRECTIONS:
-        df.loc[(df.location == ldc[0]) & (df.date.astype(str) == ldc[1]), f"new_{ldc[2]}"] = np.nan
+    if data_corrections:
+        corrections = pd.DataFrame(data_corrections, columns=["location", "date", "metric"])
+        corrections["date"] = pd.to_datetime(corrections["date"])
+        for metric, corrections_metric in corrections.groupby("metric"):
+            msk = pd.MultiIndex.from_frame(df[["location", "date"]]).isin(
+                pd.MultiIndex.from_frame(corrections_metric[["location", "date"]])
+            )
+            df.loc[msk, f"new_{metric}"] = np.nan
 
     # If the last known value is above 1000 cases or 100 deaths but the latest reported value is 0
     # then set that value to NA in case it's a temporary reporting error. (Up to 7 days in the past)
-    df = df.sort_values(["location", "date"]).groupby("location").apply(hide_recent_zeros)
-
-    return df
+    df = df.dropna(subset=["location"]).sort_values(["location", "date"])
+    return hide_recent_zeros(df)
 
 
 def hide_recent_zeros(df: pd.DataFrame) -> pd.DataFrame:
-    last_reported_date = df.date.max()
-
-    last_positive_cases_date = df.loc[df.new_cases > 0, "date"].max()
-    if pd.isnull(last_positive_cases_date):
-        return df
-    if last_positive_cases_date != last_reported_date:
-        last_known_cases = df.loc[df.date == last_positive_cases_date, "new_cases"].item()
-        if last_known_cases >= 100 and (last_reported_date - last_positive_cases_date).days < 7:
-            df.loc[df.date > last_positive_cases_date, "new_cases"] = np.nan
-
-    last_positive_deaths_date = df.loc[df.new_deaths > 0, "date"].max()
-    if pd.isnull(last_positive_deaths_date):
-        return df
-    if last_positive_deaths_date != last_reported_date:
-        last_known_deaths = df.loc[df.date == last_positive_deaths_date, "new_deaths"].item()
-        if last_known_deaths >= 10 and (last_reported_date - last_positive_deaths_date).days < 7:
-            df.loc[df.date > last_positive_deaths_date, "new_deaths"] = np.nan
-
+    """Set to NaN the latest zero daily values of a location, if these follow a large value (≥100 cases or ≥10
+    deaths) reported less than 7 days before its last reported date.
+
+    Deaths are only checked for locations with some positive daily cases. Rows must be sorted by location and date.
+    """
+    last_reported_date = df.groupby("location")["date"].transform("max")
+    has_positive_cases = df["location"].isin(df.loc[df.new_cases > 0, "location"])
+    for metric, threshold in [("new_cases", 100), ("new_deaths", 10)]:
+        last_positive = df.loc[df[metric] > 0, ["location", "date", metric]].drop_duplicates("location", keep="last")
+        last_positive = last_positive.set_index("location")
+        last_positive_date = df["location"].map(last_positive["date"])
+        last_known_value = df["location"].map(last_positive[metric])
+        msk = (
+            has_positive_cases
+            & (last_positive_date != last_reported_date)
+            & (last_known_value >= threshold)
+            & ((last_reported_date - last_positive_date).dt.days < 7)
+            & (df["date"] > last_positive_date)
+        )
+        df.loc[msk, metric] = np.nan
     return df
 
 
 # ================================================
 # OWID aggregates
 # ================================================
-def inject_owid_aggregates(df):
+def inject_owid_aggregates(df, aggregates_spec=None):
     print("Adding aggregates…")
+    if aggregates_spec is None:
+        aggregates_spec = get_aggregate_regions_spec()
 
     def _sum_aggregate(df, name, include=None, exclude=None):
-        df = df.copy()
         if include:
             df = df[df["location"].isin(include)]
         if exclude:
             df = df[~df["location"].isin(exclude)]
-        df = df.groupby("date").sum().reset_index()
+        df = df.groupby("date")[["new_cases", "new_deaths", "total_cases", "total_deaths"]].sum().reset_index()
         df["location"] = name
         return df
 
-    return pd.concat(
+    df = pd.concat(
         [
             df,
-            *[_sum_aggregate(df, name, **params) for name, params in AGGREGATE_REGIONS_SPEC.items()],
+            *[_sum_aggregate(df, name, **params) for name, params in aggregates_spec.items()],
         ],
         sort=True,
         ignore_index=True,
     )
+    # All subsequent (grouped) operations rely on this order
+    return df.sort_values(["location", "date"], kind="stable", ignore_index=True)
 
 
 # ====================================
@@ -148,18 +180,13 @@ def _inject_growth(df, prefix, periods):
     deaths_growth_colname = "%s_pct_growth_deaths" % prefix
 
     df[[cases_colname, deaths_colname]] = (
-        df[["location", "new_cases", "new_deaths"]]
-        .groupby("location")[["new_cases", "new_deaths"]]
-        .rolling(window=periods, min_periods=periods - 1, center=False)
-        .sum()
-        .reset_index(level=0, drop=True)
+        _grouped_rolling(df, ["new_cases", "new_deaths"], periods, periods - 1).sum().reset_index(level=0, drop=True)
     )
     df[[cases_growth_colname, deaths_growth_colname]] = (
-        df[["location", cases_colname, deaths_colname]]
-        .groupby("location")[[cases_colname, deaths_colname]]
+        df.groupby("location", sort=False)[[cases_colname, deaths_colname]]
         .pct_change(periods=periods, fill_method=None)
         .round(3)
-        .replace([np.inf, -np.inf], pd.NA)
+        .replace([np.inf, -np.inf], np.nan)
         * 100
     )
 
@@ -169,6 +196,16 @@ def _inject_growth(df, prefix, periods):
     return df
 
 
+def _grouped_rolling(df, columns, window, min_periods):
+    """Rolling window over `columns` within each location (rows are sorted by location and date)."""
+    return (
+        df[["location"] + columns]
+        .astype({col: float for col in columns})
+        .groupby("location", sort=False)[columns]
+        .rolling(window=window, min_periods=min_periods)
+    )
+
+
 # ================================================
 # Doubling days calculation
 # ================================================
@@ -176,23 +213,21 @@ def _inject_growth(df, prefix, periods):
 
 def inject_doubling_days(df):
     print("Adding doubling days…")
+    for value_col in {spec["value_col"] for spec in DOUBLING_DAYS_SPEC.values()}:
+        df.loc[df[value_col] == 0, value_col] = np.nan
     for col, spec in DOUBLING_DAYS_SPEC.items():
-        value_col = spec["value_col"]
         periods = spec["periods"]
-        df.loc[df[value_col] == 0, value_col] = np.nan
-        df[col] = (
-            df.groupby("location", as_index=False)[value_col]
-            .pct_change(periods=periods, fill_method=None)[value_col]
-            .map(lambda pct: pct_change_to_doubling_days(pct, periods))
+        pct_change = df.groupby("location", sort=False)[spec["value_col"]].pct_change(
+            periods=periods, fill_method=None
         )
+        df[col] = pct_change_to_doubling_days(pct_change, periods)
     return df
 
 
 def pct_change_to_doubling_days(pct_change, periods):
-    if pd.notnull(pct_change) and pct_change != 0:
-        doubling_days = periods * np.log(2) / np.log(1 + pct_change)
-        return np.round(doubling_days, decimals=2)
-    return pd.NA
+    with np.errstate(divide="ignore", invalid="ignore"):
+        doubling_days = np.round(periods * np.log(2) / np.log(1 + pct_change), decimals=2)
+    return doubling_days.where(pct_change.notnull() & (pct_change != 0))
 
 
 # ================================================
@@ -200,22 +235,25 @@ def pct_change_to_doubling_days(pct_change, periods):
 # ================================================
 
 
-def inject_per_million(df, measures):
+def inject_per_million(df, measures, population_fixes=None):
     print("Adding per-capita metrics…")
-    df = inject_population(df)
-    # Fix population value for France (Should not include overseas territories for the WHO)
-    df.loc[df.location == "France", "population"] = 64626624
+    population = df["population"]
+    if population_fixes:
+        # e.g. France population should not include overseas territories for the WHO
+        msk = df["location"].isin(population_fixes)
+        population = population.mask(msk, df["location"].map(population_fixes))
     for measure in measures:
         pop_measure = measure + "_per_million"
-        series = df[measure] / (df["population"] / 1e6)
+        series = df[measure] / (population / 1e6)
         df[pop_measure] = series.round(decimals=3)
-    df = drop_population(df)
     return df
 
 
 # Useful for adding it to regions.csv and
-def inject_population(df):
-    return df.merge(load_population(), how="left", on="location")
+def inject_population(df, population=None):
+    if population is None:
+        population = load_population()
+    return df.merge(population, how="left", on="location")
 
 
 def drop_population(df):
@@ -229,19 +267,12 @@ def drop_population(df):
 
 def inject_rolling_avg(df):
     print("Adding rolling-average metrics…")
-    df = df.copy().sort_values(by="date")
     for col, spec in ROLLING_AVG_SPEC.items():
-        df[col] = df[spec["col"]].astype("float")
         df[col] = (
-            df.groupby("location")[col]
-            .rolling(
-                window=spec["window"],
-                min_periods=spec["min_periods"],
-                center=spec["center"],
-            )
+            _grouped_rolling(df, [spec["col"]], spec["window"], spec["min_periods"])
             .mean()
             .round(decimals=3)
-            .reset_index(level=0, drop=True)
+            .reset_index(level=0, drop=True)[spec["col"]]
         )
     return df
 
@@ -253,15 +284,9 @@ def inject_rolling_avg(df):
 
 def inject_cfr(df):
     print("Adding case-fatality-rate metrics…")
-
-    def _apply_row_cfr_100(row):
-        if pd.notnull(row["total_cases"]) and row["total_cases"] >= 100:
-            return row["cfr"]
-        return pd.NA
-
     cfr_series = (df["total_deaths"] / df["total_cases"]) * 100
     df["cfr"] = cfr_series.round(decimals=3)
-    df["cfr_100_cases"] = df.apply(_apply_row_cfr_100, axis=1)
+    df["cfr_100_cases"] = df["cfr"].where(df["total_cases"] >= 100)
     return df
 
 
@@ -272,37 +297,12 @@ def inject_cfr(df):
 
 def inject_days_since(df):
     print("Adding days-since metrics…")
-
-    def _days_since(df, spec):
-        def _get_date_of_threshold(df, col, threshold):
-            try:
-                return df["date"][df[col] >= threshold].iloc[0]
-            except Exception:
-                return None
-
-        def _date_diff(a, b, positive_only=False):
-            if pd.isnull(a) or pd.isnull(b):
-                return None
-            diff = (a - b).days
-            if positive_only and diff < 0:
-                return None
-            return diff
-
-        ref_date = pd.to_datetime(_get_date_of_threshold(df, spec["value_col"], spec["value_threshold"]))
-        return (
-            pd.to_datetime(df["date"])
-            .map(lambda date: _date_diff(date, ref_date, spec["positive_only"]))
-            .astype("Int64")
-        )
-
-    df = df.copy()
     for col, spec in DAYS_SINCE_SPEC.items():
-        df[col] = (
-            df[["date", "location", spec["value_col"]]]
-            .groupby("location")
-            .apply(lambda df_group: _days_since(df_group, spec))
-            .reset_index(level=0, drop=True)
-        )
+        ref_date = df.loc[df[spec["value_col"]] >= spec["value_threshold"]].groupby("location")["date"].min()
+        days_since = (df["date"] - df["location"].map(ref_date)).dt.days.astype("Int64")
+        if spec["positive_only"]:
+            days_since = days_since.where(days_since >= 0)
+        df[col] = days_since
     return df
 
 
@@ -313,31 +313,18 @@ def inject_days_since(df):
 
 def inject_exemplars(df):
     print("Adding exemplars metrics…")
-    df = inject_population(df)
+    msk_pop = df["population"] >= 5e6
 
     # Inject days since 100th case IF population ≥ 5M
-    def mapper_days_since(row):
-        if pd.notnull(row["population"]) and row["population"] >= 5e6:
-            return row["days_since_100_total_cases"]
-        return pd.NA
-
-    df["days_since_100_total_cases_and_5m_pop"] = df.apply(mapper_days_since, axis=1)
+    df["days_since_100_total_cases_and_5m_pop"] = df["days_since_100_total_cases"].where(msk_pop)
 
     # Inject boolean when all exenplar conditions hold
     # Use int because the Grapher doesn't handle non-ints very well
     countries_with_testing_data = set(get_testing()["location"])
+    df["5m_pop_and_21_days_since_100_cases_and_testing"] = (
+        msk_pop
+        & (df["days_since_100_total_cases"] >= 21).fillna(False)
+        & df["location"].isin(countries_with_testing_data)
+    ).astype(int)
 
-    def mapper_bool(row):
-        if (
-            pd.notnull(row["days_since_100_total_cases"])
-            and pd.notnull(row["population"])
-            and row["days_since_100_total_cases"] >= 21
-            and row["population"] >= 5e6
-            and row["location"] in countries_with_testing_data
-        ):
-            return 1
-        return 0
-
-    df["5m_pop_and_21_days_since_100_cases_and_testing"] = df.apply(mapper_bool, axis=1)
-
-    return drop_population(df)
+    return df
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import pandas as pd
 
 from cowidev import PATHS
@@ -9,59 +11,104 @@ from cowidev import PATHS
 
 
 def load_population(year=2021):
+    """Load the population of each location, for the year closest to `year` (in either direction).
+
+    Loaded once per `year` and cached.
+    """
+    return _load_population(year).copy()
+
+
+@lru_cache(maxsize=None)
+def _load_population(year):
     df = pd.read_csv(
         PATHS.INTERNAL_INPUT_UN_POPULATION_FILE,
         keep_default_na=False,
         usecols=["entity", "year", "population"],
     )
+    # Closest available year for each entity (ties resolved to the earliest year)
+    entities = pd.DataFrame({"entity": df["entity"].unique(), "year_ref": year})
+    df = pd.merge_asof(
+        entities.sort_values("year_ref"),
+        df.sort_values("year", kind="stable"),
+        left_on="year_ref",
+        right_on="year",
+        by="entity",
+        direction="nearest",
+    )
     return (
-        pd.DataFrame([_find_closest_year_row(df_group, year) for loc, df_group in df.groupby("entity")])
+        df[["entity", "year", "population"]]
         .dropna()
+        .sort_values("entity", ignore_index=True)
         .rename(columns={"entity": "location", "year": "population_year"})
     )
 
 
-def _find_closest_year_row(df, year=2021):
-    """Returns the row which is closest to the year specified (in either direction)"""
-    df = df.copy()
-    df["year"] = df["year"].sort_values(ascending=True)
-    return df.loc[df["year"].map(lambda x: abs(x - year)).idxmin()]
-
-
 ########################################################################################
 # Functions to load region data
 ########################################################################################
 
 
-def load_eu_country_names():
-    """Load list with EU country names."""
-    df = pd.read_csv(
+@lru_cache(maxsize=None)
+def load_locations_table():
+    """Reference table of locations, with their OWID continent, World Bank income group and EU membership.
+
+    All region data is read from this table, which is loaded once and cached. Do not modify it in place.
+    """
+    continents = pd.read_csv(
+        PATHS.INTERNAL_INPUT_OWID_CONT_FILE,
+        keep_default_na=False,
+        header=0,
+        names=["location", "code", "year", "continent"],
+        usecols=["location", "continent"],
+    )
+    income_groups = pd.read_csv(
+        PATHS.INTERNAL_INPUT_WB_INCOME_FILE,
+        keep_default_na=False,
+        header=0,
+        names=["location", "code", "income_group", "year"],
+        usecols=["location", "income_group"],
+    )
+    eu = pd.read_csv(
         PATHS.INTERNAL_INPUT_OWID_EU_FILE,
         keep_default_na=False,
         header=0,
         names=["location", "eu"],
         usecols=["location"],
+    ).assign(eu=True)
+    return (
+        continents.merge(income_groups, on="location", how="outer")
+        .merge(eu, on="location", how="outer")
+        .fillna({"eu": False})
+        .astype({"eu": bool})
     )
-    return df["location"].tolist()
+
+
+def load_eu_country_names():
+    """Load list with EU country names."""
+    df = load_locations_table()
+    return df.loc[df["eu"], "location"].tolist()
 
 
 def load_owid_continents():
     """Load table with OWID continent names."""
-    return pd.read_csv(
-        PATHS.INTERNAL_INPUT_OWID_CONT_FILE,
-        keep_default_na=False,
-        header=0,
-        names=["location", "code", "year", "continent"],
-        usecols=["location", "continent"],
-    )
+    return load_locations_table()[["location", "continent"]].dropna().reset_index(drop=True)
 
 
 def load_wb_income_groups():
     """Load table with World Bank income group names."""
-    return pd.read_csv(
-        PATHS.INTERNAL_INPUT_WB_INCOME_FILE,
-        keep_default_na=False,
-        header=0,
-        names=["location", "code", "income_group", "year"],
-        usecols=["location", "income_group"],
-    )
+    return load_locations_table()[["location", "income_group"]].dropna().reset_index(drop=True)
+
+
+@lru_cache(maxsize=None)
+def _get_locations_by(column):
+    return load_locations_table().dropna(subset=[column]).groupby(column)["location"].agg(list).to_dict()
+
+
+def get_locations_by_continent():
+    """Get the locations in each OWID continent, as a dictionary."""
+    return _get_locations_by("continent")
+
+
+def get_locations_by_wb_income_group():
+    """Get the locations in each World Bank income group, as a dictionary."""
+    return _get_locations_by("income_group")
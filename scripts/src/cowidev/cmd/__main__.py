@@ -2,24 +2,29 @@ import click
 
 from cowidev.utils.params import CONFIG
 from cowidev.utils.log import get_logger
-from cowidev.cmd.commons.utils import OrderedGroup
-from cowidev.cmd.testing import click_test
-from cowidev.cmd.vax import click_vax
-from cowidev.cmd.hosp import click_hosp
-from cowidev.cmd.cases_deaths import click_cases_deaths
-from cowidev.cmd.jhu import click_jhu
-from cowidev.cmd.xm import click_xm
-from cowidev.cmd.gmobility import click_gm
-from cowidev.cmd.variants import click_variants
-from cowidev.cmd.oxcgrt import click_oxcgrt
-from cowidev.cmd.megafile import click_megafile
-from cowidev.cmd.decoupling import click_decoup
-from cowidev.cmd.sweden import click_sweden
-from cowidev.cmd.uk_nations import click_uk_nations
-from cowidev.cmd.check import click_check
+from cowidev.cmd.commons.utils import LazyGroup
 
 
-@click.group(name="cowid", cls=OrderedGroup)
+# Subcommands, only imported when used: {name: import path}. Their help is the docstring of the command function.
+SUBCOMMANDS = {
+    "megafile": "cowidev.cmd.megafile.click_megafile",
+    "test": "cowidev.cmd.testing.core.click_test",
+    "vax": "cowidev.cmd.vax.core.click_vax",
+    "hosp": "cowidev.cmd.hosp.click_hosp",
+    "jhu": "cowidev.cmd.jhu.click_jhu",
+    "casedeath": "cowidev.cmd.cases_deaths.click_cases_deaths",
+    "variants": "cowidev.cmd.variants.click_variants",
+    "xm": "cowidev.cmd.xm.click_xm",
+    "gmobility": "cowidev.cmd.gmobility.click_gm",
+    "oxcgrt": "cowidev.cmd.oxcgrt.click_oxcgrt",
+    "decoupling": "cowidev.cmd.decoupling.click_decoup",
+    "sweden": "cowidev.cmd.sweden.click_sweden",
+    "uk-nations": "cowidev.cmd.uk_nations.click_uk_nations",
+    "check": "cowidev.cmd.check.click_check",
+}
+
+
+@click.group(name="cowid", cls=LazyGroup, lazy_subcommands=SUBCOMMANDS)
 @click.option(
     "--parallel/--no-parallel",
     default=CONFIG.execution.parallel,
@@ -53,21 +58,5 @@ def cli(ctx, parallel, n_jobs, server):
         ctx.obj["logger"] = get_logger()
 
 
-cli.add_command(click_megafile)
-cli.add_command(click_test)
-cli.add_command(click_vax)
-cli.add_command(click_hosp)
-cli.add_command(click_jhu)
-cli.add_command(click_cases_deaths)
-cli.add_command(click_variants)
-cli.add_command(click_xm)
-cli.add_command(click_gm)
-cli.add_command(click_oxcgrt)
-cli.add_command(click_decoup)
-cli.add_command(click_sweden)
-cli.add_command(click_uk_nations)
-cli.add_command(click_check)
-
-
 if __name__ == "__main__":
     cli()
@@ -1,11 +1,13 @@
 import datetime
 import pytz
 import os
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 
 import click
 
 from cowidev.cmd.commons.utils import OrderedGroup, feedback_log
+from cowidev.utils.web.download import read_csv_tail
 
 
 CASES_DEATHS_URL = "https://raw.githubusercontent.com/owid/covid-19-data/master/public/data/cases_deaths/full_data.csv"
@@ -18,16 +20,40 @@ FULL_URL_XLSX = "https://covid.ourworldindata.org/data/owid-covid-data.xlsx"
 # FULL_URL_JSON = "https://covid.ourworldindata.org/data/owid-covid-data.json"
 
 
+# Checks for each command (keyword arguments of `check_updated` and `feedback_log`)
+CHECKS = {
+    "vax": [
+        dict(url=VAX_URL, date_col="date", allowed_days=1, weekends=False, step="vaccinations"),
+    ],
+    "jhu": [
+        dict(url=JHU_URL, date_col="date", allowed_days=1, weekends=True, step="jhu", local_check=True),
+    ],
+    "test": [
+        dict(url=TESTING_URL, date_col="Date", allowed_days=7, weekends=False, step="vaccinations"),
+    ],
+    "hosp": [
+        dict(url=HOSP_URL, date_col="date", allowed_days=1, weekends=True, step="hospital"),
+    ],
+    "casedeath": [
+        dict(url=CASES_DEATHS_URL, date_col="date", allowed_days=8, weekends=True, step="casedeath", local_check=True),
+    ],
+    "megafile": [
+        dict(url=FULL_URL_CSV, date_col="date", allowed_days=1, weekends=True, step="megafile"),
+        dict(url=FULL_URL_XLSX, date_col="date", allowed_days=1, weekends=True, step="megafile"),
+        # dict(url=FULL_URL_JSON, date_col="date", allowed_days=1, weekends=True, step="megafile"),
+    ],
+}
+
+
 def check_updated(url, date_col, allowed_days, weekends, local_check=False, url_local=None) -> None:
     if not weekends and datetime.datetime.today().weekday() in [5, 6]:
         print("Today is a weekend, skipping...")
         return
-    if url.endswith(".csv"):
-        df = pd.read_csv(url)
-    elif url.endswith(".xlsx"):
-        df = pd.read_excel(url)
-    max_date = df[date_col].max()
-    if max_date < str(datetime.date.today() - datetime.timedelta(days=allowed_days)):
+    date_limit = str(datetime.date.today() - datetime.timedelta(days=allowed_days))
+    max_date = get_max_date(url, date_col, date_limit)
+    if max_date is None:
+        raise Exception(f"No valid dates found in column `{date_col}`! URL is '{url}'")
+    if max_date < date_limit:
         raise Exception(
             f"Data is not updated (exceeded maximum allowed days of {allowed_days})! Last date is {max_date}. "
             "Please check if something is broken in our pipeline and/or if someone is in charge of today's "
@@ -49,6 +75,50 @@ def check_updated(url, date_col, allowed_days, weekends, local_check=False, url_
     print("Check passed. All good!")
 
 
+def get_max_date(url, date_col, date_limit):
+    """Get the latest date (YYYY-MM-DD) in column `date_col` of the remote file. None if the column has no valid dates.
+
+    For CSVs, only the trailing rows are downloaded first. Files are sorted by location, so these rows only belong to
+    the last location(s): their latest date is a lower bound of that of the file. Hence, the complete file is only
+    read if this lower bound is older than `date_limit` (or if the trailing rows could not be read or have no valid
+    dates).
+    """
+    if url.endswith(".csv"):
+        df = read_csv_tail(url, usecols=[date_col])
+        if df is not None and (max_date := _max_date(df[date_col])) is not None and max_date >= date_limit:
+            return max_date
+        df = pd.read_csv(url, usecols=[date_col])
+    elif url.endswith(".xlsx"):
+        df = pd.read_excel(url, usecols=[date_col])
+    return _max_date(df[date_col])
+
+
+def _max_date(dates: pd.Series):
+    max_date = pd.to_datetime(dates, errors="coerce").max()
+    if pd.isnull(max_date):
+        return None
+    return max_date.strftime("%Y-%m-%d")
+
+
+def run_checks(server, checks):
+    """Run `checks` concurrently (checks mostly wait on network responses)."""
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        futures = [
+            executor.submit(
+                feedback_log,
+                func=check_updated,
+                server=server,
+                domain="Check",
+                hide_success=True,
+                channel="covid-19",
+                **check,
+            )
+            for check in checks
+        ]
+    for future in futures:
+        future.result()
+
+
 @click.group(name="check", chain=True, cls=OrderedGroup)
 @click.pass_context
 def click_check(ctx):
@@ -60,138 +130,49 @@ def click_check(ctx):
 @click.pass_context
 def click_check_vax(ctx):
     """Generate dataset."""
-    feedback_log(
-        func=check_updated,
-        url=VAX_URL,
-        date_col="date",
-        allowed_days=1,
-        weekends=False,
-        server=ctx.obj["server"],
-        domain="Check",
-        step="vaccinations",
-        hide_success=True,
-        channel="covid-19",
-    )
+    run_checks(ctx.obj["server"], CHECKS["vax"])
 
 
 @click.command(name="casedeath", short_help="Cases/Death data.")
 @click.pass_context
 def click_check_casedeath(ctx):
     """Upload dataset to DB."""
-    feedback_log(
-        func=check_updated,
-        url=CASES_DEATHS_URL,
-        date_col="date",
-        allowed_days=8,
-        weekends=True,
-        server=ctx.obj["server"],
-        domain="Check",
-        step="casedeath",
-        hide_success=True,
-        local_check=True,
-        channel="covid-19",
-    )
+    run_checks(ctx.obj["server"], CHECKS["casedeath"])
 
 
 @click.command(name="jhu", short_help="JHU data.")
 @click.pass_context
 def click_check_jhu(ctx):
     """Upload dataset to DB."""
-    feedback_log(
-        func=check_updated,
-        url=JHU_URL,
-        date_col="date",
-        allowed_days=1,
-        weekends=True,
-        server=ctx.obj["server"],
-        domain="Check",
-        step="jhu",
-        hide_success=True,
-        local_check=True,
-        channel="covid-19",
-    )
+    run_checks(ctx.obj["server"], CHECKS["jhu"])
 
 
 @click.command(name="test", short_help="Testing data.")
 @click.pass_context
 def click_check_test(ctx):
     """Upload dataset to DB."""
-    feedback_log(
-        func=check_updated,
-        url=TESTING_URL,
-        date_col="Date",
-        allowed_days=7,
-        weekends=False,
-        server=ctx.obj["server"],
-        domain="Check",
-        step="vaccinations",
-        hide_success=True,
-        channel="covid-19",
-    )
+    run_checks(ctx.obj["server"], CHECKS["test"])
 
 
 @click.command(name="hosp", short_help="Hospital & ICU data.")
 @click.pass_context
 def click_check_hosp(ctx):
     """Upload dataset to DB."""
-    feedback_log(
-        func=check_updated,
-        url=HOSP_URL,
-        date_col="date",
-        allowed_days=1,
-        weekends=True,
-        server=ctx.obj["server"],
-        domain="Check",
-        step="hospital",
-        hide_success=True,
-        channel="covid-19",
-    )
+    run_checks(ctx.obj["server"], CHECKS["hosp"])
 
 
 @click.command(name="megafile", short_help="Complete dataset.")
 @click.pass_context
 def click_check_megafile(ctx):
     """Upload dataset to DB."""
-    # CSV file
-    feedback_log(
-        func=check_updated,
-        url=FULL_URL_CSV,
-        date_col="date",
-        allowed_days=1,
-        weekends=True,
-        server=ctx.obj["server"],
-        domain="Check",
-        step="megafile",
-        hide_success=True,
-        channel="covid-19",
-    )
-    # XLSX file
-    feedback_log(
-        func=check_updated,
-        url=FULL_URL_XLSX,
-        date_col="date",
-        allowed_days=1,
-        weekends=True,
-        server=ctx.obj["server"],
-        domain="Check",
-        step="megafile",
-        hide_success=True,
-        channel="covid-19",
-    )
-
-    # JSON file
-    # feedback_log(
-    #     func=check_updated,
-    #     url=FULL_URL_JSON,
-    #     date_col="date",
-    #     allowed_days=1,
-    #     weekends=True,
-    #     server=ctx.obj["server"],
-    #     domain="Check",
-    #     step="megafile",
-    #     hide_success=True,
-    #     channel="covid-19",
-    # )
+    run_checks(ctx.obj["server"], CHECKS["megafile"])
+
+
+@click.command(name="all", short_help="All datasets (concurrently).")
+@click.pass_context
+def click_check_all(ctx):
+    """Check all datasets concurrently."""
+    run_checks(ctx.obj["server"], [check for checks in CHECKS.values() for check in checks])
 
 
 click_check.add_command(click_check_vax)
@@ -200,3 +181,4 @@ click_check.add_command(click_check_test)
 click_check.add_command(click_check_hosp)
 click_check.add_command(click_check_casedeath)
 click_check.add_command(click_check_megafile)
+click_check.add_command(click_check_all)
@@ -1,5 +1,10 @@
+import ast
+import asyncio
 import time
 import importlib
+import importlib.util
+import inspect
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from joblib import Parallel, delayed
@@ -7,6 +12,7 @@ import pandas as pd
 
 from cowidev.utils.utils import export_timestamp, get_traceback
 from cowidev.utils.s3 import obj_from_s3
+from cowidev.utils.web.scraping import get_driver_pool
 from cowidev.cmd.commons.utils import StepReport
 
 # S3 paths
@@ -28,23 +34,17 @@ class CountryDataGetter:
         t0 = time.time()
         # Check country skipping
         if self._skip_module(module_name):
-            self.logger.info(f"{self.log_header} - {module_name}: skipped! ⚠️")
-            return {
-                "module_name": module_name,
-                "success": None,
-                "skipped": True,
-                "time": None,
-                "timestamp": datetime.utcnow().replace(microsecond=0).isoformat(),
-                "error": "",
-                "error_short": "",
-            }
+            return self._skip(module_name)
         # Start country scraping
         self.logger.info(f"{self.log_header} - {module_name}: started")
         module = importlib.import_module(module_name)
         num_retries = 1
         for i in range(num_retries):
             try:
-                module.main()
+                if inspect.iscoroutinefunction(module.main):
+                    asyncio.run(module.main())
+                else:
+                    module.main()
             except Exception as err:
                 self.logger.info(f"{self.log_header} - {module_name}: Attempt #{i+1} failed")
                 success = False
@@ -54,6 +54,36 @@ class CountryDataGetter:
                 success = True
                 error_msg = error_msg_short = ""
                 break
+        return self._report(module_name, t0, success, i, error_msg, error_msg_short)
+
+    async def run_async(self, module_name: str):
+        """Run module with an async `main`, within the running event loop."""
+        t0 = time.time()
+        if self._skip_module(module_name):
+            return self._skip(module_name)
+        self.logger.info(f"{self.log_header} - {module_name}: started")
+        try:
+            # Imported in a worker thread, so that other modules keep running meanwhile
+            module = await asyncio.to_thread(importlib.import_module, module_name)
+            await module.main()
+        except Exception as err:
+            self.logger.info(f"{self.log_header} - {module_name}: Attempt #1 failed")
+            return self._report(module_name, t0, False, 0, get_traceback(err), str(err))
+        return self._report(module_name, t0, True, 0, "", "")
+
+    def _skip(self, module_name):
+        self.logger.info(f"{self.log_header} - {module_name}: skipped! ⚠️")
+        return {
+            "module_name": module_name,
+            "success": None,
+            "skipped": True,
+            "time": None,
+            "timestamp": datetime.utcnow().replace(microsecond=0).isoformat(),
+            "error": "",
+            "error_short": "",
+        }
+
+    def _report(self, module_name, t0, success, i, error_msg, error_msg_short):
         if success:
             self.logger.info(f"{self.log_header} - {module_name}: SUCCESS ✅")
         else:
@@ -95,9 +125,19 @@ def main_get_data(
     if log_s3_path:
         modules = _load_modules_order(modules, log_s3_path)
     if parallel:
-        modules_execution_results = Parallel(n_jobs=n_jobs, backend="threading")(
-            delayed(country_data_getter.run)(module_name) for module_name in modules
-        )
+        # Modules using a browser run in their own lane, limited to the size of the driver pool. Modules with an async
+        # `main` all run on one event loop (in its own thread).
+        modules_driver = [m for m in modules if _uses_driver(m)]
+        modules_async = [m for m in modules if m not in modules_driver and m not in modules_skip and _is_async(m)]
+        modules_other = [m for m in modules if m not in modules_driver and m not in modules_async]
+        with ThreadPoolExecutor(max_workers=get_driver_pool().size + 1) as executor:
+            future_async = executor.submit(asyncio.run, _run_modules_async(country_data_getter, modules_async))
+            futures = [executor.submit(country_data_getter.run, module_name) for module_name in modules_driver]
+            modules_execution_results = Parallel(n_jobs=n_jobs, backend="threading")(
+                delayed(country_data_getter.run)(module_name) for module_name in modules_other
+            )
+            modules_execution_results += [future.result() for future in futures]
+            modules_execution_results += future_async.result()
     else:
         modules_execution_results = []
         for module_name in modules:
@@ -125,6 +165,47 @@ def main_get_data(
     return report_msg
 
 
+async def _run_modules_async(country_data_getter, modules):
+    """Run modules with an async `main` concurrently, sharing one HTTP session (with per-host limits)."""
+    from cowidev.utils.web.aio import client_session
+
+    async with client_session():
+        return list(await asyncio.gather(*[country_data_getter.run_async(module_name) for module_name in modules]))
+
+
+def _is_async(module_name):
+    """Check (without importing it) if a module defines an async `main`.
+
+    Only top-level `async def main` definitions are detected. Other modules run in the regular lanes, which still await
+    an async `main` (if any) with `asyncio.run`.
+    """
+    code = _read_source(module_name)
+    if code is None:
+        return False
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return False
+    return any(isinstance(node, ast.AsyncFunctionDef) and node.name == "main" for node in tree.body)
+
+
+def _uses_driver(module_name):
+    """Check (without importing it) if a module scrapes its source with a Selenium driver."""
+    code = _read_source(module_name)
+    if code is None:
+        return False
+    return "get_driver(" in code or "webdriver." in code
+
+
+def _read_source(module_name):
+    """Get the source code of a module (without importing it). None if not found."""
+    spec = importlib.util.find_spec(module_name)
+    if spec is None or spec.origin is None:
+        return None
+    with open(spec.origin, "r", encoding="utf-8") as f:
+        return f.read()
+
+
 def _build_server_message(df_status, domain):
     if (df_status.success == False).any():
         dix_failed = df_status.loc[df_status.success == False, "error_short"].to_dict()
@@ -1,10 +1,12 @@
 import collections
 import ast
+import importlib
+import importlib.machinery
+import importlib.util
 from dataclasses import dataclass
 import click
 
 from cowidev.utils.slackapi import SlackAPI
-from cowidev.utils.utils import get_traceback
 
 
 def feedback_log(
@@ -25,6 +27,8 @@ def feedback_log(
         func(**function_kwargs)
     except Exception as err:
         if server:
+            from cowidev.utils.utils import get_traceback
+
             StepReport(
                 title=f"{header} step failed",
                 trace=get_traceback(err),
@@ -158,6 +162,78 @@ class OrderedGroup(click.Group):
         return self.commands
 
 
+class LazyGroup(OrderedGroup):
+    """Group whose subcommands are only imported when used.
+
+    Subcommands are given as `lazy_subcommands`, a dictionary `{name: import_path}`, with `import_path` in the form
+    'module.attribute'. The help of the group (e.g. `--help`) reads the docstrings of the subcommands from their
+    source files, so that listing the subcommands does not import them.
+
+    Based on https://click.palletsprojects.com/en/8.1.x/complex/#lazily-loading-subcommands
+    """
+
+    def __init__(self, *args, lazy_subcommands=None, **kwargs):
+        super(LazyGroup, self).__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx):
+        return list(self.commands) + [name for name in self.lazy_subcommands if name not in self.commands]
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.commands and cmd_name in self.lazy_subcommands:
+            self.add_command(self._load_command(cmd_name), cmd_name)
+        return super(LazyGroup, self).get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx, formatter):
+        commands = []
+        for name in self.list_commands(ctx):
+            if name in self.commands:
+                if not self.commands[name].hidden:
+                    commands.append((name, self.commands[name]))
+            else:
+                commands.append((name, None))
+        if commands:
+            limit = formatter.width - 6 - max(len(name) for name, _ in commands)
+            rows = [
+                (
+                    name,
+                    cmd.get_short_help_str(limit)
+                    if cmd
+                    else click.utils.make_default_short_help(self._read_help(name), limit),
+                )
+                for name, cmd in commands
+            ]
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+    def _load_command(self, cmd_name):
+        import_path = self.lazy_subcommands[cmd_name]
+        module_name, attr_name = import_path.rsplit(".", 1)
+        cmd = getattr(importlib.import_module(module_name), attr_name)
+        if not isinstance(cmd, click.Command):
+            raise ValueError(f"Lazy loading of {import_path} failed: it is not a click command!")
+        return cmd
+
+    def _read_help(self, cmd_name):
+        """Get the docstring of a subcommand function from its source file (without importing it)."""
+        module_name, attr_name = self.lazy_subcommands[cmd_name].rsplit(".", 1)
+        with open(_find_source(module_name), encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        for node in tree.body:
+            if isinstance(node, ast.FunctionDef) and node.name == attr_name:
+                return ast.get_docstring(node) or ""
+        return ""
+
+
+def _find_source(module_name):
+    """Get the source file of a module, without executing it (nor its parent packages, other than the top-level)."""
+    parts = module_name.split(".")
+    spec = importlib.util.find_spec(parts[0])
+    for i in range(1, len(parts)):
+        spec = importlib.machinery.PathFinder.find_spec(".".join(parts[: i + 1]), spec.submodule_search_locations)
+    return spec.origin
+
+
 class StepReport:
     def __init__(self, title: str, type: str, text: str = "", trace: str = ""):
         self.title = title
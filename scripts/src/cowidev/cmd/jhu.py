@@ -26,8 +26,15 @@ def click_jhu_download(ctx):
 
 
 @click.command(name="generate", short_help="Step 2: Generate dataset.")
+@click.option(
+    "--force",
+    "-f",
+    default=False,
+    is_flag=True,
+    help="Generate the dataset even if its inputs did not change since the last run.",
+)
 @click.pass_context
-def click_jhu_generate(ctx):
+def click_jhu_generate(ctx, force):
     feedback_log(
         func=generate_dataset,
         server=ctx.obj["server"],
@@ -37,6 +44,7 @@ def click_jhu_generate(ctx):
         text_success="Public data files generated.",
         logger=ctx.obj["logger"],
         skip_download=True,
+        force=force,
     )
 
 
@@ -1,11 +1,13 @@
 import os
 import requests
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 
 from cowidev import PATHS
 from cowidev.grapher.db.utils.db_imports import import_dataset
+from cowidev.utils.web.download import read_cached
 
 CURRENT_DIR = os.path.dirname(__file__)
 sys.path.append(CURRENT_DIR)
@@ -25,6 +27,30 @@ SOURCE_DEU_C_D = "https://media.githubusercontent.com/media/robert-koch-institut
 SOURCE_DEU_HOSP = "https://raw.githubusercontent.com/robert-koch-institut/COVID-19-Hospitalisierungen_in_Deutschland/master/Aktuell_Deutschland_COVID-19-Hospitalisierungen.csv"
 SOURCE_DEU_ICU = "https://diviexchange.blob.core.windows.net/%24web/zeitreihe-deutschland.csv"
 
+# Filtered (and aggregated) source files are cached here
+CACHE_DIR = PATHS.INTERNAL_TMP_DECOUPLING_DIR
+# Large source files are streamed in chunks of CHUNKSIZE rows
+CHUNKSIZE = 1_000_000
+
+
+def _cache_file(name: str) -> str:
+    return os.path.join(CACHE_DIR, f"{name}.feather")
+
+
+def read_csv_by_date(url: str, date_column: str, dtype: dict, filters: dict = None) -> pd.DataFrame:
+    """Stream a CSV file, summing its columns by date.
+
+    Only `date_column` and the columns in `dtype` are read. Rows can be filtered with `filters` (column -> value).
+    """
+    filters = filters or {}
+    chunks = pd.read_csv(url, usecols=[date_column, *dtype], dtype=dtype, chunksize=CHUNKSIZE)
+    aggregated = []
+    for chunk in chunks:
+        for column, value in filters.items():
+            chunk = chunk[chunk[column] == value]
+        aggregated.append(chunk.drop(columns=list(filters)).groupby(date_column).sum())
+    return pd.concat(aggregated).groupby(level=0).sum().reset_index()
+
 
 def adjust_x_and_y(
     df: pd.DataFrame,
@@ -80,19 +106,20 @@ def process_usa() -> pd.DataFrame:
     )
     c_d["date"] = pd.to_datetime(c_d.date, dayfirst=False).dt.date.astype(str)
 
-    hosp_icu = pd.read_csv(
+    hosp_icu = read_cached(
         SOURCE_USA_HOSP_ICU,
-        usecols=[
-            "date",
-            "staffed_icu_adult_patients_confirmed_covid",
-            "previous_day_admission_adult_covid_confirmed",
-            "previous_day_admission_pediatric_covid_confirmed",
-        ],
+        read_csv_by_date,
+        _cache_file("usa_hosp_icu"),
+        date_column="date",
+        dtype={
+            "staffed_icu_adult_patients_confirmed_covid": "float32",
+            "previous_day_admission_adult_covid_confirmed": "float32",
+            "previous_day_admission_pediatric_covid_confirmed": "float32",
+        },
     ).rename(columns={"staffed_icu_adult_patients_confirmed_covid": "icu_stock"})
     hosp_icu["date"] = pd.to_datetime(hosp_icu.date, format="%Y/%m/%d").dt.date.astype(str)
-    hosp_icu = hosp_icu.dropna(subset=["date"]).sort_values("date")
-    hosp_icu["hospital_flow"] = hosp_icu.previous_day_admission_adult_covid_confirmed.fillna(0).add(
-        hosp_icu.previous_day_admission_pediatric_covid_confirmed.fillna(0)
+    hosp_icu["hospital_flow"] = hosp_icu.previous_day_admission_adult_covid_confirmed.add(
+        hosp_icu.previous_day_admission_pediatric_covid_confirmed
     )
     hosp_icu = (
         hosp_icu.groupby("date", as_index=False)
@@ -103,6 +130,7 @@ def process_usa() -> pd.DataFrame:
                 "previous_day_admission_pediatric_covid_confirmed",
             ]
         )
+        .astype({"icu_stock": float, "hospital_flow": float})
     )
     hosp_icu["hospital_flow"] = hosp_icu.hospital_flow.rolling(7).sum()
 
@@ -121,7 +149,13 @@ def process_usa() -> pd.DataFrame:
 def process_deu() -> pd.DataFrame:
 
     cases_deaths = (
-        pd.read_csv(SOURCE_DEU_C_D, usecols=["Refdatum", "AnzahlFall", "AnzahlTodesfall"])
+        read_cached(
+            SOURCE_DEU_C_D,
+            read_csv_by_date,
+            _cache_file("deu_cases_deaths"),
+            date_column="Refdatum",
+            dtype={"AnzahlFall": "int32", "AnzahlTodesfall": "int32"},
+        )
         .rename(
             columns={
                 "Refdatum": "date",
@@ -129,31 +163,28 @@ def process_deu() -> pd.DataFrame:
                 "AnzahlTodesfall": "confirmed_deaths",
             }
         )
-        .groupby("date", as_index=False)
-        .sum()
         .sort_values("date")
     )
     cases_deaths[["confirmed_cases", "confirmed_deaths"]] = (
         cases_deaths[["confirmed_cases", "confirmed_deaths"]].rolling(7).sum()
     )
 
-    hosp_flow = pd.read_csv(
-        SOURCE_DEU_HOSP, usecols=["Datum", "Bundesland", "Altersgruppe", "7T_Hospitalisierung_Faelle"]
-    )
-    hosp_flow = (
-        hosp_flow[(hosp_flow.Bundesland == "Bundesgebiet") & (hosp_flow.Altersgruppe == "00+")]
-        .drop(columns=["Bundesland", "Altersgruppe"])
-        .rename(columns={"Datum": "date", "7T_Hospitalisierung_Faelle": "hospital_flow"})
-        .groupby("date", as_index=False)
-        .sum()
-    )
-
-    icu_stock = (
-        pd.read_csv(SOURCE_DEU_ICU, usecols=["Datum", "Aktuelle_COVID_Faelle_ITS"])
-        .rename(columns={"Datum": "date", "Aktuelle_COVID_Faelle_ITS": "icu_stock"})
-        .groupby("date", as_index=False)
-        .sum()
-    )
+    hosp_flow = read_cached(
+        SOURCE_DEU_HOSP,
+        read_csv_by_date,
+        _cache_file("deu_hosp"),
+        date_column="Datum",
+        dtype={"Bundesland": "category", "Altersgruppe": "category", "7T_Hospitalisierung_Faelle": "int32"},
+        filters={"Bundesland": "Bundesgebiet", "Altersgruppe": "00+"},
+    ).rename(columns={"Datum": "date", "7T_Hospitalisierung_Faelle": "hospital_flow"})
+
+    icu_stock = read_cached(
+        SOURCE_DEU_ICU,
+        read_csv_by_date,
+        _cache_file("deu_icu"),
+        date_column="Datum",
+        dtype={"Aktuelle_COVID_Faelle_ITS": "int32"},
+    ).rename(columns={"Datum": "date", "Aktuelle_COVID_Faelle_ITS": "icu_stock"})
     icu_stock["date"] = icu_stock.date.str.slice(0, 10)
 
     df = (
@@ -177,7 +208,13 @@ def process_deu() -> pd.DataFrame:
 def process_esp() -> pd.DataFrame:
 
     df = (
-        pd.read_csv(SOURCE_ESP, usecols=["fecha", "num_casos", "num_hosp", "num_uci", "num_def"])
+        read_cached(
+            SOURCE_ESP,
+            read_csv_by_date,
+            _cache_file("esp"),
+            date_column="fecha",
+            dtype={"num_casos": "int32", "num_hosp": "int32", "num_uci": "int32", "num_def": "int32"},
+        )
         .rename(
             columns={
                 "fecha": "date",
@@ -187,8 +224,6 @@ def process_esp() -> pd.DataFrame:
                 "num_uci": "icu_flow",
             }
         )
-        .groupby("date", as_index=False)
-        .sum()
         .assign(Country="Spain")
         .sort_values("date")
         .head(-8)
@@ -212,8 +247,11 @@ def process_esp() -> pd.DataFrame:
 def process_isr() -> pd.DataFrame:
 
     df = (
-        pd.read_csv(
-            SOURCE_ISR, usecols=["Date", "New infected", "New serious", "New deaths", "Easy", "Medium", "Hard"]
+        read_cached(
+            SOURCE_ISR,
+            pd.read_csv,
+            _cache_file("isr"),
+            usecols=["Date", "New infected", "New serious", "New deaths", "Easy", "Medium", "Hard"],
         )
         .rename(
             columns={
@@ -245,11 +283,16 @@ def process_isr() -> pd.DataFrame:
 
 
 def main():
-    usa = process_usa()
-    # germany = process_deu()
-    spain = process_esp()
-    israel = process_isr()
-    df = pd.concat([usa, spain, israel], ignore_index=True).rename(columns={"date": "Year"})
+    # Sources are fetched concurrently
+    countries = [
+        process_usa,
+        # process_deu,
+        process_esp,
+        process_isr,
+    ]
+    with ThreadPoolExecutor(max_workers=len(countries)) as executor:
+        futures = [executor.submit(process) for process in countries]
+    df = pd.concat([future.result() for future in futures], ignore_index=True).rename(columns={"date": "Year"})
     df["Year"] = (pd.to_datetime(df.Year) - pd.to_datetime(ZERO_DAY)).dt.days
     df = df[
         [
@@ -13,3 +13,14 @@ dtype = {
     "iso_3166_2_code": "category",
     "date": "string",
 }
+
+# Columns identifying subnational rows (all missing in country-level rows)
+columns_subnational = [
+    "sub_region_1",
+    "sub_region_2",
+    "metro_area",
+    "iso_3166_2_code",
+    "census_fips_code",
+]
+# Country-level data
+dtype_country = {k: v for k, v in dtype.items() if k not in columns_subnational}
@@ -1,21 +1,50 @@
 import os
 
 import pandas as pd
-from cowidev.gmobility.dtypes import dtype
+
+from cowidev import PATHS
+from cowidev.gmobility.dtypes import dtype, dtype_country, columns_subnational
+from cowidev.utils.web.download import read_cached
 
 FILE_DS = os.path.join("/tmp", "google-mobility.csv")
 
 
 class GMobilityETL:
     source_url = "https://www.gstatic.com/covid19/mobility/Global_Mobility_Report.csv"
+    chunksize = 500_000
+
+    def __init__(self, cache_file: str = PATHS.INTERNAL_TMP_GMOBILITY_FILE):
+        self.cache_file = cache_file
 
     def extract(self):
-        return pd.read_csv(
+        """Load country-level data.
+
+        The filtered data is cached, and only downloaded again if the upstream file (ETag) or the reader (including
+        the column types) changed.
+        """
+        return read_cached(
             self.source_url,
+            self._read_country_level,
+            self.cache_file,
+            salt=repr((dtype, dtype_country, columns_subnational)),
+        )
+
+    def _read_country_level(self, url):
+        """Stream the report, keeping only country-level rows (and columns) of each chunk."""
+        chunks = pd.read_csv(
+            url,
             usecols=dtype.keys(),
-            # low_memory=False,
             dtype=dtype,
+            chunksize=self.chunksize,
+        )
+        df = pd.concat(
+            [
+                chunk.loc[chunk[columns_subnational].isna().all(axis=1)].drop(columns=columns_subnational)
+                for chunk in chunks
+            ],
+            ignore_index=True,
         )
+        return df.astype(dtype_country)
 
     def load(self, df: pd.DataFrame) -> None:
         # Export data
@@ -6,7 +6,7 @@ from cowidev import PATHS
 from cowidev.grapher.db.base import GrapherBaseUpdater
 from cowidev.utils.utils import time_str_grapher, get_filename
 from cowidev.utils.clean.dates import DATE_FORMAT
-from cowidev.gmobility.dtypes import dtype
+from cowidev.gmobility.dtypes import dtype_country
 
 ZERO_DAY = "2020-01-01"
 zero_day = datetime.strptime(ZERO_DAY, DATE_FORMAT)
@@ -16,35 +16,17 @@ FILE_COUNTRY_STD = PATHS.INTERNAL_INPUT_GMOB_STD_FILE
 
 
 def run_grapheriser():
-    mobility = pd.read_csv(FILE_DS, dtype=dtype)
+    # Country-level data (subnational rows are dropped by the ETL step)
+    mobility = pd.read_csv(FILE_DS, dtype=dtype_country)
     # Convert date column to days since zero_day
-    mobility["date"] = pd.to_datetime(mobility["date"], format="%Y/%m/%d").map(lambda date: (date - zero_day).days)
+    mobility["date"] = (pd.to_datetime(mobility["date"], format="%Y/%m/%d") - zero_day).dt.days
 
     # Standardise country names to OWID country names
     country_mapping = pd.read_csv(FILE_COUNTRY_STD)
-    mobility = country_mapping.merge(mobility, on="country_region")
-
-    # Remove subnational data, keeping only country figures
-    filter_cols = [
-        "sub_region_1",
-        "sub_region_2",
-        "metro_area",
-        "iso_3166_2_code",
-        "census_fips_code",
-    ]
-    country_mobility = mobility[mobility[filter_cols].isna().all(1)]
+    country_mobility = country_mapping.merge(mobility, on="country_region")
 
     # Delete columns
-    country_mobility = country_mobility.drop(
-        columns=[
-            "country_region",
-            "sub_region_1",
-            "sub_region_2",
-            "metro_area",
-            "census_fips_code",
-            "iso_3166_2_code",
-        ]
-    )
+    country_mobility = country_mobility.drop(columns=["country_region"])
 
     # Assign new column names
     rename_dict = {
@@ -3,8 +3,13 @@
 These are executed in grapherupdate.sh, by calling `cowidev-grapher-db`.
 
 Some grapher updates are run separately, by means of run_grapher_db step in library step.
+
+Updaters run concurrently, each on its own database connection. Use `--workers` to limit the number of concurrent
+updates.
 """
+import argparse
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 from cowidev.grapher.db.procs.testing import GrapherTestUpdater
 from cowidev.grapher.db.procs.variants import GrapherVariantsUpdater, GrapherSequencingUpdater
@@ -30,15 +35,34 @@ updaters = [
 ]
 updaters = [u() for u in updaters]
 
+MAX_WORKERS = 4
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="Update COVID-19 datasets in the grapher database.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=MAX_WORKERS,
+        help=f"Maximum number of datasets updated concurrently. Defaults to {MAX_WORKERS}.",
+    )
+    return parser.parse_args()
+
+
+def run_updater(updater):
+    try:
+        updater.run()
+    except Exception as e:
+        tb = traceback.format_exc()
+        send_error(
+            channel="corona-data-updates",
+            title=f"Updating Grapher dataset: {updater.dataset_name}",
+            trace=tb,
+        )
+
 
 def main():
-    for updater in updaters:
-        try:
-            updater.run()
-        except Exception as e:
-            tb = traceback.format_exc()
-            send_error(
-                channel="corona-data-updates",
-                title=f"Updating Grapher dataset: {updater.dataset_name}",
-                trace=tb,
-            )
+    args = _parse_args()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        # Consume the results, so that errors not handled by the updaters are raised
+        list(executor.map(run_updater, updaters))
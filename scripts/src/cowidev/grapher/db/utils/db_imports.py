@@ -7,6 +7,8 @@ Update vaccination by age data.
 
 import sys
 import os
+import hashlib
+import threading
 import pandas as pd
 import subprocess
 
@@ -16,6 +18,7 @@ from datetime import datetime, timezone
 
 load_dotenv()
 
+from cowidev import PATHS
 from cowidev.grapher.db.utils.db import connection
 from cowidev.grapher.db.utils.db_utils import DBUtils
 from cowidev.grapher.db.utils.slack_client import send_success
@@ -41,7 +44,35 @@ def chunk_df(df, n):
 
 
 tz_utc = tz_db = timezone.utc
-tz_local = datetime.now(tz_utc).astimezone().tzinfo
+
+_MANIFEST_LOCK = threading.Lock()
+
+
+def get_file_hash(path):
+    """MD5 hash of the content of a file."""
+    hash_ = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            hash_.update(chunk)
+    return hash_.hexdigest()
+
+
+def read_manifest(manifest_path=PATHS.INTERNAL_TMP_GRAPHER_DB_MANIFEST_FILE):
+    """Load the record of the last import of each dataset (content hash of the file and resulting `dataEditedAt`)."""
+    if not os.path.isfile(manifest_path):
+        return {}
+    with open(manifest_path, "r") as f:
+        return json.load(f)
+
+
+def update_manifest(key, entry, manifest_path=PATHS.INTERNAL_TMP_GRAPHER_DB_MANIFEST_FILE):
+    """Record the last import of a dataset. Safe to call from concurrent threads."""
+    with _MANIFEST_LOCK:
+        manifest = read_manifest(manifest_path)
+        manifest[key] = entry
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
 
 
 def import_dataset(
@@ -59,11 +90,12 @@ def import_dataset(
         db = DBUtils(c)
 
         # Check whether the database is up to date, by checking the
-        # - last modified date of the Grapher file
+        # - content hash of the Grapher file
         # - last modified date of the database row
+        # against the ones recorded in the manifest after the last import.
         #
-        # This is not bulletproof, but it allows for flexibility – authors could manually update
-        # the repo, and that would trigger a database update too.
+        # Changes to the file (regardless of its modified time) or to the database dataset made outside of this
+        # function (e.g. authors manually updating it) trigger a database update.
 
         (db_dataset_id, db_dataset_modified_time) = db.fetch_one(
             """
@@ -75,10 +107,12 @@ def import_dataset(
             [dataset_name, namespace],
         )
 
-        db_dataset_modified_time = db_dataset_modified_time.replace(tzinfo=tz_db)
-        file_modified_time = datetime.fromtimestamp(os.stat(csv_path).st_mtime).replace(tzinfo=tz_local)
-
-        if file_modified_time <= db_dataset_modified_time:
+        manifest_key = f"{namespace}/{dataset_name}"
+        manifest_entry = {
+            "hash": get_file_hash(csv_path),
+            "dataEditedAt": db_dataset_modified_time.replace(tzinfo=tz_db).isoformat(),
+        }
+        if read_manifest().get(manifest_key) == manifest_entry:
             print(f"Dataset is up to date: {dataset_name}")
             return None
             # sys.exit(0)
@@ -256,6 +290,17 @@ def import_dataset(
 
         enqueue_deploy(f"Automated dataset update: {dataset_name}")
 
+        (db_dataset_modified_time,) = db.fetch_one(
+            """
+            SELECT dataEditedAt
+            FROM datasets
+            WHERE id = %s
+        """,
+            [db_dataset_id],
+        )
+        manifest_entry["dataEditedAt"] = db_dataset_modified_time.replace(tzinfo=tz_db).isoformat()
+
+    update_manifest(manifest_key, manifest_entry)
     print("Database update successful.")
 
     if slack_notifications:
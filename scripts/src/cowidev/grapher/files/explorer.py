@@ -10,6 +10,13 @@ from cowidev.utils.s3 import obj_from_s3
 
 @dataclass
 class Exploriser:
+    """Build an explorer JSON file (one list of values per column) from a CSV file.
+
+    `function_input` is applied to the input data, and `function_output` to the (pivoted) data before writing it.
+    Missing values reach `function_output` as NaN (they used to be replaced by None beforehand), and are only encoded
+    as `null` when writing the JSON file.
+    """
+
     location: str = "location"
     date: str = "date"
     pivot_column: str = None
@@ -31,35 +38,53 @@ class Exploriser:
             ).reset_index()
         return df
 
-    def pipe_nan_to_none(self, df: pd.DataFrame) -> pd.DataFrame:
-        return df.replace({np.nan: None})
-
-    def pipe_to_dict(self, df: pd.DataFrame) -> pd.DataFrame:
-        return df.to_dict(orient="list")
-
-    def pipeline(self, df: pd.DataFrame) -> dict:
-        df = (
-            df.pipe(self.function_input)
-            .pipe(self.pipe_pivot)
-            .pipe(self.pipe_nan_to_none)
-            .pipe(self.function_output)
-            .pipe(self.pipe_to_dict)
-        )
+    def pipeline(self, df: pd.DataFrame) -> pd.DataFrame:
+        df = df.pipe(self.function_input).pipe(self.pipe_pivot).pipe(self.function_output)
         return df
 
-    def to_json(self, obj):
-        return json.dumps(
-            obj,
-            # Use separators without any trailing whitespace to minimize file size.
-            # The defaults (", ", ": ") contain a trailing space.
-            separators=(",", ":"),
-            # The json library by default encodes NaNs in JSON, but this is invalid JSON.
-            # By having this False, an error will be thrown if a NaN exists in the data.
-            allow_nan=False,
-        )
+    def to_json(self, df: pd.DataFrame, f):
+        """Write `df` to file object `f` as a JSON object with one list of values per column.
+
+        Columns are encoded one at a time, directly from their underlying arrays. Missing values (NaN) are written as
+        `null`.
+        """
+        f.write("{")
+        for i, column in enumerate(df.columns):
+            if i > 0:
+                f.write(",")
+            f.write(json.dumps(str(column)))
+            f.write(":")
+            f.write(_dumps(_column_to_list(df[column].to_numpy())))
+        f.write("}")
 
     def run(self, input_path: str, output_path: str):
         df = self.read(input_path)
-        data = df.pipe(self.pipeline)
+        df = df.pipe(self.pipeline)
         with open(output_path, "w") as f:
-            f.write(self.to_json(data))
+            self.to_json(df, f)
+
+
+def _column_to_list(values: np.ndarray) -> list:
+    """Convert an array to a list of Python objects, with NaNs replaced by None."""
+    values_list = values.tolist()
+    if values.dtype.kind == "f":
+        msk_nan = np.isnan(values)
+    elif values.dtype.kind == "O":
+        msk_nan = pd.isnull(values)
+    else:
+        return values_list
+    for i in np.flatnonzero(msk_nan):
+        values_list[i] = None
+    return values_list
+
+
+def _dumps(obj) -> str:
+    return json.dumps(
+        obj,
+        # Use separators without any trailing whitespace to minimize file size.
+        # The defaults (", ", ": ") contain a trailing space.
+        separators=(",", ":"),
+        # The json library by default encodes NaNs in JSON, but this is invalid JSON.
+        # By having this False, an error will be thrown if a NaN exists in the data.
+        allow_nan=False,
+    )
@@ -2,6 +2,7 @@ from datetime import datetime
 from dataclasses import dataclass, field
 from typing import Callable, List
 
+import numpy as np
 import pandas as pd
 
 from cowidev.utils.s3 import obj_from_s3
@@ -53,26 +54,27 @@ class Grapheriser:
         return [col for col in df.columns if col not in self.columns_metadata]
 
     def pipe_pivot(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Pivot values of columns of interest."""
+        """Pivot values of columns of interest.
+
+        The output is indexed by (location, date), also if no pivot is done.
+        """
         if self.do_pivot:
             return df.pivot(
                 index=[self.location, self.date],
                 columns=self.pivot_column,
                 values=self.pivot_values_list,
-            ).reset_index()
-        return df
+            )
+        return df.set_index([self.location, self.date])
 
     def pipe_metadata_columns(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Rename columns and convert date to Year grapher metric."""
-        df = (
-            df.rename(
-                columns={
-                    self.location: "Country",
-                }
-            )
-            .assign(date=(df[self.date] - self.date_ref).dt.days)
-            .rename(columns={"date": "Year"})
-        ).copy()
+        """Rename index levels and convert date to Year grapher metric."""
+        df.index = pd.MultiIndex.from_arrays(
+            [
+                df.index.get_level_values(0),
+                (df.index.get_level_values(1) - self.date_ref).days,
+            ],
+            names=self.columns_metadata,
+        )
         return df
 
     def pipe_normalize_columns(self, df):
@@ -82,33 +84,27 @@ class Grapheriser:
 
         This only applies if pivot has been done, i.e. `pivot_column` and `pivot_values` are not None.
         """
-
-        def _normalize_column(column):
-            if len(column) != 2:
-                raise ValueError("Column is expected to have length 2")
-            if column[1]:
-                column_new = f"{column[1]}{self.metric2suffix.get(column[0], '')}"
-            else:
-                column_new = column[0]
-            return column_new
-
         if self.do_pivot:
-            df.columns = [_normalize_column(xx) for xx in df.columns]
+            metrics = df.columns.get_level_values(0)
+            values = df.columns.get_level_values(1).astype(str)
+            suffixes = metrics.map(lambda m: self.metric2suffix.get(m, ""))
+            df.columns = np.where(values != "", values + suffixes, metrics)
         return df
 
     def pipe_order_columns(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Re-order the columns of the dataframe.
-
-        First columns are [Country, Year]
-        """
-        col_order = self.columns_metadata + self.columns_data(df)
-        df = df[col_order].sort_values(col_order)
-        return df
+        """Sort rows by [Country, Year], and bring these to the first columns."""
+        return df.sort_index().reset_index()
 
     def pipe_fillna(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Fill missing values.
+
+        Forward-filling (`fillna`) is done within each country and only applies to numeric columns. It relies on rows
+        being sorted by [Country, Year].
+        """
         columns_data = self.columns_data(df)
         if self.fillna:
-            df[columns_data] = df.groupby(["Country"])[columns_data].fillna(method="ffill")
+            columns_numeric = df[columns_data].select_dtypes("number").columns
+            df[columns_numeric] = df.groupby("Country", sort=False)[columns_numeric].ffill()
         if self.fillna_0:
             cols_fillna0 = [c for c in columns_data if c not in self.columns_non_fillna_0]
             df[cols_fillna0] = df[cols_fillna0].fillna(0)
@@ -1,8 +1,8 @@
 import os
-from sys import modules
 import time
 import importlib
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 
 from joblib import Parallel, delayed
@@ -15,6 +15,8 @@ from cowidev.utils.log import get_logger
 
 logger = get_logger()
 
+DTYPES = {"entity": str, "date": str, "indicator": str, "value": float}
+
 
 class HospETL:
     def extract(
@@ -38,17 +40,22 @@ class HospETL:
         # Get data
         modules_execution_results = self.extract_collect(parallel, n_jobs, modules=modules)
         self._execution_summary(t0, modules_execution_results)
-        # Export data (checkpoint)
-        self.extract_export_checkpoint(modules_execution_results)
-        # Process output
-        df, df_meta = self.extract_process()
+        # Export data (checkpoint) in the background, only needed to recover from future failures
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            checkpoint = executor.submit(self.extract_export_checkpoint, modules_execution_results)
+            # Process output
+            df, df_meta = self.extract_process(modules_execution_results)
+            checkpoint.result()
         return {"df": df, "meta": df_meta}
 
     def extract_collect(self, parallel, n_jobs, modules):
-        """Collects data for all countries"""
+        """Collects data for all countries.
+
+        In parallel mode, modules run in a process pool and send their data back to the parent process.
+        """
         logger.info("HOSP - Collecting data...")
         if parallel:
-            modules_execution_results = Parallel(n_jobs=n_jobs, backend="threading")(
+            modules_execution_results = Parallel(n_jobs=n_jobs, backend="loky")(
                 delayed(self._extract_entity)(
                     m,
                 )
@@ -61,49 +68,32 @@ class HospETL:
     def extract_export_checkpoint(self, modules_execution_results):
         """Exports downloaded data and metadata."""
         logger.info("HOSP - Saving checkpoint data...")
-        for m in modules_execution_results:
-            if m is not None:
-                df = m[0]
-                metadata = m[1]
-                if isinstance(metadata, list):
-                    for metadata_ in metadata:
-                        df_ = df[df.entity == metadata_["entity"]]
-                        df_.to_csv(
-                            os.path.join(PATHS.INTERNAL_OUTPUT_HOSP_MAIN_DIR, f"{metadata_['entity']}.csv"),
-                            index=False,
-                        )
-                        with open(
-                            os.path.join(PATHS.INTERNAL_OUTPUT_HOSP_META_DIR, f"{metadata_['entity']}.json"), "w"
-                        ) as outfile:
-                            json.dump(metadata_, outfile)
-                else:
-                    df.to_csv(
-                        os.path.join(PATHS.INTERNAL_OUTPUT_HOSP_MAIN_DIR, f"{metadata['entity']}.csv"), index=False
-                    )
-                    with open(
-                        os.path.join(PATHS.INTERNAL_OUTPUT_HOSP_META_DIR, f"{metadata['entity']}.json"), "w"
-                    ) as outfile:
-                        json.dump(metadata, outfile)
-
-    def extract_process(self):
-        """Load checkpointed data."""
-        logger.info("HOSP - Loading checkpoint data...")
-        # Load & build data
-        data_paths = [
-            os.path.join(PATHS.INTERNAL_OUTPUT_HOSP_MAIN_DIR, p)
-            for p in os.listdir(PATHS.INTERNAL_OUTPUT_HOSP_MAIN_DIR)
-            if p[-3:] == "csv"
-        ]
-        df = pd.concat([pd.read_csv(p) for p in data_paths])
-        # Load & buildmetadata
-        metadata_paths = [
-            os.path.join(PATHS.INTERNAL_OUTPUT_HOSP_META_DIR, p)
-            for p in os.listdir(PATHS.INTERNAL_OUTPUT_HOSP_META_DIR)
-        ]
-        metadata = []
-        for p in metadata_paths:
-            with open(p, "r") as infile:
-                metadata.append(json.load(infile))
+        for df, metadata in self._iter_entities(modules_execution_results):
+            df.to_csv(os.path.join(PATHS.INTERNAL_OUTPUT_HOSP_MAIN_DIR, f"{metadata['entity']}.csv"), index=False)
+            with open(os.path.join(PATHS.INTERNAL_OUTPUT_HOSP_META_DIR, f"{metadata['entity']}.json"), "w") as outfile:
+                json.dump(metadata, outfile)
+
+    def extract_process(self, modules_execution_results):
+        """Build data from collected results.
+
+        Entities not collected in this execution (skipped or failed) are loaded from their last checkpoint.
+        """
+        logger.info("HOSP - Building data...")
+        # Build data & metadata from memory
+        data, metadata = [], []
+        for df, metadata_ in self._iter_entities(modules_execution_results):
+            data.append(df.astype({col: dtype for col, dtype in DTYPES.items() if col in df.columns}))
+            metadata.append(metadata_)
+        # Load remaining entities from checkpoint
+        entities = {m["entity"] for m in metadata}
+        for p in os.listdir(PATHS.INTERNAL_OUTPUT_HOSP_MAIN_DIR):
+            if p[-3:] == "csv" and p[:-4] not in entities:
+                data.append(pd.read_csv(os.path.join(PATHS.INTERNAL_OUTPUT_HOSP_MAIN_DIR, p), dtype=DTYPES))
+        for p in os.listdir(PATHS.INTERNAL_OUTPUT_HOSP_META_DIR):
+            if p[:-5] not in entities:
+                with open(os.path.join(PATHS.INTERNAL_OUTPUT_HOSP_META_DIR, p), "r") as infile:
+                    metadata.append(json.load(infile))
+        df = pd.concat(data, ignore_index=True)
         df_meta = self._build_metadata(metadata)
         # Process output
         df = df.dropna(subset=["value"])
@@ -144,6 +134,21 @@ class HospETL:
 
         return df, df_meta
 
+    def _iter_entities(self, modules_execution_results):
+        """Iterate over (data, metadata) pairs of all collected entities.
+
+        Modules reporting several entities (list of metadata) are split by entity.
+        """
+        for m in modules_execution_results:
+            if m is not None:
+                df = m[0]
+                metadata = m[1]
+                if isinstance(metadata, list):
+                    for metadata_ in metadata:
+                        yield df[df.entity == metadata_["entity"]], metadata_
+                else:
+                    yield df, metadata
+
     def _build_metadata(self, metadata):
         """Build metadata dataframe (to be exported later to locations.csv)."""
         # Flatten list
@@ -231,21 +236,20 @@ class HospETL:
 
     def pipe_per_million(self, df):
         print("Adding per-capita metrics…")
-        per_million = df.copy()
-        per_million.loc[:, "value"] = per_million["value"].div(per_million["population"]).mul(1000000).round(3)
-        per_million.loc[:, "indicator"] = per_million["indicator"] + " per million"
-        df = pd.concat([df, per_million], ignore_index=True).drop(columns="population")
-        return df
-
-    def pipe_round_values(self, df):
-        df.loc[-df.indicator.str.contains("per million"), "value"] = df.value.round()
+        population = df.pop("population")
+        per_million = df[["entity", "iso_code", "date"]].assign(
+            indicator=df["indicator"] + " per million",
+            value=df["value"].div(population).mul(1000000).round(3),
+        )
+        # Absolute values are rounded once per-capita metrics have been estimated
+        df["value"] = df["value"].round()
+        df = pd.concat([df, per_million], ignore_index=True)
         return df
 
     def transform(self, df: pd.DataFrame):
         return (
             df.pipe(self.pipe_metadata)
-            .pipe(self.pipe_per_million)
-            .pipe(self.pipe_round_values)[["entity", "iso_code", "date", "indicator", "value"]]
+            .pipe(self.pipe_per_million)[["entity", "iso_code", "date", "indicator", "value"]]
             .sort_values(["entity", "date", "indicator"])
         )
 
@@ -7,8 +7,9 @@ from cowidev import PATHS
 from cowidev.jhu.process import standardize_data, standard_export, inject_population, ZERO_DAY
 from cowidev.jhu.utils import print_err
 from cowidev.jhu.load import load_data, load_owid_continents, load_population
+from cowidev.jhu.download import STATE_FILE, download_files, get_input_signature
 from cowidev.jhu.subnational import create_subnational
-from cowidev.utils.utils import export_timestamp
+from cowidev.utils.utils import export_timestamp, read_state, write_state
 from cowidev.grapher.db.utils.slack_client import send_warning
 from cowidev.grapher.db.utils.db_imports import import_dataset
 from cowidev.utils.slackapi import SlackAPI
@@ -90,11 +91,18 @@ def export(df, logger):
         raise ValueError("JHU export failed.")
 
 
-def generate_dataset(logger, server_mode, skip_download=False):
+def generate_dataset(logger, server_mode, skip_download=False, force=False):
 
     if not skip_download:
         logger.info("\nAttempting to download latest CSV files...")
-        download_csv()
+        download_csv(logger)
+    # Skip if inputs (files and code) did not change since last run
+    input_signature = get_input_signature()
+    if input_signature is None:
+        logger.info("JHU: Source files not downloaded (run `cowid jhu get`), reading them from JHU repository.")
+    elif not force and read_state(STATE_FILE).get("processed") == input_signature:
+        logger.info("JHU: Inputs did not change since last run, nothing to process (use --force to run anyway).")
+        return
     # Load data
     df = load_data()
 
@@ -108,15 +116,12 @@ def generate_dataset(logger, server_mode, skip_download=False):
     # Export timestamp
     export_timestamp(PATHS.DATA_TIMESTAMP_JHU_FILE)
 
+    write_state(STATE_FILE, {**read_state(STATE_FILE), "processed": input_signature})
+
 
 def download_csv(logger):
-    files = ["time_series_covid19_confirmed_global.csv", "time_series_covid19_deaths_global.csv"]
-    for file in files:
-        logger.info(file)
-        os.system(
-            f"curl --silent -f -o {PATHS.INTERNAL_INPUT_JHU_DIR}/{file} -L"
-            f" https://github.com/CSSEGISandData/COVID-19/raw/master/csse_covid_19_data/csse_covid_19_time_series/{file}"
-        )
+    changed = download_files(logger)
+    logger.info(f"{len(changed)} JHU file(s) changed upstream.")
 
 
 def update_db():
@@ -0,0 +1,137 @@
+"""Download JHU CSSE time series files.
+
+Files are downloaded concurrently, and only if they changed upstream since the last download (conditional requests
+based on the ETag and Last-Modified headers). The state of the downloads, as well as the signature of the last
+processed inputs (input files and processing code), is kept in STATE_FILE.
+"""
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
+
+import requests
+
+from cowidev import PATHS
+from cowidev.utils.utils import read_state, write_state
+
+
+BASE_URL = "https://github.com/CSSEGISandData/COVID-19/raw/master/csse_covid_19_data/csse_covid_19_time_series"
+# File name -> local directory. US files are only used for the subnational file: they are kept in the (git-ignored)
+# temporary directory, with STATE_FILE, so that they are not committed with the inputs.
+FILES = {
+    "time_series_covid19_confirmed_global.csv": PATHS.INTERNAL_INPUT_JHU_DIR,
+    "time_series_covid19_deaths_global.csv": PATHS.INTERNAL_INPUT_JHU_DIR,
+    "time_series_covid19_confirmed_US.csv": PATHS.INTERNAL_TMP_JHU_DIR,
+    "time_series_covid19_deaths_US.csv": PATHS.INTERNAL_TMP_JHU_DIR,
+}
+STATE_FILE = os.path.join(PATHS.INTERNAL_TMP_JHU_DIR, "state.json")
+# Bump to invalidate the signature of the last processed inputs (i.e. force the next `generate`)
+SIGNATURE_VERSION = 1
+# Inputs of `cowid jhu generate` other than the JHU time series files
+INPUT_FILES = [
+    PATHS.INTERNAL_INPUT_JHU_STD_FILE,
+    PATHS.INTERNAL_INPUT_UN_POPULATION_FILE,
+    PATHS.INTERNAL_INPUT_OWID_CONT_FILE,
+    PATHS.INTERNAL_INPUT_WB_INCOME_FILE,
+    PATHS.INTERNAL_INPUT_OWID_EU_FILE,
+    PATHS.DATA_TEST_MAIN_FILE,
+]
+# Code processing the inputs (cases_deaths holds shared parameters, e.g. LARGE_DATA_CORRECTIONS, and transforms)
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CODE_FILES = [
+    *sorted(glob(os.path.join(_SRC_DIR, "jhu", "*.py"))),
+    *sorted(glob(os.path.join(_SRC_DIR, "cases_deaths", "*.py"))),
+    os.path.join(_SRC_DIR, "megafile", "steps", "test.py"),
+]
+
+
+def get_file_path(metric: str, region: str) -> str:
+    """Local path of a JHU time series file (e.g. metric='confirmed', region='global')."""
+    filename = f"time_series_covid19_{metric}_{region}.csv"
+    return os.path.join(FILES[filename], filename)
+
+
+def get_file_source(metric: str, region: str) -> str:
+    """Source of a JHU time series file: its local path if it was downloaded (`cowid jhu get`), its URL otherwise."""
+    file_path = get_file_path(metric, region)
+    if os.path.isfile(file_path):
+        return file_path
+    return f"{BASE_URL}/{os.path.basename(file_path)}"
+
+
+def download_files(logger=None, timeout=60) -> list:
+    """Download all JHU files, skipping those not modified upstream.
+
+    Returns:
+        list: Names of the files that were downloaded (i.e. changed upstream).
+    """
+    state = read_state(STATE_FILE)
+    validators = state.get("files", {})
+    with ThreadPoolExecutor(max_workers=len(FILES)) as executor:
+        futures = {
+            filename: executor.submit(_download_file, filename, validators.get(filename, {}), timeout)
+            for filename in FILES
+        }
+    changed = []
+    for filename, future in futures.items():
+        file_validators = future.result()
+        if file_validators is None:
+            if logger:
+                logger.info(f"{filename}: not modified")
+        else:
+            validators[filename] = file_validators
+            changed.append(filename)
+            if logger:
+                logger.info(f"{filename}: downloaded")
+    write_state(STATE_FILE, {**state, "files": validators})
+    return changed
+
+
+def _download_file(filename: str, validators: dict, timeout: int):
+    """Download a file, unless it exists locally and was not modified since the last download.
+
+    Returns:
+        dict: Validators (ETag, Last-Modified) of the downloaded file, None if it was not modified.
+    """
+    output_path = os.path.join(FILES[filename], filename)
+    headers = {}
+    if os.path.isfile(output_path):
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    with requests.get(f"{BASE_URL}/{filename}", headers=headers, timeout=timeout, stream=True) as response:
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        output_path_tmp = f"{output_path}.part"
+        with open(output_path_tmp, "wb") as f:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                f.write(chunk)
+        os.replace(output_path_tmp, output_path)
+        return {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+
+
+def get_input_signature():
+    """Signature (MD5) of all inputs of the JHU dataset: local input files and processing code.
+
+    Returns:
+        str: Signature, None if some JHU time series file is not available locally (i.e. it is read from its URL).
+    """
+    jhu_paths = [os.path.join(directory, filename) for filename, directory in FILES.items()]
+    if not all(os.path.isfile(path) for path in jhu_paths):
+        return None
+    hash_ = hashlib.md5(f"v{SIGNATURE_VERSION}".encode())
+    for path in jhu_paths + INPUT_FILES + CODE_FILES:
+        hash_.update(path.encode())
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    hash_.update(chunk)
+        else:
+            hash_.update(b"<missing>")
+    return hash_.hexdigest()
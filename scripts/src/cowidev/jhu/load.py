@@ -1,9 +1,17 @@
-import os
 import sys
 
 import pandas as pd
 
 from cowidev import PATHS
+from cowidev.cases_deaths.utils import (  # noqa: F401 (re-exported, reference data is shared with cases_deaths)
+    load_population,
+    load_owid_continents,
+    load_wb_income_groups,
+    load_eu_country_names,
+    get_locations_by_continent,
+    get_locations_by_wb_income_group,
+)
+from cowidev.jhu.download import get_file_source
 from cowidev.jhu.utils import print_err
 
 
@@ -29,57 +37,6 @@ def load_data():
     return df
 
 
-def load_population(year=2021):
-    df = pd.read_csv(
-        PATHS.INTERNAL_INPUT_UN_POPULATION_FILE,
-        keep_default_na=False,
-        usecols=["entity", "year", "population"],
-    )
-    return (
-        pd.DataFrame([_find_closest_year_row(df_group, year) for loc, df_group in df.groupby("entity")])
-        .dropna()
-        .rename(columns={"entity": "location", "year": "population_year"})
-    )
-
-
-def load_owid_continents():
-    return pd.read_csv(
-        PATHS.INTERNAL_INPUT_OWID_CONT_FILE,
-        keep_default_na=False,
-        header=0,
-        names=["location", "code", "year", "continent"],
-        usecols=["location", "continent"],
-    )
-
-
-def load_wb_income_groups():
-    return pd.read_csv(
-        PATHS.INTERNAL_INPUT_WB_INCOME_FILE,
-        keep_default_na=False,
-        header=0,
-        names=["location", "code", "income_group", "year"],
-        usecols=["location", "income_group"],
-    )
-
-
-def load_eu_country_names():
-    df = pd.read_csv(
-        PATHS.INTERNAL_INPUT_OWID_EU_FILE,
-        keep_default_na=False,
-        header=0,
-        names=["location", "eu"],
-        usecols=["location"],
-    )
-    return df["location"].tolist()
-
-
-def _find_closest_year_row(df, year=2021):
-    """Returns the row which is closest to the year specified (in either direction)"""
-    df = df.copy()
-    df["year"] = df["year"].sort_values(ascending=True)
-    return df.loc[df["year"].map(lambda x: abs(x - year)).idxmin()]
-
-
 def _load_raw_data():
     """Load raw data"""
     # get cases
@@ -99,8 +56,7 @@ def _load_raw_locations():
 def _get_metric(metric, region):
     """Read metric from raw JHU data files."""
     # Load file
-    file_path = os.path.join(PATHS.INTERNAL_INPUT_JHU_DIR, f"time_series_covid19_{metric}_{region}.csv")
-    df = pd.read_csv(file_path).drop(columns=["Lat", "Long"])
+    df = pd.read_csv(get_file_source(metric, region)).drop(columns=["Lat", "Long"])
 
     # Get actual metric name
     if metric == "confirmed":
@@ -195,7 +151,3 @@ def _get_daily_metric(df: pd.DataFrame, metric: str):
     df.loc[:, metric.replace("total_", "new_")] = df[metric] - df.groupby("Country/Region")[metric].shift(1)
     return df
 
-
-# Variables
-LOCATIONS_BY_CONTINENT = load_owid_continents().groupby("continent")["location"].apply(list).to_dict()
-LOCATIONS_BY_WB_INCOME_GROUP = load_wb_income_groups().groupby("income_group")["location"].apply(list).to_dict()
@@ -1,34 +1,40 @@
+"""JHU subnational cases/deaths file.
+
+Series (one per subnational location) are processed all at once: rows are sorted by location and date, so that each
+series is a block of contiguous rows, and new values and rolling averages are computed on the whole arrays, within the
+boundaries of each block.
+"""
+import numpy as np
 import pandas as pd
+
+from cowidev.jhu.download import get_file_source
 from cowidev.utils.s3 import obj_to_s3
 
 
 def clean_global_subnational(metric):
-    url = f"https://raw.githubusercontent.com/CSSEGISandData/COVID-19/master/csse_covid_19_data/csse_covid_19_time_series/time_series_covid19_{metric}_global.csv"
+    file_path = get_file_source(metric, "global")
     metric = "cases" if metric == "confirmed" else "deaths"
 
     df = (
-        pd.read_csv(url, na_values="")
+        pd.read_csv(file_path, na_values="")
         .drop(columns=["Lat", "Long"])
         .dropna(subset=["Province/State"])
+        .pipe(_format_dates, ["Country/Region", "Province/State"])
         .melt(id_vars=["Country/Region", "Province/State"], var_name="date", value_name=f"total_{metric}")
         .rename(columns={"Country/Region": "location1", "Province/State": "location2"})
     )
-    df["date"] = pd.to_datetime(df.date).dt.date.astype(str)
     df = df.sort_values(["location1", "location2", "date"])
-    df[f"new_{metric}"] = df[f"total_{metric}"] - df.groupby(["location1", "location2"])[f"total_{metric}"].shift(1)
-    df[f"new_{metric}_smoothed"] = (
-        df.groupby(["location1", "location2"]).rolling(7)[f"new_{metric}"].mean().droplevel(level=[0, 1]).round(2)
-    )
+    df = _add_new_and_smoothed(df, ["location1", "location2"], metric)
     df["location3"] = pd.NA
     return df
 
 
 def clean_us_subnational(metric):
-    url = f"https://raw.githubusercontent.com/CSSEGISandData/COVID-19/master/csse_covid_19_data/csse_covid_19_time_series/time_series_covid19_{metric}_US.csv"
+    file_path = get_file_source(metric, "US")
     metric = "cases" if metric == "confirmed" else "deaths"
 
     df = (
-        pd.read_csv(url)
+        pd.read_csv(file_path)
         .drop(
             columns=[
                 "UID",
@@ -44,19 +50,75 @@ def clean_us_subnational(metric):
             ],
             errors="ignore",
         )
+        .pipe(_format_dates, ["Province_State", "Admin2"])
         .melt(id_vars=["Province_State", "Admin2"], var_name="date", value_name=f"total_{metric}")
         .rename(columns={"Province_State": "location2", "Admin2": "location3"})
     )
-    df["date"] = pd.to_datetime(df.date).dt.date.astype(str)
     df = df.sort_values(["location2", "location3", "date"])
-    df[f"new_{metric}"] = df[f"total_{metric}"] - df.groupby(["location2", "location3"])[f"total_{metric}"].shift(1)
-    df[f"new_{metric}_smoothed"] = (
-        df.groupby(["location2", "location3"]).rolling(7)[f"new_{metric}"].mean().droplevel(level=[0, 1]).round(2)
-    )
+    df = _add_new_and_smoothed(df, ["location2", "location3"], metric)
     df["location1"] = "United States"
     return df
 
 
+def _format_dates(df: pd.DataFrame, id_vars: list) -> pd.DataFrame:
+    """Format the date columns (wide format) as YYYY-MM-DD, so that dates are parsed once, not once per series."""
+    date_columns = df.columns.drop(id_vars)
+    dates = pd.to_datetime(date_columns).strftime("%Y-%m-%d")
+    return df.rename(columns=dict(zip(date_columns, dates)))
+
+
+def _add_new_and_smoothed(df: pd.DataFrame, keys: list, metric: str, window: int = 7) -> pd.DataFrame:
+    """Add the daily values (`new_{metric}`) and their `window`-day rolling average (`new_{metric}_smoothed`) of each
+    series, identified by `keys`. Rows must be sorted by `keys` and date.
+
+    Same as grouping by `keys` (i.e. rows with a missing key get no value) and using `shift` and `rolling(window)`.
+    """
+    group_start, msk_key = _group_start(df, keys)
+    new = _diff_by_group(df[f"total_{metric}"].to_numpy(dtype=float), group_start)
+    smoothed = _rolling_mean_by_group(new, group_start, window)
+    return df.assign(
+        **{
+            f"new_{metric}": np.where(msk_key, new, np.nan),
+            f"new_{metric}_smoothed": pd.Series(np.where(msk_key, smoothed, np.nan), index=df.index).round(2),
+        }
+    )
+
+
+def _group_start(df: pd.DataFrame, keys: list):
+    """Position of the first row of the group of each row (rows sorted by `keys`), and mask of rows with all keys."""
+    n = len(df)
+    codes = [pd.factorize(df[key])[0] for key in keys]
+    is_start = np.ones(n, dtype=bool)
+    if n > 1:
+        is_start[1:] = np.logical_or.reduce([c[1:] != c[:-1] for c in codes])
+    group_start = np.maximum.accumulate(np.where(is_start, np.arange(n), 0))
+    msk_key = np.logical_and.reduce([c != -1 for c in codes])
+    return group_start, msk_key
+
+
+def _diff_by_group(values: np.ndarray, group_start: np.ndarray) -> np.ndarray:
+    """Difference with the previous row within groups of contiguous rows (NaN for the first row of each group)."""
+    diff = np.full(len(values), np.nan)
+    diff[1:] = values[1:] - values[:-1]
+    diff[group_start == np.arange(len(values))] = np.nan
+    return diff
+
+
+def _rolling_mean_by_group(values: np.ndarray, group_start: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean (min_periods=window) within groups of contiguous rows, from the cumulative sum and count of valid
+    values. Windows starting before the first row of their group, or with missing values, get NaN."""
+    valid = ~np.isnan(values)
+    cumsum = np.concatenate([[0], np.cumsum(np.where(valid, values, 0))])
+    count = np.concatenate([[0], np.cumsum(valid)])
+    end = np.arange(1, len(values) + 1)
+    start = end - window
+    msk = start >= group_start
+    start = np.where(msk, start, 0)
+    total = cumsum[end] - cumsum[start]
+    n_valid = count[end] - count[start]
+    return np.where(msk & (n_valid == window), total / window, np.nan)
+
+
 def create_subnational():
     global_cases = clean_global_subnational("confirmed")
     global_deaths = clean_global_subnational("deaths")
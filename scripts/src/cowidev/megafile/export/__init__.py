@@ -1,3 +1,4 @@
+from cowidev.megafile.export.context import ExportContext
 from cowidev.megafile.export.public import create_latest, create_dataset
 from cowidev.megafile.export.internal import create_internal
 from cowidev.megafile.export.readme import generate_readme
@@ -6,6 +7,7 @@ from cowidev.megafile.export.html import generate_htmls
 
 
 __all__ = [
+    "ExportContext",
     "create_latest",
     "create_dataset",
     "create_internal",
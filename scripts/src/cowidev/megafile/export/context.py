@@ -0,0 +1,28 @@
+from dataclasses import dataclass, field
+from typing import Dict
+
+import pandas as pd
+
+
+@dataclass
+class ExportContext:
+    """In-memory products of a megafile run, shared with the auxiliary exporters (e.g. README).
+
+    Exporters only read the published files from disk when no context is given (i.e. when run standalone).
+
+    Attributes:
+        all_covid (pd.DataFrame): Complete (public) megafile dataset.
+        sources (dict): Source datasets of the megafile, before merging (see `cowidev.megafile.steps.get_sources`).
+    """
+
+    all_covid: pd.DataFrame
+    sources: Dict[str, pd.DataFrame] = field(default_factory=dict)
+
+    def source_locations(self, source: str) -> pd.DataFrame:
+        """Get the locations (`location`, `iso_code`) in a source dataset (e.g. "vax"), whether or not they have data.
+
+        ISO codes are those assigned in the megafile.
+        """
+        locations = self.sources[source][["location"]].dropna().drop_duplicates()
+        iso_codes = self.all_covid[["location", "iso_code"]].drop_duplicates()
+        return locations.merge(iso_codes, on="location", how="left")
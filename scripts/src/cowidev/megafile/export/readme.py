@@ -2,6 +2,8 @@ import os
 import pandas as pd
 
 from cowidev import PATHS
+from cowidev.megafile.steps.macro import load_macro_table, MACRO_VARIABLES
+from cowidev.megafile.export.context import ExportContext
 
 
 INPUT_DIR = PATHS.INTERNAL_INPUT_DIR
@@ -15,62 +17,40 @@ POL_CSV = PATHS.INTERNAL_INPUT_BSG_FILE
 CODEBOOK_CSV = PATHS.DATA_CODEBOOK_FILE
 
 
-def get_excluded_locations():
-    df = pd.read_csv(VACCINATIONS_CSV)
-    codes = [code for code in df["iso_code"].unique() if "OWID_" in code]
-    EXCLUDE_LOCATIONS = set(
+def get_excluded_locations(df=None):
+    if df is None:
+        df = pd.read_csv(VACCINATIONS_CSV, usecols=["location", "iso_code"])
+    codes = [code for code in df["iso_code"].dropna().unique() if "OWID_" in code]
+    exclude_locations = set(
         df[df.iso_code.isin(codes)].location.unique().tolist() + ["2020 Summer Olympics athletes & staff"]
     )
-    EXCLUDE_LOCATIONS.remove("Kosovo")
-    EXCLUDE_ISOS = df[df.location.isin(EXCLUDE_LOCATIONS)].iso_code.unique()
-    return EXCLUDE_LOCATIONS, EXCLUDE_ISOS
-
+    exclude_locations.remove("Kosovo")
+    exclude_isos = df[df.location.isin(exclude_locations)].iso_code.unique()
+    return exclude_locations, exclude_isos
 
-EXCLUDE_LOCATIONS, EXCLUDE_ISOS = get_excluded_locations()
 
-
-def get_num_countries_by_iso(iso_code_colname, csv_filepath=None, df=None):
+def get_num_countries_by_iso(iso_code_colname, exclude_isos, csv_filepath=None, df=None):
     if df is None:
-        df = pd.read_csv(csv_filepath, low_memory=False)
-    codes = [code for code in df[iso_code_colname].dropna().unique() if code not in EXCLUDE_ISOS]
+        df = pd.read_csv(csv_filepath, usecols=[iso_code_colname], low_memory=False)
+    codes = [code for code in df[iso_code_colname].dropna().unique() if code not in exclude_isos]
     return len(codes)
 
 
-def get_num_countries_by_location(csv_filepath, location_colname, low_memory=True):
-    df = pd.read_csv(csv_filepath, low_memory=low_memory)
-    locations = [loc for loc in df[location_colname].dropna().unique() if loc not in EXCLUDE_LOCATIONS]
+def get_num_countries_by_location(location_colname, exclude_locations, csv_filepath=None, df=None, low_memory=True):
+    if df is None:
+        df = pd.read_csv(csv_filepath, usecols=[location_colname], low_memory=low_memory)
+    locations = [loc for loc in df[location_colname].dropna().unique() if loc not in exclude_locations]
     return len(locations)
 
 
-def get_num_countries_cases_deaths(csv_filepath):
+def get_num_countries_cases_deaths(csv_filepath, exclude_locations):
     df = pd.read_csv(csv_filepath, low_memory=False)
     columns = df.columns
-    return len(columns[~columns.isin(EXCLUDE_LOCATIONS)]) - 1
+    return len(columns[~columns.isin(exclude_locations)]) - 1
 
 
 def load_macro_df():
-    macro_variables = {
-        "population": "un/population_latest.csv",
-        "population_density": "wb/population_density.csv",
-        "median_age": "un/median_age.csv",
-        "aged_65_older": "wb/aged_65_older.csv",
-        "aged_70_older": "un/aged_70_older.csv",
-        "gdp_per_capita": "wb/gdp_per_capita.csv",
-        "extreme_poverty": "wb/extreme_poverty.csv",
-        "cardiovasc_death_rate": "gbd/cardiovasc_death_rate.csv",
-        "diabetes_prevalence": "wb/diabetes_prevalence.csv",
-        "female_smokers": "wb/female_smokers.csv",
-        "male_smokers": "wb/male_smokers.csv",
-        "handwashing_facilities": "un/handwashing_facilities.csv",
-        "hospital_beds_per_thousand": "owid/hospital_beds.csv",
-        "life_expectancy": "owid/life_expectancy.csv",
-        "human_development_index": "un/human_development_index.csv",
-    }
-    dfs = []
-    for var, file in macro_variables.items():
-        dfs.append(pd.read_csv(os.path.join(INPUT_DIR, file), usecols=["iso_code", var]))
-    df = pd.concat(dfs)
-    return df
+    return load_macro_table(MACRO_VARIABLES, INPUT_DIR).reset_index()
 
 
 def get_variable_section():
@@ -113,31 +93,65 @@ def _generate_category_notes_top(df_notes, category):
     return ""
 
 
-def get_placeholder():
+def get_placeholder(context: ExportContext = None):
+    if context is None:
+        return _get_placeholder_from_files()
+    # Same definitions as when reading the files, but from the source datasets of the megafile run
+    df_vax = context.source_locations("vax")
+    exclude_locations, exclude_isos = get_excluded_locations(df_vax)
+    return {
+        "num_countries_vaccinations": get_num_countries_by_iso("iso_code", exclude_isos, df=df_vax),
+        "num_countries_testing": get_num_countries_by_iso(
+            "iso_code", exclude_isos, df=context.source_locations("testing")
+        ),
+        "num_countries_cases": "219",
+        "num_countries_deaths": "219",
+        "num_countries_hospital": get_num_countries_by_location(
+            "location", exclude_locations, df=context.source_locations("hosp")
+        ),
+        "num_countries_reproduction": get_num_countries_by_location(
+            "location", exclude_locations, df=context.source_locations("reprod")
+        ),
+        "num_countries_policy": get_num_countries_by_location(
+            "location", exclude_locations, df=context.source_locations("cgrt")
+        ),
+        "num_countries_others": get_num_countries_by_iso("iso_code", exclude_isos, df=load_macro_df()),
+        "variable_description": "\n".join(get_variable_section()),
+    }
+
+
+def _get_placeholder_from_files():
+    exclude_locations, exclude_isos = get_excluded_locations()
     placeholders = {
         "num_countries_vaccinations": get_num_countries_by_iso(
-            csv_filepath=VACCINATIONS_CSV, iso_code_colname="iso_code"
+            "iso_code", exclude_isos, csv_filepath=VACCINATIONS_CSV
         ),
-        "num_countries_testing": get_num_countries_by_iso(csv_filepath=TESTING_CSV, iso_code_colname="ISO code"),
-        "num_countries_cases": "219",  # get_num_countries_cases_deaths(csv_filepath=CASES_CSV),
-        "num_countries_deaths": "219",  # get_num_countries_cases_deaths(csv_filepath=DEATHS_CSV),
-        "num_countries_hospital": get_num_countries_by_location(csv_filepath=HOSP_CSV, location_colname="Country"),
+        "num_countries_testing": get_num_countries_by_iso("ISO code", exclude_isos, csv_filepath=TESTING_CSV),
+        "num_countries_cases": "219",  # get_num_countries_cases_deaths(CASES_CSV, exclude_locations),
+        "num_countries_deaths": "219",  # get_num_countries_cases_deaths(DEATHS_CSV, exclude_locations),
+        "num_countries_hospital": get_num_countries_by_location("Country", exclude_locations, csv_filepath=HOSP_CSV),
         "num_countries_reproduction": get_num_countries_by_location(
-            csv_filepath=REPR_CSV, location_colname="Country/Region"
+            "Country/Region", exclude_locations, csv_filepath=REPR_CSV
         ),
         "num_countries_policy": get_num_countries_by_location(
+            "CountryName",
+            exclude_locations,
             csv_filepath=POL_CSV,
-            location_colname="CountryName",
             low_memory=False,
         ),
-        "num_countries_others": get_num_countries_by_iso(df=load_macro_df(), iso_code_colname="iso_code"),
+        "num_countries_others": get_num_countries_by_iso("iso_code", exclude_isos, df=load_macro_df()),
         "variable_description": "\n".join(get_variable_section()),
     }
     return placeholders
 
 
-def generate_readme(readme_template: str, readme_output: str):
-    placeholders = get_placeholder()
+def generate_readme(readme_template: str, readme_output: str, context: ExportContext = None):
+    """Generate the public README.
+
+    If `context` is given, the number of countries covered by each source is obtained from the source datasets held
+    in memory by the megafile run, instead of the published files.
+    """
+    placeholders = get_placeholder(context)
     with open(readme_template, "r", encoding="utf-8") as fr:
         s = fr.read()
         s = s.format(**placeholders)
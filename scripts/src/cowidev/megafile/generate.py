@@ -7,10 +7,12 @@ from cowidev.utils.utils import export_timestamp
 from cowidev import PATHS
 from cowidev.megafile.steps import (
     get_base_dataset,
+    get_sources,
     add_macro_variables,
     add_excess_mortality,
     add_rolling_vaccinations,
     add_cumulative_deaths_last12m,
+    MACRO_VARIABLES,
 )
 from cowidev.megafile.export import (
     create_internal,
@@ -19,6 +21,7 @@ from cowidev.megafile.export import (
     generate_readme,
     generate_status,
     generate_htmls,
+    ExportContext,
 )
 
 
@@ -29,32 +32,12 @@ ANNOTATIONS_PATH = PATHS.INTERNAL_INPUT_OWID_ANNOTATIONS_FILE
 README_TMP = PATHS.INTERNAL_INPUT_OWID_READ_FILE
 README_FILE = PATHS.DATA_READ_FILE
 
-# Macro variables
-# - the key is the name of the variable of interest
-# - the value is the path to the corresponding file
-MACRO_VARIABLES = {
-    "population": "un/population_latest.csv",
-    "population_density": "wb/population_density.csv",
-    "median_age": "un/median_age.csv",
-    "aged_65_older": "wb/aged_65_older.csv",
-    "aged_70_older": "un/aged_70_older.csv",
-    "gdp_per_capita": "wb/gdp_per_capita.csv",
-    "extreme_poverty": "wb/extreme_poverty.csv",
-    "cardiovasc_death_rate": "gbd/cardiovasc_death_rate.csv",
-    "diabetes_prevalence": "wb/diabetes_prevalence.csv",
-    "female_smokers": "wb/female_smokers.csv",
-    "male_smokers": "wb/male_smokers.csv",
-    "handwashing_facilities": "un/handwashing_facilities.csv",
-    "hospital_beds_per_thousand": "owid/hospital_beds.csv",
-    "life_expectancy": "owid/life_expectancy.csv",
-    "human_development_index": "un/human_development_index.csv",
-}
-
 
 def generate_megafile(logger):
     """Generate megafile data."""
     # Load data
-    all_covid = load_data(logger)
+    sources = get_sources(logger)
+    all_covid = load_data(logger, sources=sources)
     # Create internal datasets
     export_internal(
         logger,
@@ -64,11 +47,11 @@ def generate_megafile(logger):
     # Minor tweaks for final/public dataset
     all_covid = process_for_public(all_covid)
     # Create final/public datasets
-    export_public(logger, all_covid)
+    export_public(logger, all_covid, sources)
 
 
-def load_data(logger, old=False):
-    all_covid = get_base_dataset(logger, old)
+def load_data(logger, old=False, sources=None):
+    all_covid = get_base_dataset(logger, old, sources)
 
     # Remove today's datapoint
     all_covid = all_covid[all_covid["date"] < str(date.today())]
@@ -193,7 +176,9 @@ def process_for_public(all_covid):
     return all_covid
 
 
-def export_public(logger, all_covid):
+def export_public(logger, all_covid, sources=None):
+    context = ExportContext(all_covid=all_covid, sources=sources or {})
+
     # Create light versions of complete dataset with only the latest data point
     logger.info("Writing latest…")
     create_latest(all_covid, logger)
@@ -206,7 +191,7 @@ def export_public(logger, all_covid):
 
     # Update readme
     logger.info("Generating public/data/README.md")
-    generate_readme(readme_template=README_TMP, readme_output=README_FILE)
+    generate_readme(readme_template=README_TMP, readme_output=README_FILE, context=context)
 
     # Update readme
     logger.info("Generating scripts/STATUS.md")
@@ -1,13 +1,16 @@
-from cowidev.megafile.steps.core import get_base_dataset
-from cowidev.megafile.steps.macro import add_macro_variables
+from cowidev.megafile.steps.core import get_base_dataset, get_sources
+from cowidev.megafile.steps.macro import add_macro_variables, load_macro_table, MACRO_VARIABLES
 from cowidev.megafile.steps.xm import add_excess_mortality
 from cowidev.megafile.steps.vax import add_rolling_vaccinations
 from cowidev.megafile.steps.cases_deaths import add_cumulative_deaths_last12m
 
 __all__ = [
     "get_base_dataset",
+    "get_sources",
     "add_macro_variables",
     "add_excess_mortality",
     "add_rolling_vaccinations",
     "add_cumulative_deaths_last12m",
+    "load_macro_table",
+    "MACRO_VARIABLES",
 ]
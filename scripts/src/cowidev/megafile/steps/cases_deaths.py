@@ -1,8 +1,11 @@
 import datetime
 import os
 from functools import reduce
+import numpy as np
 import pandas as pd
 
+from cowidev.megafile.steps.utils import Last12mHelper
+
 
 def get_casedeath(dataset_dir: str):
     """
@@ -74,13 +77,16 @@ def get_casedeath(dataset_dir: str):
 
 
 def add_cumulative_deaths_last12m(df: pd.DataFrame) -> pd.DataFrame:
-
-    df["daily_diff"] = df[["location", "total_deaths"]].groupby("location").fillna(0).diff()
     date_cutoff = pd.to_datetime(df.date.max()) - datetime.timedelta(days=365.2425)
-    df.loc[pd.to_datetime(df.date) < date_cutoff, "daily_diff"] = 0
+    helper = Last12mHelper(df, date_cutoff)
 
-    df["total_deaths_last12m"] = df[["location", "daily_diff"]].groupby("location").cumsum()
-    df.loc[(pd.to_datetime(df.date) < date_cutoff) | (df.new_deaths.isnull()), "total_deaths_last12m"] = pd.NA
-    df["total_deaths_last12m_per_million"] = df.total_deaths_last12m.mul(1000000).div(df.population)
+    daily_diff = df["total_deaths"].fillna(0).diff()
+    daily_diff[helper.before_cutoff] = 0
 
-    return df.drop(columns="daily_diff")
+    total_deaths_last12m = helper.cumsum(daily_diff)
+    total_deaths_last12m[helper.before_cutoff | df.new_deaths.isnull().to_numpy()] = np.nan
+
+    return df.assign(
+        total_deaths_last12m=total_deaths_last12m,
+        total_deaths_last12m_per_million=total_deaths_last12m.mul(1000000).div(df.population),
+    )
@@ -1,6 +1,9 @@
 "merge"
 import pandas as pd
 
+from cowidev.oxcgrt.dtypes import dtype, dtype_diff
+from cowidev.oxcgrt.etl import read_oxcgrt
+
 
 def get_cgrt(bsg_latest: str, bsg_diff_latest: str, country_mapping: str):
     """
@@ -13,6 +16,7 @@ def get_cgrt(bsg_latest: str, bsg_diff_latest: str, country_mapping: str):
     country_mapping = pd.read_csv(country_mapping)
     cgrt = clean_cgrt(
         url=bsg_latest,
+        columns_dtype=dtype,
         columns_rename={
             "Date": "date",
             "StringencyIndex_Average": "stringency_index",
@@ -21,6 +25,7 @@ def get_cgrt(bsg_latest: str, bsg_diff_latest: str, country_mapping: str):
     )
     cgrt_diff = clean_cgrt(
         url=bsg_diff_latest,
+        columns_dtype=dtype_diff,
         columns_rename={
             "Date": "date",
             "StringencyIndex_NonVaccinated": "stringency_index_nonvac",
@@ -33,13 +38,13 @@ def get_cgrt(bsg_latest: str, bsg_diff_latest: str, country_mapping: str):
     return cgrt
 
 
-def clean_cgrt(url, columns_rename, country_mapping):
-    # Read file
-    df = pd.read_csv(url, low_memory=False)
-    # Filter rows
-    if "RegionCode" in df.columns:
-        df = df[df.RegionCode.isnull()]
+def clean_cgrt(url, columns_dtype, columns_rename, country_mapping):
     columns = list(columns_rename.keys())
+    # Read file (only required columns)
+    columns_read = ["CountryName", "RegionCode"] + columns
+    df = read_oxcgrt(url, {col: columns_dtype[col] for col in columns_read})
+    # Filter rows
+    df = df[df.RegionCode.isnull()]
     # Filter columns
     df = df[columns + ["CountryName"]]
     # Format date
@@ -15,8 +15,34 @@ GRAPHER_DIR = PATHS.INTERNAL_GRAPHER_DIR
 DATA_DIR = PATHS.DATA_DIR
 
 
-def get_base_dataset(logger, old=False):
-    """Get owid datasets from: who, reproduction rate, hospitalizations, testing, vaccinations, CGRT."""
+def get_base_dataset(logger, old=False, sources=None):
+    """Get owid datasets from: who, reproduction rate, hospitalizations, testing, vaccinations, CGRT.
+
+    Args:
+        logger: Logger.
+        old (bool, optional): Use JHU cases/deaths instead of WHO. Defaults to False.
+        sources (dict, optional): Source datasets, as returned by `get_sources`. Loaded if None.
+    """
+    if sources is None:
+        sources = get_sources(logger, old)
+    # Big merge
+    return (
+        sources["cases_deaths"]
+        .merge(sources["reprod"], on=["date", "location"], how="outer")
+        .merge(sources["hosp"], on=["date", "location"], how="outer")
+        .merge(sources["testing"], on=["date", "location"], how="outer")
+        .merge(sources["vax"], on=["date", "location"], how="outer")
+        .merge(sources["cgrt"], on=["date", "location"], how="left")
+        .merge(sources["variants"], on=["date", "location"], how="left")
+        .sort_values(["location", "date"])
+    )
+
+
+def get_sources(logger, old=False):
+    """Load the source datasets of the megafile (before merging), by name.
+
+    Names: cases_deaths, reprod, hosp, testing, vax, cgrt and variants.
+    """
     if old:
         path = PATHS.DATA_JHU_DIR
     else:
@@ -60,13 +86,12 @@ def get_base_dataset(logger, old=False):
         cases_file=os.path.join(path, "full_data.csv"),
     )
 
-    # Big merge
-    return (
-        cases_deaths.merge(reprod, on=["date", "location"], how="outer")
-        .merge(hosp, on=["date", "location"], how="outer")
-        .merge(testing, on=["date", "location"], how="outer")
-        .merge(vax, on=["date", "location"], how="outer")
-        .merge(cgrt, on=["date", "location"], how="left")
-        .merge(variants, on=["date", "location"], how="left")
-        .sort_values(["location", "date"])
-    )
+    return {
+        "cases_deaths": cases_deaths,
+        "reprod": reprod,
+        "hosp": hosp,
+        "testing": testing,
+        "vax": vax,
+        "cgrt": cgrt,
+        "variants": variants,
+    }
@@ -1,6 +1,33 @@
+import hashlib
+import json
 import os
+
 import pandas as pd
 
+from cowidev import PATHS
+
+
+# Macro variables
+# - the key is the name of the variable of interest
+# - the value is the path to the corresponding file
+MACRO_VARIABLES = {
+    "population": "un/population_latest.csv",
+    "population_density": "wb/population_density.csv",
+    "median_age": "un/median_age.csv",
+    "aged_65_older": "wb/aged_65_older.csv",
+    "aged_70_older": "un/aged_70_older.csv",
+    "gdp_per_capita": "wb/gdp_per_capita.csv",
+    "extreme_poverty": "wb/extreme_poverty.csv",
+    "cardiovasc_death_rate": "gbd/cardiovasc_death_rate.csv",
+    "diabetes_prevalence": "wb/diabetes_prevalence.csv",
+    "female_smokers": "wb/female_smokers.csv",
+    "male_smokers": "wb/male_smokers.csv",
+    "handwashing_facilities": "un/handwashing_facilities.csv",
+    "hospital_beds_per_thousand": "owid/hospital_beds.csv",
+    "life_expectancy": "owid/life_expectancy.csv",
+    "human_development_index": "un/human_development_index.csv",
+}
+
 
 def add_macro_variables(complete_dataset: pd.DataFrame, macro_variables: dict, data_dir: str):
     """
@@ -11,13 +38,65 @@ def add_macro_variables(complete_dataset: pd.DataFrame, macro_variables: dict, d
     """
     original_shape = complete_dataset.shape
 
+    macro = load_macro_table(macro_variables, data_dir)
+    complete_dataset = complete_dataset.join(macro, on="iso_code")
+    complete_dataset.index = pd.RangeIndex(len(complete_dataset))
+    # Integer variables are only kept as integers if available for all rows (as with a regular merge)
+    for var in macro.columns:
+        if isinstance(macro[var].dtype, pd.Int64Dtype):
+            if complete_dataset[var].isnull().any():
+                complete_dataset[var] = complete_dataset[var].astype(float)
+            else:
+                complete_dataset[var] = complete_dataset[var].astype("int64")
+
+    assert complete_dataset.shape[0] == original_shape[0]
+    assert complete_dataset.shape[1] == original_shape[1] + len(macro_variables)
+
+    return complete_dataset
+
+
+def load_macro_table(macro_variables: dict, data_dir: str, cache_file: str = PATHS.INTERNAL_TMP_MACRO_FILE):
+    """Load the macro variables as a single table, indexed by `iso_code` (one column per variable).
+
+    The table is cached in `cache_file` and is only rebuilt if any of the source files (or the list of variables)
+    changes.
+    """
+    signature = _get_macro_signature(macro_variables, data_dir)
+    signature_file = f"{cache_file}.json"
+    if os.path.isfile(cache_file) and os.path.isfile(signature_file):
+        with open(signature_file, "r") as f:
+            if json.load(f).get("signature") == signature:
+                return pd.read_feather(cache_file).set_index("iso_code")
+    macro = build_macro_table(macro_variables, data_dir)
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    macro.reset_index().to_feather(cache_file)
+    with open(signature_file, "w") as f:
+        json.dump({"signature": signature}, f)
+    return macro
+
+
+def build_macro_table(macro_variables: dict, data_dir: str):
+    """Build a table with all macro variables, indexed by `iso_code` (one column per variable).
+
+    Integer variables are stored as nullable integers, so that their type is not lost when some locations are missing.
+    """
+    macro = None
     for var, file in macro_variables.items():
         var_df = pd.read_csv(os.path.join(data_dir, file), usecols=["iso_code", var])
         var_df = var_df[-var_df["iso_code"].isnull()]
         var_df[var] = var_df[var].round(3)
-        complete_dataset = complete_dataset.merge(var_df, on="iso_code", how="left")
+        if pd.api.types.is_integer_dtype(var_df[var]):
+            var_df[var] = var_df[var].astype("Int64")
+        if macro is None:
+            macro = var_df
+        else:
+            macro = macro.merge(var_df, on="iso_code", how="outer")
+    return macro.set_index("iso_code")
 
-    assert complete_dataset.shape[0] == original_shape[0]
-    assert complete_dataset.shape[1] == original_shape[1] + len(macro_variables)
 
-    return complete_dataset
+def _get_macro_signature(macro_variables: dict, data_dir: str):
+    hash_ = hashlib.md5(json.dumps(macro_variables, sort_keys=True).encode())
+    for file in macro_variables.values():
+        with open(os.path.join(data_dir, file), "rb") as f:
+            hash_.update(f.read())
+    return hash_.hexdigest()
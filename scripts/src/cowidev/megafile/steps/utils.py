@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+
+class Last12mHelper:
+    """Helper to estimate "last 12 months" metrics on a (location, date) frame.
+
+    Dates are parsed once and the cutoff masks, location groups and (location, date) order are shared by all metrics,
+    which avoids merging per-location values back onto the full frame for each metric.
+
+    Args:
+        df (pd.DataFrame): Data, with columns `date` and `column_location`.
+        date_cutoff (datetime): Start of the last 12 months window.
+        column_location (str, optional): Name of the location column. Defaults to "location".
+    """
+
+    def __init__(self, df: pd.DataFrame, date_cutoff, column_location: str = "location"):
+        dates = pd.to_datetime(df["date"])
+        self.before_cutoff = (dates < date_cutoff).to_numpy()
+        self.after_cutoff = (dates > date_cutoff).to_numpy()
+        self.groups = pd.factorize(df[column_location])[0]
+        self.order = np.lexsort((dates.to_numpy().view("i8"), self.groups))
+
+    def value_at_cutoff(self, values: pd.Series) -> np.ndarray:
+        """Get, for each row, the first non-NaN value of its location after the cutoff date."""
+        values = np.where(self.after_cutoff, values.to_numpy(dtype=float), np.nan)[self.order]
+        first = pd.Series(values).groupby(self.groups[self.order]).transform("first").to_numpy()
+        result = np.empty_like(first)
+        result[self.order] = first
+        return result
+
+    def cumsum(self, values: pd.Series) -> pd.Series:
+        """Cumulative sum of `values` within each location (in row order)."""
+        return values.groupby(self.groups).cumsum()
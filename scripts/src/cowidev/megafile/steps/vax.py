@@ -42,19 +42,51 @@ def get_vax(data_file):
     return vax
 
 
-def _add_rolling(df: pd.DataFrame) -> pd.DataFrame:
-    last_known_date = df.loc[df.total_vaccinations.notnull(), "date"].max()
-    for n_months in (6, 9, 12):
-        n_days = round(365.2425 * n_months / 12)
-        df[f"rolling_vaccinations_{n_months}m"] = (
-            df.total_vaccinations.interpolate(method="linear").diff().rolling(n_days, min_periods=1).sum().round()
-        )
-        df.loc[df.date > last_known_date, f"rolling_vaccinations_{n_months}m"] = np.NaN
-        df[f"rolling_vaccinations_{n_months}m_per_hundred"] = (
-            df[f"rolling_vaccinations_{n_months}m"] * 100 / df.population
-        ).round(2)
-    return df
+def _interpolate_by_group(values: np.ndarray, group_start: np.ndarray) -> np.ndarray:
+    """Linear interpolation (by position) within groups of contiguous rows, as `Series.interpolate()` per group.
+
+    Leading NaNs of each group are kept, trailing NaNs are filled with the last valid value.
+    """
+    pos = np.arange(len(values), dtype=float)
+    valid = ~np.isnan(values)
+    groups = pd.Series(group_start)
+    prev_pos = pd.Series(np.where(valid, pos, np.nan)).groupby(groups).ffill().to_numpy()
+    next_pos = pd.Series(np.where(valid, pos, np.nan)).groupby(groups).bfill().to_numpy()
+    prev_val = pd.Series(values).groupby(groups).ffill().to_numpy()
+    next_val = pd.Series(values).groupby(groups).bfill().to_numpy()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = (next_val - prev_val) / (next_pos - prev_pos)
+        interpolated = slope * (pos - prev_pos) + prev_val
+    interpolated = np.where(np.isnan(next_pos), prev_val, interpolated)
+    return np.where(valid, values, interpolated)
 
 
 def add_rolling_vaccinations(df: pd.DataFrame) -> pd.DataFrame:
-    return df.groupby("location").apply(_add_rolling).reset_index(drop=True)
+    """Add the number of vaccinations administered in the last 6, 9 and 12 months (rolling windows, by location).
+
+    All locations are processed at once: rows are (stably) sorted by location, so that each location is a block of
+    contiguous rows, and windows are summed with a grouped rolling sum (same values as a rolling sum per location).
+    """
+    codes = pd.factorize(df["location"], sort=True)[0]
+    order = np.argsort(codes, kind="stable")
+    codes_sorted = codes[order]
+    group_start = np.searchsorted(codes_sorted, codes_sorted, side="left")
+
+    # Daily vaccinations (from interpolated totals)
+    total_vaccinations = _interpolate_by_group(df["total_vaccinations"].to_numpy(dtype=float)[order], group_start)
+    daily = pd.Series(total_vaccinations).groupby(group_start).diff()
+
+    # Dates after the last known value
+    last_known_date = df.loc[df.total_vaccinations.notnull()].groupby("location")["date"].max()
+    msk_unknown = (df["date"] > df["location"].map(last_known_date)).to_numpy()
+
+    columns = {}
+    for n_months in (6, 9, 12):
+        n_days = round(365.2425 * n_months / 12)
+        rolling = np.empty(len(df))
+        rolling[order] = daily.groupby(group_start).rolling(n_days, min_periods=1).sum().to_numpy()
+        rolling = pd.Series(rolling, index=df.index).round()
+        rolling[msk_unknown] = np.NaN
+        columns[f"rolling_vaccinations_{n_months}m"] = rolling
+        columns[f"rolling_vaccinations_{n_months}m_per_hundred"] = (rolling * 100 / df.population).round(2)
+    return df.assign(**columns).reset_index(drop=True)
@@ -2,6 +2,8 @@ import pandas as pd
 import numpy as np
 import datetime
 
+from cowidev.megafile.steps.utils import Last12mHelper
+
 
 def add_excess_mortality(df: pd.DataFrame, wmd_hmd_file: str, economist_file: str) -> pd.DataFrame:
 
@@ -40,42 +42,25 @@ def add_excess_mortality(df: pd.DataFrame, wmd_hmd_file: str, economist_file: st
     df = df.merge(econ, how="left", on=["location", "date"])
 
     # Add last 12m
-    df = _add_last12m_to_metric(df, "excess_mortality_cumulative_absolute", "location", 1000000, "per_million")
-    df = _add_last12m_to_metric(df, "cumulative_estimated_daily_excess_deaths", "location", 100000, "per_100k")
-    df = _add_last12m_to_metric(
-        df, "cumulative_estimated_daily_excess_deaths_ci_95_top", "location", 100000, "per_100k"
-    )
-    df = _add_last12m_to_metric(
-        df, "cumulative_estimated_daily_excess_deaths_ci_95_bot", "location", 100000, "per_100k"
-    )
+    helper = Last12mHelper(df, date_cutoff=datetime.datetime.now() - datetime.timedelta(days=365.2425))
+    df = _add_last12m_to_metric(df, "excess_mortality_cumulative_absolute", helper, 1000000, "per_million")
+    df = _add_last12m_to_metric(df, "cumulative_estimated_daily_excess_deaths", helper, 100000, "per_100k")
+    df = _add_last12m_to_metric(df, "cumulative_estimated_daily_excess_deaths_ci_95_top", helper, 100000, "per_100k")
+    df = _add_last12m_to_metric(df, "cumulative_estimated_daily_excess_deaths_ci_95_bot", helper, 100000, "per_100k")
     # print(df.columns)
     return df
 
 
 def _add_last12m_to_metric(
-    df: pd.DataFrame, column_metric: str, column_location: str, scaling: int, scaling_slug: str
+    df: pd.DataFrame, column_metric: str, helper: Last12mHelper, scaling: int, scaling_slug: str
 ) -> pd.DataFrame:
     column_metric_12m = f"{column_metric}_last12m"
 
-    # Get only last 12 month of data
-    date_cutoff = datetime.datetime.now() - datetime.timedelta(days=365.2425)
-    # df = df[pd.to_datetime(df.date) > date_cutoff]
-
-    # Get metric value 12 months ago
-    df_tmp = (
-        df[pd.to_datetime(df.date) > date_cutoff]
-        .dropna(subset=[column_metric])
-        .sort_values([column_location, "date"])
-        .drop_duplicates(column_location)[[column_location, column_metric]]
-        .rename(columns={column_metric: column_metric_12m})
-    )
-
-    # Compute the difference, obtain last12m metric
-    df = df.merge(df_tmp, on=[column_location], how="left")
-    values = df[column_metric] - df[column_metric_12m]
+    # Compute the difference with the metric value 12 months ago, obtain last12m metric
+    values = df[column_metric] - helper.value_at_cutoff(df[column_metric])
 
     # Assign NaN to >1 year old data
-    values[pd.to_datetime(df.date) < date_cutoff] = np.nan
+    values[helper.before_cutoff] = np.nan
 
     # Assign to df
     df = df.assign(
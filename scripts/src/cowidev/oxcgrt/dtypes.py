@@ -0,0 +1,39 @@
+# Columns used from the OxCGRT national files, and their types
+dtype = {
+    "CountryName": str,
+    "Date": "int64",
+    "RegionCode": str,
+    "C1M_School closing": "float64",
+    "C2M_Workplace closing": "float64",
+    "C3M_Cancel public events": "float64",
+    "C4M_Restrictions on gatherings": "float64",
+    "C5M_Close public transport": "float64",
+    "C6M_Stay at home requirements": "float64",
+    "C7M_Restrictions on internal movement": "float64",
+    "C8EV_International travel controls": "float64",
+    "E1_Income support": "float64",
+    "E2_Debt/contract relief": "float64",
+    "E3_Fiscal measures": "float64",
+    "E4_International support": "float64",
+    "H1_Public information campaigns": "float64",
+    "H2_Testing policy": "float64",
+    "H3_Contact tracing": "float64",
+    "H4_Emergency investment in healthcare": "float64",
+    "H5_Investment in vaccines": "float64",
+    "H6M_Facial Coverings": "float64",
+    "H7_Vaccination policy": "float64",
+    "StringencyIndex_Average": "float64",
+    "ContainmentHealthIndex_Average": "float64",
+    "V2A_Vaccine Availability (summary)": "float64",
+    "V2B_Vaccine age eligibility/availability age floor (general population summary)": str,
+    "V2C_Vaccine age eligibility/availability age floor (at risk summary)": str,
+}
+# Columns used from the OxCGRT differentiated (vaccinated/non-vaccinated) files, and their types
+dtype_diff = {
+    "CountryName": str,
+    "Date": "int64",
+    "RegionCode": str,
+    "StringencyIndex_NonVaccinated": "float64",
+    "StringencyIndex_Vaccinated": "float64",
+    "StringencyIndex_WeightedAverage": "float64",
+}
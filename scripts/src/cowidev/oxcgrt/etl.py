@@ -1,48 +1,52 @@
+import os
+from datetime import date
+
 import pandas as pd
 
+from cowidev import PATHS
+from cowidev.oxcgrt.dtypes import dtype, dtype_diff
+
+
+CACHE_DIR = os.path.join(PATHS.INTERNAL_TMP_DIR, "oxcgrt")
+
 
 class OxCGRTETL:
-    def __init__(self) -> None:
+    def __init__(self, cache_dir: str = CACHE_DIR) -> None:
         self.source_url = (
             "https://raw.githubusercontent.com/OxCGRT/covid-policy-tracker/master/data/OxCGRT_nat_latest.csv"
         )
-        self.source_url_diff = [
-            "https://github.com/OxCGRT/covid-policy-tracker/raw/master/data/OxCGRT_nat_differentiated_withnotes_2020.csv",
-            "https://github.com/OxCGRT/covid-policy-tracker/raw/master/data/OxCGRT_nat_differentiated_withnotes_2021.csv",
-            "https://github.com/OxCGRT/covid-policy-tracker/raw/master/data/OxCGRT_nat_differentiated_withnotes_2022.csv",
-        ]
+        self.source_url_diff = (
+            "https://github.com/OxCGRT/covid-policy-tracker/raw/master/data/OxCGRT_nat_differentiated_withnotes_{}.csv"
+        )
+        self.years_diff = [2020, 2021, 2022]
+        self.cache_dir = cache_dir
 
     def extract(self):
-        # print(1)
-        df = pd.read_csv(self.source_url, low_memory=False)
-        # print(2)
+        df = read_oxcgrt(self.source_url, dtype)
         df_diff = self._load_diff_data()
         return df, df_diff
 
     def _load_diff_data(self):
-        dfs = []
-        for url in self.source_url_diff:
-            # print(url)
-            dfs.append(
-                pd.read_csv(
-                    url,
-                    usecols=[
-                        "Date",
-                        "RegionCode",
-                        # "Country",
-                        "CountryName",
-                        "StringencyIndex_NonVaccinated",
-                        "StringencyIndex_Vaccinated",
-                        "StringencyIndex_WeightedAverage",
-                    ],
-                    low_memory=False,
-                )
-            )
         return pd.concat(
-            dfs,
+            [self._load_diff_data_year(year) for year in self.years_diff],
             ignore_index=True,
         )
 
+    def _load_diff_data_year(self, year: int):
+        """Load the differentiated data of a year.
+
+        Data from past (closed) years is cached, so that only the file of the current year is downloaded on every run.
+        """
+        cache_file = os.path.join(self.cache_dir, f"differentiated_{year}.feather")
+        closed = year < date.today().year
+        if closed and os.path.isfile(cache_file):
+            return pd.read_feather(cache_file)
+        df = read_oxcgrt(self.source_url_diff.format(year), dtype_diff)
+        if closed:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            df.to_feather(cache_file)
+        return df
+
     def transform(self, df: pd.DataFrame) -> pd.DataFrame:
         return df
 
@@ -55,6 +59,16 @@ class OxCGRTETL:
         self.load(df_diff, output_path_diff)
 
 
+def read_oxcgrt(filepath_or_buffer, columns_dtype: dict) -> pd.DataFrame:
+    """Read an OxCGRT file, loading only the columns in `columns_dtype` (with their declared types).
+
+    Args:
+        filepath_or_buffer: File path or URL.
+        columns_dtype (dict): Columns to load, and their types. See `cowidev.oxcgrt.dtypes`.
+    """
+    return pd.read_csv(filepath_or_buffer, usecols=list(columns_dtype), dtype=columns_dtype)
+
+
 def run_etl(output_path: str, output_path_diff: str):
     etl = OxCGRTETL()
     etl.run(output_path, output_path_diff)
@@ -4,6 +4,8 @@ import pandas as pd
 from cowidev.grapher.db.base import GrapherBaseUpdater
 from cowidev.utils.utils import time_str_grapher, get_filename
 from cowidev.utils.clean.dates import DATE_FORMAT
+from cowidev.oxcgrt.dtypes import dtype
+from cowidev.oxcgrt.etl import read_oxcgrt
 
 ZERO_DAY = "2020-01-01"
 zero_day = datetime.strptime(ZERO_DAY, DATE_FORMAT)
@@ -12,39 +14,7 @@ URL_VACCINE = "https://raw.githubusercontent.com/OxCGRT/covid-policy-tracker/mas
 
 
 def run_grapheriser(input_path: str, input_path_country_std: str, output_path: str):
-    cgrt = pd.read_csv(
-        input_path,
-        low_memory=False,
-        usecols=[
-            "CountryName",
-            "Date",
-            "RegionCode",
-            "C1M_School closing",
-            "C2M_Workplace closing",
-            "C3M_Cancel public events",
-            "C4M_Restrictions on gatherings",
-            "C5M_Close public transport",
-            "C6M_Stay at home requirements",
-            "C7M_Restrictions on internal movement",
-            "C8EV_International travel controls",
-            "E1_Income support",
-            "E2_Debt/contract relief",
-            "E3_Fiscal measures",
-            "E4_International support",
-            "H1_Public information campaigns",
-            "H2_Testing policy",
-            "H3_Contact tracing",
-            "H4_Emergency investment in healthcare",
-            "H5_Investment in vaccines",
-            "H6M_Facial Coverings",
-            "H7_Vaccination policy",
-            "StringencyIndex_Average",
-            "ContainmentHealthIndex_Average",
-            "V2A_Vaccine Availability (summary)",
-            "V2B_Vaccine age eligibility/availability age floor (general population summary)",
-            "V2C_Vaccine age eligibility/availability age floor (at risk summary)",
-        ],
-    )
+    cgrt = read_oxcgrt(input_path, dtype)
     country_mapping = pd.read_csv(input_path_country_std)
 
     cgrt = cgrt[cgrt.RegionCode.isnull()].drop(columns="RegionCode")
@@ -1,43 +1,105 @@
+"""Deaths per day, from the Swedish Public Health Agency (Folkhälsomyndigheten).
+
+The source workbook is only parsed if it changed since the last download (its MD5 is kept in the state file), and the
+grapher file is only rebuilt if its inputs changed: the deaths table, and the dates within the incomplete period (which
+moves with the current date).
+"""
 from datetime import datetime, timedelta
+import hashlib
+import importlib.util
+import io
 import os
-import sys
 import pandas as pd
 import pytz
 import numpy as np
 
 from cowidev import PATHS
 from cowidev.grapher.db.utils.db_imports import import_dataset
+from cowidev.utils.utils import read_state, write_state
+from cowidev.utils.web.scraping import get_response
 
 
 DATASET_NAME = "COVID-19 - Swedish Public Health Agency"
 ZERO_DAY = "2020-01-01"
 URL = "https://www.arcgis.com/sharing/rest/content/items/b5e7488e117749c19881cce45db13f7e/data"
+SHEET_NAME = "Antal avlidna per dag"
+COLUMNS = ["Datum_avliden", "Antal_avlidna"]
+OUTPUT_FILE = os.path.join(PATHS.INTERNAL_GRAPHER_DIR, f"{DATASET_NAME}.csv")
+STATE_FILE = PATHS.INTERNAL_TMP_SWEDEN_STATE_FILE
 
 
 def download_data():
-    df = pd.read_excel(URL, sheet_name="Antal avlidna per dag")
+    """Download the workbook, and export its deaths sheet, unless the workbook did not change."""
+    content = get_response(URL, timeout=60).content
+    workbook_hash = hashlib.md5(content).hexdigest()
+    state = read_state(STATE_FILE)
+    if state.get("workbook_hash") == workbook_hash and os.path.isfile(PATHS.INTERNAL_INPUT_SWEDEN_DEATHS_FILE):
+        return
+    df = read_deaths_sheet(content)
     df.to_csv(PATHS.INTERNAL_INPUT_SWEDEN_DEATHS_FILE, index=False)
+    write_state(STATE_FILE, {**state, "workbook_hash": workbook_hash})
+
+
+def read_deaths_sheet(content: bytes) -> pd.DataFrame:
+    """Read the deaths sheet (only the needed columns) from the workbook, with the fastest engine available."""
+    return pd.read_excel(io.BytesIO(content), sheet_name=SHEET_NAME, usecols=COLUMNS, engine=_get_excel_engine())
+
+
+def _get_excel_engine():
+    """Use calamine (requires pandas>=2.2 and python-calamine) if available, otherwise the default (openpyxl)."""
+    pandas_version = tuple(int(v) for v in pd.__version__.split(".")[:2])
+    if pandas_version >= (2, 2) and importlib.util.find_spec("python_calamine") is not None:
+        return "calamine"
+    return None
 
 
 def generate_dataset():
-    df = pd.read_csv(PATHS.INTERNAL_INPUT_SWEDEN_DEATHS_FILE, usecols=["Datum_avliden", "Antal_avlidna"])
+    """Build the grapher file, unless its inputs did not change since it was last built."""
+    df = read_deaths()
+    date_now = datetime.now()
+    signature = _get_signature(df, date_now)
+    state = read_state(STATE_FILE)
+    if state.get("grapher_signature") == signature and os.path.isfile(OUTPUT_FILE):
+        return
+    df = build_grapher_file(df, date_now)
+    df.to_csv(OUTPUT_FILE, index=False)
+    write_state(STATE_FILE, {**state, "grapher_signature": signature})
+
+
+def read_deaths() -> pd.DataFrame:
+    """Load daily deaths (with known date of death)."""
+    df = pd.read_csv(
+        PATHS.INTERNAL_INPUT_SWEDEN_DEATHS_FILE,
+        usecols=COLUMNS,
+        dtype={"Datum_avliden": str, "Antal_avlidna": float},
+    )
     df = df.rename(columns={"Datum_avliden": "Date", "Antal_avlidna": "Deaths"})
     df = df.dropna()
     df = df[-df["Date"].str.contains("ppgift saknas")]
     df["Date"] = pd.to_datetime(df["Date"])
     assert len(df) > 100
+    return df.sort_values("Date")
+
 
-    df = df.sort_values("Date")
+def build_grapher_file(df: pd.DataFrame, date_now: datetime) -> pd.DataFrame:
+    df = df.copy()
     df.loc[:, "Deaths"] = df["Deaths"].rolling(7).mean().round(1)
-    df.loc[df["Date"] >= (datetime.now() - timedelta(days=15)), "Incomplete deaths"] = df["Deaths"]
-    df.loc[df["Date"] >= (datetime.now() - timedelta(days=14)), "Deaths"] = np.nan
+    df.loc[df["Date"] >= (date_now - timedelta(days=15)), "Incomplete deaths"] = df["Deaths"]
+    df.loc[df["Date"] >= (date_now - timedelta(days=14)), "Deaths"] = np.nan
 
     df["Country"] = "Sweden"
     df["Year"] = (df["Date"] - datetime(2020, 1, 1)).dt.days
     del df["Date"]
 
-    df = df[["Country", "Year", "Deaths", "Incomplete deaths"]]
-    df.to_csv(os.path.join(PATHS.INTERNAL_GRAPHER_DIR, f"{DATASET_NAME}.csv"), index=False)
+    return df[["Country", "Year", "Deaths", "Incomplete deaths"]]
+
+
+def _get_signature(df: pd.DataFrame, date_now: datetime) -> str:
+    """Signature (MD5) of the inputs of the grapher file: deaths, and number of dates in each incomplete period."""
+    hash_ = hashlib.md5(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    for days in (15, 14):
+        hash_.update(str((df["Date"] >= (date_now - timedelta(days=days))).sum()).encode())
+    return hash_.hexdigest()
 
 
 def update_db():
@@ -46,7 +108,7 @@ def update_db():
     import_dataset(
         dataset_name=DATASET_NAME,
         namespace="owid",
-        csv_path=os.path.join(PATHS.INTERNAL_GRAPHER_DIR, DATASET_NAME + ".csv"),
+        csv_path=OUTPUT_FILE,
         default_variable_display={"yearIsDay": True, "zeroDay": ZERO_DAY},
         source_name=source_name,
         slack_notifications=False,
@@ -3,7 +3,7 @@ import pkgutil
 
 __all__ = []
 
+
+# Modules are only listed here, they are imported when executed
 for loader, module_name, _is_pkg in pkgutil.walk_packages(__path__):
     __all__.append(module_name)
-    _module = loader.find_module(module_name).load_module(module_name)
-    globals()[module_name] = _module
@@ -4,7 +4,7 @@ import json
 from bs4 import BeautifulSoup, element
 import pandas as pd
 
-from cowidev.utils import clean_count, clean_date_series, get_soup
+from cowidev.utils import clean_count_series, clean_date_series, get_soup
 from cowidev.testing.utils.base import CountryTestBase
 
 
@@ -70,7 +70,7 @@ class Andorra(CountryTestBase):
         """Pipes metrics."""
         return df.assign(
             **{
-                "Cumulative total": df.pcr.apply(clean_count) + df.tma.apply(clean_count),
+                "Cumulative total": df.pcr.pipe(clean_count_series) + df.tma.pipe(clean_count_series),
             }
         )
 
@@ -5,7 +5,7 @@ import pandas as pd
 
 from cowidev.testing import CountryTestBase
 from cowidev.utils.web import get_soup
-from cowidev.utils.clean import clean_date_series, clean_count
+from cowidev.utils.clean import clean_date_series, clean_count_series
 
 
 class Armenia(CountryTestBase):
@@ -63,7 +63,10 @@ class Armenia(CountryTestBase):
     def pipe_metrics(self, df: pd.DataFrame) -> pd.DataFrame:
         """Process metrics"""
         return df.assign(
-            **{"Daily change in cumulative total": df.positive.apply(clean_count) + df.negative.apply(clean_count)}
+            **{
+                "Daily change in cumulative total": df.positive.pipe(clean_count_series)
+                + df.negative.pipe(clean_count_series)
+            }
         )
 
     def pipe_pr(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -2,7 +2,7 @@ import pandas as pd
 
 from cowidev.testing import CountryTestBase
 from cowidev.testing.utils import make_monotonic
-from cowidev.utils import clean_date_series, clean_count
+from cowidev.utils import clean_date_series, clean_count_series
 from cowidev.utils.web.download import read_csv_from_url
 
 
@@ -35,7 +35,7 @@ class Australia(CountryTestBase):
         df = df.drop(df[df["Cumulative total"] == "-"].index)
         return df.assign(
             **{
-                "Cumulative total": df["Cumulative total"].apply(clean_count),
+                "Cumulative total": df["Cumulative total"].pipe(clean_count_series),
             }
         )
 
@@ -1,7 +1,7 @@
 import pandas as pd
 
 from cowidev.testing import CountryTestBase
-from cowidev.utils import clean_date_series, clean_count
+from cowidev.utils import clean_date_series, clean_count_series
 from cowidev.utils.web import request_json
 
 
@@ -19,8 +19,8 @@ class Colombia(CountryTestBase):
         # Clean
         df = df[df[""] != ""]
         df = df.assign(Date=clean_date_series(df[""], "%d/%m/%Y"))
-        df["Positivas"] = df["Positivas"].apply(clean_count)
-        df["Total Px Ag"] = df["Total Px Ag"].apply(clean_count)
+        df["Positivas"] = df["Positivas"].pipe(clean_count_series)
+        df["Total Px Ag"] = df["Total Px Ag"].pipe(clean_count_series)
         return df
 
     def _read_pcr(self):
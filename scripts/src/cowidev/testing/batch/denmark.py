@@ -2,7 +2,7 @@ import os
 import tempfile
 import pandas as pd
 
-from cowidev.utils import clean_count, get_soup
+from cowidev.utils import clean_count_series, get_soup
 from cowidev.utils.io import extract_zip
 from cowidev.testing import CountryTestBase
 
@@ -34,8 +34,8 @@ class Denmark(CountryTestBase):
     def pipe_metrics(self, df: pd.DataFrame) -> pd.DataFrame:
         df = df.assign(
             **{
-                "Daily change in cumulative total": df.Tested.apply(clean_count),
-                "Cumulative total": df.Tested_kumulativ.apply(clean_count),
+                "Daily change in cumulative total": df.Tested.pipe(clean_count_series),
+                "Cumulative total": df.Tested_kumulativ.pipe(clean_count_series),
             }
         )
         df = df[df["Daily change in cumulative total"] != 0]
@@ -6,10 +6,9 @@ import os
 import time
 import pandas as pd
 from glob import glob
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 
 from cowidev.testing import CountryTestBase
+from cowidev.utils.web.scraping import get_driver
 
 
 class Guatemala(CountryTestBase):
@@ -20,31 +19,7 @@ class Guatemala(CountryTestBase):
     source_url_ref = source_url
 
     def export(self):
-        # Options for Chrome WebDriver
-        op = Options()
-        op.add_argument("--disable-notifications")
-        op.add_experimental_option(
-            "prefs",
-            {
-                "download.prompt_for_download": False,
-                "download.directory_upgrade": True,
-                "safebrowsing.enabled": True,
-            },
-        )
-
-        with webdriver.Chrome(options=op) as driver:
-
-            # Setting Chrome to trust downloads
-            driver.command_executor._commands["send_command"] = (
-                "POST",
-                "/session/$sessionId/chromium/send_command",
-            )
-            params = {
-                "cmd": "Page.setDownloadBehavior",
-                "params": {"behavior": "allow", "downloadPath": "tmp"},
-            }
-            command_result = driver.execute("send_command", params)
-
+        with get_driver(headless=False, download_folder="tmp") as driver:
             driver.get(self.source_url)
             time.sleep(3)
             driver.find_element_by_class_name("fa-file-download").click()
@@ -5,7 +5,7 @@ import pandas as pd
 
 from cowidev.testing import CountryTestBase
 from cowidev.utils.web import get_soup
-from cowidev.utils.clean import clean_date_series, clean_count
+from cowidev.utils.clean import clean_date_series, clean_count_series
 
 
 class Iceland(CountryTestBase):
@@ -90,8 +90,8 @@ class Iceland(CountryTestBase):
 
     def pipe_row_sum(self, df: pd.DataFrame) -> pd.DataFrame:
         """Sum rows"""
-        df["Daily change in cumulative total"] = df[["t1", "t2", "t3"]].applymap(clean_count).sum(axis=1)
-        df["positive"] = df[["p1", "p2", "p3"]].applymap(clean_count).sum(axis=1)
+        df["Daily change in cumulative total"] = df[["t1", "t2", "t3"]].apply(clean_count_series).sum(axis=1)
+        df["positive"] = df[["p1", "p2", "p3"]].apply(clean_count_series).sum(axis=1)
         return df.drop_duplicates(subset="Date")
 
     def pipe_pr(self, df: pd.DataFrame) -> pd.DataFrame:
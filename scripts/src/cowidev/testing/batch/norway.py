@@ -1,7 +1,7 @@
 import pandas as pd
 
 from cowidev.utils.web import request_json
-from cowidev.utils.clean import clean_date_series, clean_count
+from cowidev.utils.clean import clean_date_series, clean_count_series
 from cowidev.testing import CountryTestBase
 
 
@@ -27,7 +27,10 @@ class Norway(CountryTestBase):
     def pipe_metrics(self, df: pd.DataFrame):
         """Pipes metrics"""
         df = df.assign(
-            **{"Daily change in cumulative total": df.Negative.apply(clean_count) + df.Positive.apply(clean_count)}
+            **{
+                "Daily change in cumulative total": df.Negative.pipe(clean_count_series)
+                + df.Positive.pipe(clean_count_series)
+            }
         )
         return df[df["Daily change in cumulative total"] > 0].drop_duplicates(subset="Date", keep="last")
 
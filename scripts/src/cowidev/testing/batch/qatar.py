@@ -1,7 +1,7 @@
 import pandas as pd
 
 from cowidev.utils.web import request_json
-from cowidev.utils.clean import clean_date_series, clean_count
+from cowidev.utils.clean import clean_date_series, clean_count_series
 from cowidev.testing import CountryTestBase
 
 
@@ -34,7 +34,7 @@ class Qatar(CountryTestBase):
         """Pipes metrics"""
         df = df.assign(
             **{
-                "Daily change in cumulative total": df["Daily change in cumulative total"].apply(clean_count),
+                "Daily change in cumulative total": df["Daily change in cumulative total"].pipe(clean_count_series),
             }
         )
         return df[df["Daily change in cumulative total"] > 0].drop_duplicates(subset="Date", keep="last")
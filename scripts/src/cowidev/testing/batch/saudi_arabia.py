@@ -1,7 +1,7 @@
 import pandas as pd
 
 from cowidev.utils.web import request_json
-from cowidev.utils import clean_date_series, clean_count
+from cowidev.utils import clean_date_series, clean_count_series
 from cowidev.testing import CountryTestBase
 
 # from cowidev.testing.utils import make_monotonic
@@ -44,7 +44,7 @@ class SaudiArabia(CountryTestBase):
         """Pipes metrics"""
         return df.assign(
             **{
-                "Daily change in cumulative total": df["Daily change in cumulative total"].apply(clean_count),
+                "Daily change in cumulative total": df["Daily change in cumulative total"].pipe(clean_count_series),
                 # "Cumulative total": df["Cumulative total"].apply(clean_count),
             }
         )
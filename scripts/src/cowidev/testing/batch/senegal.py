@@ -1,7 +1,7 @@
 import pandas as pd
 
 from cowidev.utils.web import request_json
-from cowidev.utils.clean import clean_date_series, clean_count
+from cowidev.utils.clean import clean_date_series, clean_count_series
 from cowidev.testing import CountryTestBase
 
 
@@ -43,7 +43,7 @@ class Senegal(CountryTestBase):
         """Pipes metrics"""
         return df.assign(
             **{
-                "Daily change in cumulative total": df["Daily change in cumulative total"].apply(clean_count),
+                "Daily change in cumulative total": df["Daily change in cumulative total"].pipe(clean_count_series),
             }
         )
 
@@ -2,7 +2,7 @@ from distutils.command.clean import clean
 import pandas as pd
 
 from cowidev.testing import CountryTestBase
-from cowidev.utils import clean_date_series, clean_count
+from cowidev.utils import clean_date_series, clean_count_series
 
 
 class SouthKorea(CountryTestBase):
@@ -22,7 +22,7 @@ class SouthKorea(CountryTestBase):
         df = df[pd.to_numeric(df["TOTAL_TEST"], errors="coerce").notnull()]
         df = df.assign(Date=clean_date_series(df["DATE"], "%Y-%m-%d"))
         df["Daily change in cumulative total"] = df["TOTAL_TEST"].astype("int32").diff(periods=-1)
-        df["TOTAL_TEST"] = df["TOTAL_TEST"].apply(clean_count)
+        df["TOTAL_TEST"] = df["TOTAL_TEST"].pipe(clean_count_series)
         return df[["Date", "Daily change in cumulative total"]].loc[df["Date"] < "2020-12-18"]
 
     def _read_new(self):
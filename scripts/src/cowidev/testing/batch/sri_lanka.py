@@ -1,7 +1,7 @@
 import pandas as pd
 
 from cowidev.utils.web import request_json
-from cowidev.utils.clean import clean_date_series, clean_count
+from cowidev.utils.clean import clean_date_series, clean_count_series
 from cowidev.testing import CountryTestBase
 
 
@@ -37,7 +37,7 @@ class SriLanka(CountryTestBase):
         df = df.assign(
             **{
                 "Daily change in cumulative total": (
-                    df["antigen_count"].apply(clean_count) + df["pcr_count"].apply(clean_count)
+                    df["antigen_count"].pipe(clean_count_series) + df["pcr_count"].pipe(clean_count_series)
                 ),
             }
         )
@@ -4,7 +4,7 @@ from datetime import datetime, timedelta
 
 import pandas as pd
 from cowidev.testing import CountryTestBase
-from cowidev.utils.clean import clean_date, clean_count
+from cowidev.utils.clean import clean_date, clean_count_series
 from cowidev.utils.web import get_soup
 
 
@@ -64,8 +64,8 @@ class ElSalvador(CountryTestBase):
 
     def pipe_numeric(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean numeric columns"""
-        df["positive"] = df["positive"].apply(clean_count)
-        df["Daily change in cumulative total"] = df["Daily change in cumulative total"].apply(clean_count)
+        df["positive"] = df["positive"].pipe(clean_count_series)
+        df["Daily change in cumulative total"] = df["Daily change in cumulative total"].pipe(clean_count_series)
         return df
 
     def pipe_pr(self, df: pd.DataFrame) -> pd.DataFrame:
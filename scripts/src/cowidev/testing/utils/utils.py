@@ -1,5 +1,7 @@
 import pandas as pd
 
+from cowidev.utils.utils import monotonic_mask
+
 
 def make_monotonic(df: pd.DataFrame, max_removed_rows=10) -> pd.DataFrame:
     # Forces time series to become monotonic.
@@ -11,10 +13,7 @@ def make_monotonic(df: pd.DataFrame, max_removed_rows=10) -> pd.DataFrame:
 
     df = df.sort_values("Date")
     metrics = ("Cumulative total",)
-    for metric in metrics:
-        while not df[metric].ffill().fillna(0).is_monotonic:
-            diff = df[metric].ffill().shift(-1) - df[metric].ffill()
-            df = df[(diff >= 0) | (diff.isna())]
+    df = df[monotonic_mask(df, metrics)]
     dates_now = set(df.Date)
 
     if max_removed_rows is not None:
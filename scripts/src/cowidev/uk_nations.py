@@ -3,6 +3,7 @@ import os
 import pytz
 import requests
 
+import numpy as np
 import pandas as pd
 from uk_covid19 import Cov19API
 
@@ -12,6 +13,10 @@ from cowidev.grapher.db.utils.db_imports import import_dataset
 DATASET_NAME = "uk_covid_data"
 OUTPUT_CSV = os.path.join(PATHS.INTERNAL_GRAPHER_DIR, f"{DATASET_NAME}.csv")
 ZERO_DAY = "2020-01-01"
+# Decoupling metrics: metrics are normalized by their peak within this period
+PEAK_PERIOD_START = "2020-12-09"
+PEAK_PERIOD_END = "2021-02-23"
+DECOUPLING_METRICS = ["weekly_cases_rolling", "people_in_hospital", "people_ventilated", "weekly_deaths_rolling"]
 
 
 def get_uk() -> pd.DataFrame:
@@ -53,44 +58,64 @@ def get_uk() -> pd.DataFrame:
     return pd.merge(uk, uk_rate)
 
 
-def find_metric_peak(df: pd.DataFrame, metric: str, period_start="2020-12-09", period_end="2021-02-23") -> tuple:
-    period_df = df[(df.Year >= period_start) & (df.Year <= period_end)][["Year", metric]]
-    period_df = period_df.sort_values(metric, ascending=False, na_position="last")
-    peak_date = period_df.Year.values[0]
-    peak_value = period_df[metric].values[0]
-    return peak_date, peak_value
+def find_metric_peak(
+    df: pd.DataFrame, metric: str, period_start=PEAK_PERIOD_START, period_end=PEAK_PERIOD_END
+) -> pd.DataFrame:
+    """Find the peak of `metric` within the period of each country.
+
+    The peak is the first row with the maximum value in the period (or the first row of the period if there are no
+    values in it).
+
+    Returns:
+        pd.DataFrame: Date (`Year`) and value (`metric`) of the peak, indexed by row label (one row per country).
+    """
+    msk = (df.Year >= period_start) & (df.Year <= period_end)
+    values = df[metric].where(msk)
+    peak_idx = values.groupby(df.Country).idxmax()
+    first_idx = df.index.to_series()[msk].groupby(df.Country).first()
+    peak_idx = peak_idx.fillna(first_idx).dropna().astype(first_idx.dtype)
+    return df.loc[peak_idx, ["Country", "Year", metric]].set_index("Country")
 
 
 def add_decoupling_metrics(df: pd.DataFrame) -> pd.DataFrame:
-    if df.people_ventilated.isnull().all() or df.weekly_cases_rolling.isnull().all():
-        df[
-            [
-                "weekly_cases_rolling_normalized",
-                "people_in_hospital_normalized",
-                "people_ventilated_normalized",
-                "weekly_deaths_rolling_normalized",
-            ]
-        ] = pd.NA
-        return df
-
-    case_peak_date, case_peak_value = find_metric_peak(df, "weekly_cases_rolling")
-    hosp_peak_date, hosp_peak_value = find_metric_peak(df, "people_in_hospital")
-    icu_peak_date, icu_peak_value = find_metric_peak(df, "people_ventilated")
-    death_peak_date, death_peak_value = find_metric_peak(df, "weekly_deaths_rolling")
-
-    hosp_shift = (pd.to_datetime(hosp_peak_date) - pd.to_datetime(case_peak_date)).days
-    icu_shift = (pd.to_datetime(icu_peak_date) - pd.to_datetime(case_peak_date)).days
-    death_shift = (pd.to_datetime(death_peak_date) - pd.to_datetime(case_peak_date)).days
-
-    df["weekly_cases_rolling_normalized"] = (df.weekly_cases_rolling / case_peak_value).mul(100).round(2)
-    df["people_in_hospital_normalized"] = (df.people_in_hospital.shift(hosp_shift) / hosp_peak_value).mul(100).round(2)
-    df["people_ventilated_normalized"] = (df.people_ventilated.shift(icu_shift) / icu_peak_value).mul(100).round(2)
-    df["weekly_deaths_rolling_normalized"] = (
-        (df.weekly_deaths_rolling.shift(death_shift) / death_peak_value).mul(100).round(2)
-    )
+    """Add the decoupling metrics of all countries: each metric is shifted by the number of days between its peak and
+    the case peak (in rows, within each country), and normalized by its peak value.
+
+    Countries without values for people_ventilated or weekly_cases_rolling get no value. Index must be unique.
+    """
+    has_data = df[["people_ventilated", "weekly_cases_rolling"]].notnull().groupby(df.Country).transform("any")
+    has_data = has_data.all(axis=1)
+    df_data = df[has_data]
+
+    peaks = {metric: find_metric_peak(df_data, metric) for metric in DECOUPLING_METRICS}
+    case_peak_date = pd.to_datetime(peaks["weekly_cases_rolling"].Year)
+    for metric, peak in peaks.items():
+        shift = (pd.to_datetime(peak.Year) - case_peak_date).dt.days
+        values = _shift_by_group(df_data[metric], df_data.Country, df_data.Country.map(shift))
+        # Peak value, broadcast to all the rows of the country
+        peak_value = df_data.Country.map(peak[metric])
+        df[f"{metric}_normalized"] = (values / peak_value).mul(100).round(2)
     return df
 
 
+def _shift_by_group(values: pd.Series, groups: pd.Series, periods: pd.Series) -> pd.Series:
+    """Shift `values` by `periods` rows within each group, as `groupby(groups).shift`, but with a (row-wise) number
+    of periods. Rows with no number of periods get NaN."""
+    codes = pd.factorize(groups)[0]
+    order = np.argsort(codes, kind="stable")
+    codes_sorted = codes[order]
+    group_start = np.searchsorted(codes_sorted, codes)
+    group_size = np.bincount(codes)[codes]
+    position = np.empty(len(codes), dtype=int)
+    position[order] = np.arange(len(codes)) - group_start[order]
+
+    source = position - periods.to_numpy(dtype=float)
+    msk = (source >= 0) & (source < group_size)
+    source_row = order[np.where(msk, group_start + source, 0).astype(int)]
+    shifted = np.where(msk, values.to_numpy(dtype=float)[source_row], np.nan)
+    return pd.Series(shifted, index=values.index)
+
+
 def get_nation() -> pd.DataFrame:
     # Absolute
     filters = ["areaType=nation"]
@@ -184,15 +209,17 @@ def get_nhs_region() -> pd.DataFrame:
     return api.get_dataframe()
 
 
-def get_day_diff(dt):
-    return (datetime.strptime(dt, "%Y-%m-%d") - datetime.strptime(ZERO_DAY, "%Y-%m-%d")).days
+def get_day_diff(dates: pd.Series) -> pd.Series:
+    """Number of days since ZERO_DAY of each date (YYYY-MM-DD)."""
+    days = pd.to_datetime(dates, format="%Y-%m-%d").to_numpy(dtype="datetime64[D]").astype("int64")
+    return pd.Series(days - np.datetime64(ZERO_DAY, "D").astype("int64"), index=dates.index)
 
 
 def generate_dataset():
     combined = pd.concat([get_uk(), get_nation(), get_local(), get_nhs_region()])
-    combined = combined.drop_duplicates(subset=["Country", "Year"], keep="first")
+    combined = combined.drop_duplicates(subset=["Country", "Year"], keep="first").reset_index(drop=True)
 
-    combined = combined.groupby("Country").apply(add_decoupling_metrics)
+    combined = add_decoupling_metrics(combined)
 
     combined["daily_cases_rolling_average"] = combined["weekly_cases_rolling"] / 7
     combined["daily_deaths_rolling_average"] = combined["weekly_deaths_rolling"] / 7
@@ -200,7 +227,7 @@ def generate_dataset():
     combined["daily_deaths_rate_rolling_average"] = combined["weekly_deaths_rate"] / 7
     combined["new_hospital_admissions"] = combined["weekly_hospital_admissions"] / 7
 
-    combined["Year"] = combined["Year"].apply(get_day_diff)
+    combined["Year"] = get_day_diff(combined["Year"])
 
     combined = combined[["Country"] + [col for col in combined.columns if col != "Country"]]
     combined = (
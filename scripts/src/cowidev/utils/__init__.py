@@ -1,5 +1,21 @@
-from cowidev.utils.web import get_soup
-from cowidev.utils.clean import clean_date, clean_date_series, clean_count
+import importlib
+
+
+# Objects exposed at package level, imported on first access (so that importing any `cowidev.utils` submodule, e.g.
+# `cowidev.utils.paths`, does not import pandas, requests, etc.)
+_LAZY_OBJECTS = {
+    "get_soup": "cowidev.utils.web",
+    "clean_date": "cowidev.utils.clean",
+    "clean_date_series": "cowidev.utils.clean",
+    "clean_count": "cowidev.utils.clean",
+    "clean_count_series": "cowidev.utils.clean",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_OBJECTS:
+        return getattr(importlib.import_module(_LAZY_OBJECTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 __all__ = [
@@ -7,4 +23,5 @@ __all__ = [
     "clean_date",
     "clean_date_series",
     "clean_count",
+    "clean_count_series",
 ]
@@ -1,4 +1,4 @@
-from .numbers import clean_count
+from .numbers import clean_count, clean_count_series
 from .strings import clean_string
 from .dataframes import clean_column_name, clean_df_columns_multiindex
 from .urls import clean_urls
@@ -6,6 +6,7 @@ from .dates import clean_date, extract_clean_date, clean_date_series
 
 __all__ = [
     "clean_count",
+    "clean_count_series",
     "clean_string",
     "clean_column_name",
     "clean_df_columns_multiindex",
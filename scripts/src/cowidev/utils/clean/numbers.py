@@ -35,16 +35,28 @@ class NumericCleaner:
     regex_number_not_verbose: str = r"\d+((.\d+)+)?"
     regex_number_not_verbose_correct: str = r"\d+((.\d{3})+)?"
 
-    @property
-    def regex_number_verbose(self):
+    @classmethod
+    def _compile(cls):
+        """Compile regular expressions. Called once, at import time."""
+        cls.pattern_number_verbose = re.compile(cls._build_regex_number_verbose())
+        cls.pattern_number_not_verbose = re.compile(cls.regex_number_not_verbose)
+        cls.pattern_number_not_verbose_correct = re.compile(cls.regex_number_not_verbose_correct)
+        cls.factors = pd.Series({k: v["factor"] for k, v in cls.numeric_words.items()})
+
+    @classmethod
+    def _build_regex_number_verbose(cls):
         regex = [
-            self.regex_number_verbose_template.format(k, "|".join(v["words"])) for k, v in self.numeric_words.items()
+            cls.regex_number_verbose_template.format(k, "|".join(v["words"])) for k, v in cls.numeric_words.items()
         ]
         regex = "\s?".join(regex)
         return regex
 
+    @property
+    def regex_number_verbose(self):
+        return self.pattern_number_verbose.pattern
+
     def _match_numeric_words(self, num_as_str):
-        match = re.search(self.regex_number_verbose, num_as_str)
+        match = self.pattern_number_verbose.search(num_as_str)
         numbers = match.groupdict(default=0)
         return numbers
 
@@ -60,13 +72,11 @@ class NumericCleaner:
         return num_as_str
 
     def _is_verbose(self, num):
-        pattern = re.compile(self.regex_number_not_verbose)
-        match = pattern.fullmatch(num)
+        match = self.pattern_number_not_verbose.fullmatch(num)
         return not match
 
     def _is_not_verbose_and_incorrect(self, num):
-        pattern = re.compile(self.regex_number_not_verbose_correct)
-        match = pattern.fullmatch(num)
+        match = self.pattern_number_not_verbose_correct.fullmatch(num)
         return not match
 
     def clean_verbose_number(self, num_as_str):
@@ -85,29 +95,45 @@ class NumericCleaner:
         num = int(num)
         return num
 
+    def run_series(self, ds: pd.Series) -> pd.Series:
+        """Vectorized version of `run`, cleans all values of `ds` at once.
 
-def clean_count(count):
-    cleaner = NumericCleaner()
-    return cleaner.run(count)
+        Args:
+            ds (pd.Series): Numbers, possibly as text (e.g. "1,234", "1.2 million").
 
+        Returns:
+            pd.Series: Cleaned numbers (int64).
+        """
+        nums = ds.astype(str).str.strip()
+        is_verbose = ~nums.str.fullmatch(self.pattern_number_not_verbose)
+        if (~is_verbose & ~nums.str.fullmatch(self.pattern_number_not_verbose_correct)).any():
+            raise ValueError("The format of the number seems to be not correct! Please review.")
+        if is_verbose.any():
+            numbers = nums[is_verbose].str.extract(self.pattern_number_verbose).astype(float).fillna(0)
+            verbose = numbers.mul(self.factors[numbers.columns]).sum(axis=1).astype("int64").astype(str)
+            nums = nums.mask(is_verbose, verbose)
+        nums = nums.str.replace(r"[^0-9]", "", regex=True)
+        if (nums == "").any():
+            raise ValueError("Some values could not be converted to numbers! Please review.")
+        return pd.to_numeric(nums).astype("int64")
+
+
+NumericCleaner._compile()
+_NUMERIC_CLEANER = NumericCleaner()
 
-def _series_to_int64(ds):
-    return ds.astype(pd.Int64Dtype())
+
+def clean_count(count):
+    return _NUMERIC_CLEANER.run(count)
 
 
-def _series_to_float(ds):
-    return ds.astype(float)
+def clean_count_series(ds: pd.Series) -> pd.Series:
+    """Clean a series of counts. Vectorized version of `clean_count`."""
+    return _NUMERIC_CLEANER.run_series(ds)
 
 
 def metrics_to_num_int(df, metrics):
-    for metric in metrics:
-        if metric in df.columns:  # and any(df[metric].isnull()):
-            df.loc[:, metric] = _series_to_int64(df[metric])
-    return df
+    return df.astype({metric: pd.Int64Dtype() for metric in metrics if metric in df.columns})
 
 
 def metrics_to_num_float(df, metrics):
-    for metric in metrics:
-        if metric in df.columns:  # and any(df[metric].isnull()):
-            df.loc[:, metric] = _series_to_float(df[metric])
-    return df
+    return df.astype({metric: float for metric in metrics if metric in df.columns})
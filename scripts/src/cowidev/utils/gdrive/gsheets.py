@@ -1,5 +1,4 @@
 import os
-from gsheets import Sheets
 
 from cowidev.utils.gdrive.credentials import CLIENT_SECRETS_PATH, CREDENTIALS_PATH
 
@@ -16,6 +15,8 @@ class GSheetApi:
     @property
     def sheets(self):
         if self.__sheets is None:
+            from gsheets import Sheets
+
             self.__sheets = Sheets.from_files(self.clients_secrets, self.credentials, no_webserver=True)
         return self.__sheets
 
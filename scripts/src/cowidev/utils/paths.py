@@ -85,7 +85,13 @@ DATA_TIMESTAMP_OLD_FILE = os.path.join(DATA_TIMESTAMP_DIR, "owid-covid-data-last
 INTERNAL_DIR = os.path.join(PROJECT_DIR, "scripts")
 
 ## Output
-INTERNAL_TMP_DIR = os.path.join(INTERNAL_DIR, "tmp")
+INTERNAL_TMP_DIR = os.path.join(INTERNAL_DIR, "tmp")  # Local caches and state, git-ignored
+INTERNAL_TMP_MACRO_FILE = os.path.join(INTERNAL_TMP_DIR, "macro_variables.feather")
+INTERNAL_TMP_GMOBILITY_FILE = os.path.join(INTERNAL_TMP_DIR, "google_mobility.feather")
+INTERNAL_TMP_GRAPHER_DB_MANIFEST_FILE = os.path.join(INTERNAL_TMP_DIR, "grapher_db_manifest.json")
+INTERNAL_TMP_JHU_DIR = os.path.join(INTERNAL_TMP_DIR, "jhu")
+INTERNAL_TMP_DECOUPLING_DIR = os.path.join(INTERNAL_TMP_DIR, "decoupling")
+INTERNAL_TMP_SWEDEN_STATE_FILE = os.path.join(INTERNAL_TMP_DIR, "sweden.json")
 ## Output
 INTERNAL_OUTPUT_DIR = os.path.join(INTERNAL_DIR, "output")
 ### Output vax
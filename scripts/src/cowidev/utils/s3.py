@@ -10,8 +10,6 @@ from os import path
 from typing import Optional, Union
 
 import pandas as pd
-import boto3
-from botocore.exceptions import ClientError
 
 from cowidev.utils.log import get_logger
 
@@ -27,6 +25,8 @@ class S3:
 
     def connect(self, profile_name="default"):
         "Return a connection to Walden's DigitalOcean space."
+        import boto3
+
         self.check_for_default_profile()
 
         session = boto3.Session(profile_name=profile_name)
@@ -69,6 +69,8 @@ class S3:
         # Obtain bucket & file
         bucket_name, s3_file = _url_to_path_and_bucket_mult(s3_path)
         # Upload
+        from botocore.exceptions import ClientError
+
         extra_args = {"ACL": "public-read"} if public else {}
         try:
             self.client.upload_file(local_path, bucket_name, s3_file, ExtraArgs=extra_args)
@@ -91,6 +93,8 @@ class S3:
         # Obtain bucket & file
         bucket_name, s3_file = _url_to_path_and_bucket_mult(s3_path)
         # Download
+        from botocore.exceptions import ClientError
+
         try:
             self.client.download_file(bucket_name, s3_file, local_path)
         except ClientError as e:
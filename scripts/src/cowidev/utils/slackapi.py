@@ -1,4 +1,3 @@
-from slack import WebClient
 from cowidev.utils.params import SECRETS
 
 ERROR_COLOR = "#a30200"
@@ -11,6 +10,8 @@ class SlackAPI:
         self.client = self._load_client()
 
     def _load_client(self):
+        from slack import WebClient
+
         if SECRETS.slack.token != "":
             return WebClient(token=SECRETS.slack.token)
         return None
@@ -7,6 +7,7 @@ import pytz
 import tempfile
 
 from xlsx2csv import Xlsx2csv
+import numpy as np
 import pandas as pd
 
 from cowidev import PATHS
@@ -26,15 +27,13 @@ def make_monotonic(
     df_before = df.copy()
 
     df = df.sort_values(column_date)
-    for metric in column_metrics:
-        print(metric)
-        while not (err := df[metric].ffill().fillna(0).is_monotonic):
-            print(err)
-            diff = df[metric].ffill().shift(-1) - df[metric].ffill()
-            if strict:
+    if strict:
+        for metric in column_metrics:
+            while not df[metric].ffill().fillna(0).is_monotonic:
+                diff = df[metric].ffill().shift(-1) - df[metric].ffill()
                 df = df[(diff > 0) | (diff.isna())]
-            else:
-                df = df[(diff >= 0) | (diff.isna())]
+    else:
+        df = df[monotonic_mask(df, column_metrics)]
     dates_now = set(df.date)
 
     if max_removed_rows is not None:
@@ -53,6 +52,31 @@ def make_monotonic(
     return df
 
 
+def monotonic_mask(df: pd.DataFrame, column_metrics: list) -> np.ndarray:
+    """Get the rows of `df` to keep so that all `column_metrics` become monotonically increasing.
+
+    The most recent values are assumed to be correct: a row is kept only if its (forward-filled) value is not higher
+    than any of the values that follow it. Leading NaNs are always kept. Metrics are processed in order, each one on
+    the rows kept by the previous ones, so the result is the same as repeatedly dropping adjacent violators until the
+    series is monotonic, but takes a single backward pass per metric.
+
+    Args:
+        df (pd.DataFrame): Input data, already sorted by date.
+        column_metrics (list): Metrics that should be monotonic.
+
+    Returns:
+        np.ndarray: Boolean mask with the rows to keep.
+    """
+    keep = np.ones(len(df), dtype=bool)
+    for metric in column_metrics:
+        idx = np.flatnonzero(keep)
+        values = pd.Series(df[metric].to_numpy()[idx]).astype(float).ffill().to_numpy()
+        # Minimum of all later values (NaNs are leading, hence ignored by fmin)
+        later_min = np.append(np.fmin.accumulate(values[::-1])[::-1][1:], np.inf)
+        keep[idx[~(np.isnan(values) | (values <= later_min))]] = False
+    return keep
+
+
 def make_monotonic_new(
     df: pd.DataFrame,
     column_date: str,
@@ -160,6 +184,22 @@ def dict_to_compact_json(d: dict):
     )
 
 
+def read_state(state_file: str) -> dict:
+    """Read the state (JSON object) of a pipeline step, e.g. signatures of its last processed inputs. Empty if the
+    step never saved it."""
+    if not os.path.isfile(state_file):
+        return {}
+    with open(state_file, "r") as f:
+        return json.load(f)
+
+
+def write_state(state_file: str, state: dict) -> None:
+    """Save the state (JSON object) of a pipeline step."""
+    os.makedirs(os.path.dirname(state_file), exist_ok=True)
+    with open(state_file, "w") as f:
+        json.dump(state, f, indent=2)
+
+
 def check_known_columns(df: pd.DataFrame, known_cols: list) -> None:
     unknown_cols = set(df.columns).difference(set(known_cols))
     if len(unknown_cols) > 0:
@@ -0,0 +1,118 @@
+"""Async versions of the web helpers (based on aiohttp), for country modules defining an async `main`.
+
+Requests within a `client_session` context share the same connection pool, with a limit of concurrent connections per
+host. Outside of it, each request uses its own session.
+"""
+import io
+import json
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from cowidev.utils.web.scraping import get_headers
+from cowidev.utils.web.utils import to_proxy_url
+
+
+LIMIT_PER_HOST = 4
+_SESSION = ContextVar("session", default=None)
+
+
+@asynccontextmanager
+async def client_session(limit_per_host: int = LIMIT_PER_HOST):
+    """Open a session shared by all the requests made within this context (including tasks created from it).
+
+    Args:
+        limit_per_host (int, optional): Maximum number of concurrent connections to the same host. Defaults to
+                                        LIMIT_PER_HOST.
+    """
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(limit_per_host=limit_per_host)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        token = _SESSION.set(session)
+        try:
+            yield session
+        finally:
+            _SESSION.reset(token)
+
+
+async def get_response_async(
+    source: str,
+    request_method: str = "get",
+    use_proxy: bool = False,
+    **kwargs,
+) -> bytes:
+    """Async version of `cowidev.utils.web.scraping.get_response`.
+
+    Accepts the same default arguments (`headers`, `verify` and `timeout`), plus any other argument of
+    aiohttp.ClientSession.request.
+
+    Returns:
+        bytes: Response content.
+    """
+    import aiohttp
+
+    source_orig = source
+    if request_method not in ("get", "post"):
+        raise ValueError(f"Invalid value for `request_method`: {request_method}. Use 'get' or 'post'")
+    kwargs["headers"] = kwargs.get("headers", get_headers())
+    kwargs["ssl"] = None if kwargs.pop("verify", True) else False
+    kwargs["timeout"] = aiohttp.ClientTimeout(total=kwargs.get("timeout", 20))
+    if use_proxy:
+        source = to_proxy_url(source)
+    async with _session() as session:
+        async with session.request(request_method, source, **kwargs) as response:
+            if not response.ok:
+                scrapapi_used = "Scraper API was used!\n" if use_proxy else ""
+                raise ValueError(
+                    f"Source {source_orig} not reached! {scrapapi_used}Error code {response.status} {response.reason}"
+                )
+            return await response.read()
+
+
+async def get_soup_async(
+    source: str,
+    from_encoding: str = None,
+    parser="lxml",
+    request_method: str = "get",
+    use_proxy: bool = False,
+    **kwargs,
+) -> BeautifulSoup:
+    """Async version of `cowidev.utils.web.scraping.get_soup`."""
+    content = await get_response_async(source, request_method, use_proxy, **kwargs)
+    soup = BeautifulSoup(content, parser, from_encoding=from_encoding)
+    if soup.text == "":
+        soup = BeautifulSoup(content, "html.parser", from_encoding=from_encoding)
+    return soup
+
+
+async def request_json_async(url, mode="soup", **kwargs) -> dict:
+    """Async version of `cowidev.utils.web.scraping.request_json`."""
+    if mode == "soup":
+        soup = await get_soup_async(url, **kwargs)
+        return json.loads(soup.text)
+    elif mode == "raw":
+        return json.loads(await get_response_async(url, **kwargs))
+    raise ValueError(f"Unrecognized `mode` value: {mode}. Accepted values are 'soup' and 'raw'.")
+
+
+async def read_csv_from_url_async(url, timeout=30, verify=True, use_proxy=False, **kwargs) -> pd.DataFrame:
+    """Async version of `cowidev.utils.web.download.read_csv_from_url`.
+
+    Args:
+        kwargs: Arguments for pandas.read_csv.
+    """
+    content = await get_response_async(url, timeout=timeout, verify=verify, use_proxy=use_proxy)
+    return pd.read_csv(io.BytesIO(content), **kwargs)
+
+
+@asynccontextmanager
+async def _session():
+    session = _SESSION.get()
+    if session is not None:
+        yield session
+    else:
+        async with client_session() as session:
+            yield session
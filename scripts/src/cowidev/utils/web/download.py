@@ -1,3 +1,8 @@
+import hashlib
+import inspect
+import io
+import json
+import os
 import tempfile
 from urllib.parse import urlparse
 import pandas as pd
@@ -62,6 +67,114 @@ def read_csv_from_url(url, timeout=30, verify=True, ciphers_low=False, use_proxy
     return df
 
 
+def read_csv_tail(url, n_bytes=64 * 1024, timeout=30, **kwargs):
+    """Load the last rows of a remote CSV, without downloading the complete file.
+
+    The file size and support for range requests are obtained from the HTTP HEAD metadata. Then, only the header line
+    and the last `n_bytes` of the file are downloaded (ranged GET requests).
+
+    Args:
+        url (str): File url.
+        n_bytes (int, optional): Number of trailing bytes to download. Defaults to 64 kB.
+        timeout (int, optional): Timeout of each request, in seconds. Defaults to 30.
+        kwargs: Arguments for pandas.read_csv.
+
+    Returns:
+        pandas.DataFrame: Last rows of the file. None if the server rejects the HEAD or range requests (or does not
+            support the latter), the file is too small to benefit from them, its header line does not fit in
+            `n_bytes` or the trailing rows can't be parsed. Callers should then read the complete file.
+    """
+    # Ranges refer to the encoded content, so ask for the file as is
+    headers = {"Accept-Encoding": "identity"}
+    try:
+        metadata = requests.head(url, headers=headers, timeout=timeout, allow_redirects=True)
+        if not metadata.ok:
+            return None
+        size = int(metadata.headers.get("Content-Length", 0))
+        if metadata.headers.get("Accept-Ranges") != "bytes" or size <= 2 * n_bytes:
+            return None
+        head = _get_byte_range(metadata.url, f"bytes=0-{n_bytes - 1}", headers, timeout)
+        tail = _get_byte_range(metadata.url, f"bytes=-{n_bytes}", headers, timeout)
+    except (requests.RequestException, ValueError):
+        return None
+    if head is None or tail is None or b"\n" not in head or b"\n" not in tail:
+        return None
+    header = head.split(b"\n", 1)[0]
+    # First trailing line is most likely truncated
+    rows = tail.split(b"\n", 1)[1]
+    try:
+        return pd.read_csv(io.BytesIO(header + b"\n" + rows), **kwargs)
+    except ValueError:  # e.g. columns in `usecols` not found, or bytes that can't be decoded
+        return None
+
+
+def _get_byte_range(url, byte_range, headers, timeout):
+    # Stream, so that the body is not downloaded if the server ignores the range
+    with requests.get(url, headers={**headers, "Range": byte_range}, timeout=timeout, stream=True) as response:
+        if response.status_code != 206:
+            return None
+        return response.content
+
+
+def read_cached(url, reader, cache_file, salt="", timeout=30, **kwargs):
+    """Read a remote file with `reader`, caching its output (a DataFrame) in a feather file.
+
+    The cache is only used if neither the remote file (ETag, from the HTTP HEAD metadata) nor the reader changed since
+    it was written. The reader signature covers its source code, `kwargs` and `salt`. If the ETag can't be obtained
+    (e.g. failed HEAD request), the file is read without cache.
+
+    Args:
+        url (str): File url.
+        reader (callable): Function reading the file, called as `reader(url, **kwargs)`.
+        cache_file (str): Path of the feather file. Its signature is kept in `{cache_file}.json`.
+        salt (str, optional): Additional signature of the reader (e.g. a version, or settings used by the reader).
+        timeout (int, optional): Timeout of the HEAD request, in seconds. Defaults to 30.
+        kwargs: Arguments for `reader`.
+
+    Returns:
+        pandas.DataFrame: Data loaded.
+    """
+    signature = {"etag": _get_etag(url, timeout), "reader": _get_reader_signature(reader, salt, kwargs)}
+    if signature["etag"] is None:
+        return reader(url, **kwargs)
+    df = _read_cache(cache_file, signature)
+    if df is None:
+        df = reader(url, **kwargs)
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        df.to_feather(cache_file)
+        with open(f"{cache_file}.json", "w") as f:
+            json.dump(signature, f)
+    return df
+
+
+def _get_etag(url, timeout):
+    try:
+        response = requests.head(url, allow_redirects=True, timeout=timeout)
+    except requests.RequestException:
+        return None
+    if not response.ok:
+        return None
+    return response.headers.get("ETag")
+
+
+def _get_reader_signature(reader, salt, kwargs):
+    try:
+        source = inspect.getsource(reader)
+    except (OSError, TypeError):
+        source = getattr(reader, "__qualname__", repr(reader))
+    return hashlib.md5(f"{source}|{sorted(kwargs.items())!r}|{salt}".encode()).hexdigest()
+
+
+def _read_cache(cache_file, signature):
+    signature_file = f"{cache_file}.json"
+    if not (os.path.isfile(cache_file) and os.path.isfile(signature_file)):
+        return None
+    with open(signature_file, "r") as f:
+        if json.load(f) != signature:
+            return None
+    return pd.read_feather(cache_file)
+
+
 def download_file_from_url(
     url,
     save_path,
@@ -1,10 +1,13 @@
+import atexit
 import json
+import queue
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
 import requests
 
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options as ChroOpt
-from selenium.webdriver.firefox.options import Options as FireOpt
 
 from cowidev.utils.web.utils import to_proxy_url
 
@@ -132,6 +135,9 @@ def request_text(url, mode="soup", **kwargs) -> str:
 
 
 def sel_options(headless: bool = True, firefox: bool = False):
+    from selenium.webdriver.chrome.options import Options as ChroOpt
+    from selenium.webdriver.firefox.options import Options as FireOpt
+
     if firefox:
         op = FireOpt()
     else:
@@ -150,9 +156,31 @@ def sel_options(headless: bool = True, firefox: bool = False):
     return op
 
 
+# Pool of (default) drivers shared by all scrapers of the process
+DRIVER_POOL_SIZE = 3
+DRIVER_POOL_MAX_USES = 10
+
+
 def get_driver(
     headless: bool = True, download_folder: str = None, options=None, firefox: bool = False, timeout: int = None
 ):
+    """Get a Selenium driver, to be used as a context manager (`with get_driver() as driver: ...`).
+
+    Default drivers (headless Chrome, without custom `options`) are borrowed from a shared pool (see `DriverPool`) and
+    given back when the context is exited. Other drivers are started for this use only, and quit on exit.
+    """
+    if headless and options is None and not firefox:
+        return get_driver_pool().driver(download_folder=download_folder, timeout=timeout)
+    return _start_driver(
+        headless=headless, download_folder=download_folder, options=options, firefox=firefox, timeout=timeout
+    )
+
+
+def _start_driver(
+    headless: bool = True, download_folder: str = None, options=None, firefox: bool = False, timeout: int = None
+):
+    from selenium import webdriver
+
     if options is None:
         options = sel_options(headless=headless, firefox=firefox)
     if firefox:
@@ -166,20 +194,155 @@ def get_driver(
     return driver
 
 
+class DriverPool:
+    """Fixed-size pool of headless Chrome drivers, shared by threads.
+
+    At most `size` drivers are used at the same time (other threads wait for one to be released). Browsers are started
+    on demand and reused: cookies, storage of the visited origins, extra windows, window size and driver settings are
+    reset between uses. A browser is restarted after `max_uses` uses, or if it crashed.
+
+    Args:
+        size (int): Number of drivers. Defaults to DRIVER_POOL_SIZE.
+        max_uses (int): Number of uses after which a browser is restarted. Defaults to DRIVER_POOL_MAX_USES.
+    """
+
+    def __init__(self, size: int = DRIVER_POOL_SIZE, max_uses: int = DRIVER_POOL_MAX_USES):
+        self.size = size
+        self.max_uses = max_uses
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = queue.LifoQueue()
+
+    @contextmanager
+    def driver(self, download_folder: str = None, timeout: int = None):
+        """Borrow a driver from the pool."""
+        with self._slots:
+            driver, uses, window_size = self._acquire()
+            try:
+                if download_folder:
+                    set_download_settings(driver, download_folder)
+                if timeout is not None:
+                    driver.set_page_load_timeout(timeout)
+                yield driver
+            finally:
+                self._release(driver, uses + 1, window_size)
+
+    def close(self):
+        """Quit all idle drivers."""
+        while True:
+            try:
+                driver, _, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            _quit_driver(driver)
+
+    def _acquire(self):
+        while True:
+            try:
+                driver, uses, window_size = self._idle.get_nowait()
+            except queue.Empty:
+                driver = _start_driver()
+                return driver, 0, driver.get_window_size()
+            if _driver_is_alive(driver):
+                return driver, uses, window_size
+            _quit_driver(driver)
+
+    def _release(self, driver, uses, window_size):
+        if uses >= self.max_uses:
+            _quit_driver(driver)
+            return
+        try:
+            _reset_driver(driver, window_size)
+        except Exception:
+            # Crashed (or unresponsive) browser: it is restarted on next use
+            _quit_driver(driver)
+        else:
+            self._idle.put((driver, uses, window_size))
+
+
+_DRIVER_POOL = None
+_DRIVER_POOL_LOCK = threading.Lock()
+
+
+def get_driver_pool() -> DriverPool:
+    """Get the driver pool of the process (created on first use)."""
+    global _DRIVER_POOL
+    with _DRIVER_POOL_LOCK:
+        if _DRIVER_POOL is None:
+            _DRIVER_POOL = DriverPool()
+            atexit.register(_DRIVER_POOL.close)
+    return _DRIVER_POOL
+
+
+def _reset_driver(driver, window_size: dict):
+    """Leave `driver` as new: single blank window (of size `window_size`), no cookies nor storage of the visited
+    origins, and default settings."""
+    origins = set()
+    handles = driver.window_handles
+    for handle in reversed(handles):
+        driver.switch_to.window(handle)
+        origins.update(_get_visited_origins(driver))
+        if handle != handles[0]:
+            driver.close()
+    driver.get("about:blank")
+    send_command(driver, "Network.clearBrowserCookies", {})
+    for origin in origins:
+        send_command(driver, "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+    send_command(driver, "Page.setDownloadBehavior", {"behavior": "default"})
+    driver.set_window_size(window_size["width"], window_size["height"])
+    driver.implicitly_wait(0)
+    driver.set_page_load_timeout(300)
+
+
+def _get_visited_origins(driver) -> set:
+    """Get the (web) origins loaded in the current window: pages in its navigation history and their frames."""
+    urls = [entry["url"] for entry in _send_command_value(driver, "Page.getNavigationHistory")["entries"]]
+    frames = [_send_command_value(driver, "Page.getFrameTree")["frameTree"]]
+    while frames:
+        frame = frames.pop()
+        urls.append(frame["frame"]["url"])
+        frames.extend(frame.get("childFrames", []))
+    origins = set()
+    for url in urls:
+        url = urlparse(url)
+        if url.scheme in ("http", "https"):
+            origins.add(f"{url.scheme}://{url.netloc}")
+    return origins
+
+
+def _send_command_value(driver, cmd: str, params: dict = None) -> dict:
+    return send_command(driver, cmd, params or {})["value"]
+
+
+def _driver_is_alive(driver) -> bool:
+    try:
+        driver.current_url
+    except Exception:
+        return False
+    return True
+
+
+def _quit_driver(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def send_command(driver, cmd: str, params: dict):
+    """Send a Chrome DevTools Protocol command to a Chrome driver."""
+    driver.command_executor._commands["send_command"] = (
+        "POST",
+        "/session/$sessionId/chromium/send_command",
+    )
+    return driver.execute("send_command", {"cmd": cmd, "params": params})
+
+
 def set_download_settings(driver, folder_name: str = None, firefox: bool = False):
     if firefox:
         raise NotImplementedError("Download capabilities only supported for Chromedriver!")
     if folder_name is None:
         folder_name = "/tmp"
-    driver.command_executor._commands["send_command"] = (
-        "POST",
-        "/session/$sessionId/chromium/send_command",
-    )
-    params = {
-        "cmd": "Page.setDownloadBehavior",
-        "params": {"behavior": "allow", "downloadPath": folder_name},
-    }
-    _ = driver.execute("send_command", params)
+    _ = send_command(driver, "Page.setDownloadBehavior", {"behavior": "allow", "downloadPath": folder_name})
 
 
 def scroll_till_element(driver, element):
@@ -3,7 +3,7 @@ from datetime import timedelta, datetime
 import pandas as pd
 
 from cowidev import PATHS
-from cowidev.utils.clean.dates import clean_date, DATE_FORMAT
+from cowidev.utils.clean.dates import DATE_FORMAT
 from cowidev.utils.web import request_json
 from cowidev import PATHS
 from cowidev.utils.s3 import obj_to_s3
@@ -82,6 +82,11 @@ class VariantsETL:
     def variants_who(self):
         return list(set(v["rename"] for v in self.variants_details.values() if v["who"]))
 
+    @property
+    def variants_categories(self):
+        """All variants in the output (including aggregates), in alphabetical order."""
+        return sorted(set(self.variants_mapping.values()) | {"others", "non_who", "Omicron"})
+
     def extract(self) -> dict:
         data = request_json(self.source_url)
         data = list(filter(lambda x: x["region"] == "World", data["regions"]))[0]["distributions"]
@@ -97,19 +102,24 @@ class VariantsETL:
         raise ValueError(f"{field_name} field not found!")
 
     def transform(self, data: dict) -> pd.DataFrame:
+        """Build the variants table.
+
+        From `pipe_group_by_variants` on, data is indexed by (location, date, variant), sorted, with variant as a
+        categorical. Aggregates (others, non-WHO, Omicron and percentage corrections) are grouped by the (location,
+        date) levels of this index.
+        """
         df = (
             self.json_to_df(data)
             .pipe(self.pipe_filter_by_num_sequences)
             .pipe(self.pipe_rename_columns)
             .pipe(self.pipe_variants)
             .pipe(self.pipe_filter_variants)
-            .pipe(self.pipe_group_by_variants)
             .pipe(self.pipe_check_variants)
             .pipe(self.pipe_location)
             .pipe(self.pipe_date)
             .pipe(self.pipe_filter_locations)
+            .pipe(self.pipe_group_by_variants)
             .pipe(self.pipe_variant_others)
-            .pipe(self.pipe_variant_non_who)
             .pipe(self.pipe_dtypes)
             .pipe(self.pipe_percent)
             .pipe(self.pipe_correct_excess_percentage)
@@ -151,7 +161,9 @@ class VariantsETL:
         return total
 
     def pipe_per_capita(self, df: pd.DataFrame) -> pd.DataFrame:
-        df_pop = pd.read_csv(PATHS.INTERNAL_INPUT_UN_POPULATION_FILE, index_col="entity")
+        df_pop = pd.read_csv(
+            PATHS.INTERNAL_INPUT_UN_POPULATION_FILE, usecols=["entity", "population"], index_col="entity"
+        )
         df = df.merge(df_pop["population"], left_on="location", right_index=True)
         df = df.assign(num_sequences_per_1M=(1000000 * df.num_sequences / df.population).round(2)).drop(
             columns=["population"]
@@ -174,12 +186,18 @@ class VariantsETL:
             df.to_csv(output_path, index=False)
 
     def json_to_df(self, data: dict) -> pd.DataFrame:
-        df = pd.json_normalize(data, record_path=["distribution"], meta=["country"]).melt(
+        """One row per country, week and cluster (all clusters in the data, NaN if not in the record)."""
+        records = [(country["country"], record) for country in data for record in country["distribution"]]
+        df = pd.DataFrame.from_records([record["cluster_counts"] for _, record in records]).assign(
+            country=[country for country, _ in records],
+            total_sequences=[record["total_sequences"] for _, record in records],
+            week=[record["week"] for _, record in records],
+        )
+        return df.melt(
             id_vars=["country", "total_sequences", "week"],
             var_name="cluster",
             value_name="num_sequences",
         )
-        return df
 
     def pipe_filter_by_num_sequences(self, df: pd.DataFrame) -> pd.DataFrame:
         msk = df.total_sequences < self.num_sequences_total_threshold
@@ -209,16 +227,22 @@ class VariantsETL:
     def pipe_variants(self, df: pd.DataFrame) -> pd.DataFrame:
         """Rename variants"""
         # Modify/add columns
-        df = df.assign(
-            variant=df.cluster.str.replace("cluster_counts.", "", regex=True).replace(self.variants_mapping),
-        ).drop(columns="cluster")
+        mapping = {cluster: self.variants_mapping.get(cluster, cluster) for cluster in df.cluster.unique()}
+        df = df.assign(variant=df.cluster.map(mapping)).drop(columns="cluster")
         return df
 
     def pipe_group_by_variants(self, df: pd.DataFrame) -> pd.DataFrame:
-        cols_values = ["num_sequences"]
-        cols_index = [c for c in df.columns if c not in cols_values]
-        df = df.groupby(cols_index, as_index=False).sum()
-        return df
+        """Sum sequences by location, date and variant (missing values count as 0).
+
+        Output is indexed by (location, date, variant), sorted, with variant as a categorical.
+        """
+        if df.groupby(["location", "date"]).num_sequences_total.nunique().max() != 1:
+            raise ValueError("Different value of `num_sequences_total` found for the same location and date")
+        df = df.assign(variant=pd.Categorical(df.variant, categories=self.variants_categories))
+        return df.groupby(["location", "date", "variant"], observed=True).agg(
+            num_sequences=("num_sequences", "sum"),
+            num_sequences_total=("num_sequences_total", "first"),
+        )
 
     def pipe_check_variants(self, df: pd.DataFrame) -> pd.DataFrame:
         variants_missing = set(df.variant).difference(self.variants_mapping.values())
@@ -233,54 +257,51 @@ class VariantsETL:
         return df.drop(columns=["country"])
 
     def pipe_date(self, df: pd.DataFrame) -> pd.DataFrame:
-        dt = pd.to_datetime(df.week, format=DATE_FORMAT)
-        dt = dt + timedelta(days=14)
-        last_update = self._parse_last_update_date
-        dt = dt.apply(lambda x: clean_date(min(x.date(), last_update), DATE_FORMAT))
+        # Date: end of the week period, at most the date of the last update (parsed once per week)
+        week = pd.Series(df.week.unique())
+        dt = pd.to_datetime(week, format=DATE_FORMAT) + timedelta(days=14)
+        dt = dt.clip(upper=pd.Timestamp(self._parse_last_update_date)).dt.strftime(DATE_FORMAT)
         df = df.assign(
-            date=dt,
+            date=df.week.map(dict(zip(week, dt))),
         )
         return df.drop(columns=["week"])
 
     def pipe_filter_locations(self, df: pd.DataFrame) -> pd.DataFrame:
         # Filter locations
-        dfc = pd.read_csv(PATHS.INTERNAL_INPUT_UN_POPULATION_FILE)
+        dfc = pd.read_csv(PATHS.INTERNAL_INPUT_UN_POPULATION_FILE, usecols=["entity"])
         df = df[df.location.isin(dfc.entity.unique())]
         return df
 
     def pipe_variant_others(self, df: pd.DataFrame) -> pd.DataFrame:
-        df_a = df[["date", "location", "num_sequences_total"]].drop_duplicates()
-        df_b = (
-            df.groupby(["date", "location"], as_index=False)
-            .agg({"num_sequences": sum})
-            .rename(columns={"num_sequences": "all_seq"})
+        """Add variants `others` (sequences not assigned to any variant) and `non_who` (non-WHO variants + others)."""
+        msk_non_who = ~df.index.get_level_values("variant").isin(self.variants_who)
+        totals = (
+            df.assign(num_sequences_non_who=df.num_sequences.where(msk_non_who, 0))
+            .groupby(level=["location", "date"])
+            .agg(
+                num_sequences=("num_sequences", "sum"),
+                num_sequences_non_who=("num_sequences_non_who", "sum"),
+                num_sequences_total=("num_sequences_total", "first"),
+            )
         )
-        df_c = df_a.merge(df_b, on=["date", "location"])
-        df_c = df_c.assign(others=df_c["num_sequences_total"] - df_c["all_seq"])
-        df_c = df_c.melt(
-            id_vars=["location", "date", "num_sequences_total"],
-            value_vars="num_sequences_others",
-            var_name="variant",
-            value_name="num_sequences",
+        others = totals.num_sequences_total - totals.num_sequences
+        return self._add_variants(
+            df,
+            {
+                "others": totals[["num_sequences_total"]].assign(num_sequences=others),
+                "non_who": totals[["num_sequences_total"]].assign(num_sequences=totals.num_sequences_non_who + others),
+            },
         )
-        df = pd.concat([df, df_c])
-        return df
 
-    def pipe_variant_non_who(self, df: pd.DataFrame) -> pd.DataFrame:
-        x = df[-df.variant.isin(self.variants_who)]
-        if x.groupby(["location", "date"]).num_sequences_total.nunique().max() != 1:
-            raise ValueError("Different value of `num_sequences_total` found for the same location and date")
-        x = (
-            x.groupby(["location", "date", "num_sequences_total"], as_index=False)
-            .agg(
-                {
-                    "num_sequences": sum,
-                }
+    def _add_variants(self, df: pd.DataFrame, variants: dict) -> pd.DataFrame:
+        """Add rows for new variants (variant -> data indexed by location and date), keeping the index sorted."""
+        dfs = [df]
+        for variant, df_variant in variants.items():
+            index = df_variant.index.to_frame(index=False).assign(
+                variant=pd.Categorical([variant] * len(df_variant), categories=self.variants_categories)
             )
-            .assign(variant="non_who")
-        )
-        df = pd.concat([df, x], ignore_index=True)
-        return df
+            dfs.append(df_variant.set_index(pd.MultiIndex.from_frame(index))[df.columns])
+        return pd.concat(dfs).sort_index()
 
     def pipe_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
         df = df.astype({"num_sequences_total": "Int64", "num_sequences": "Int64"})
@@ -293,52 +314,42 @@ class VariantsETL:
         )
 
     def pipe_correct_excess_percentage(self, df: pd.DataFrame) -> pd.DataFrame:
-        # 1) `non_who`
-        # Get excess
-        x = df[df.variant.isin(self.variants_who + ["non_who"])]
-        x = x.groupby(["location", "date"], as_index=False).agg({"perc_sequences": sum})
-        x = x[abs(x["perc_sequences"] - 100) != 0]
-        x["excess"] = x.perc_sequences - 100
-        # Merge excess quantity with input df
-        df = df.merge(x[["location", "date", "excess"]], on=["location", "date"], how="outer")
-        df = df.assign(excess=df.excess.fillna(0))
-        # Correct
-        mask = df.variant.isin(["non_who"])
-        df.loc[mask, "perc_sequences"] = (df.loc[mask, "perc_sequences"] - df.loc[mask, "excess"]).round(4)
-        df = df.drop(columns="excess")
-        # 2) `others`
-        # Get excess
-        x = df[-df.variant.isin(["non_who"])]
-        x = x.groupby(["location", "date"], as_index=False).agg({"perc_sequences": sum})
-        x = x[abs(x["perc_sequences"] - 100) != 0]
-        x["excess"] = x.perc_sequences - 100
-        # Merge excess quantity with input df
-        df = df.merge(x[["location", "date", "excess"]], on=["location", "date"], how="outer")
-        df = df.assign(excess=df.excess.fillna(0))
+        """Correct the percentage of `non_who` (resp. `others`) so that, for each location and date, the percentages of
+        WHO variants and `non_who` (resp. all variants but `non_who`) add up to 100."""
+        variant = df.index.get_level_values("variant")
+        perc_sequences = df.perc_sequences
+        msk = {
+            "non_who": variant.isin(self.variants_who + ["non_who"]),
+            "others": variant != "non_who",
+        }
+        # Excess percentage (by location and date)
+        excess = (
+            pd.DataFrame({v: perc_sequences.where(m) for v, m in msk.items()})
+            .groupby(level=["location", "date"])
+            .sum(min_count=1)
+            .sub(100)
+            .fillna(0)
+        )
         # Correct
-        mask = df.variant.isin(["others"])
-        df.loc[mask, "perc_sequences"] = (df.loc[mask, "perc_sequences"] - df.loc[mask, "excess"]).round(4)
-        df = df.drop(columns="excess")
+        excess = excess.reindex(df.index.droplevel("variant"))
+        for v in msk:
+            mask = variant == v
+            df.loc[mask, "perc_sequences"] = (perc_sequences[mask] - excess.loc[mask, v].array).round(4)
         return df
 
     def pipe_omicron(self, df: pd.DataFrame) -> pd.DataFrame:
         # Get only Omicron rows
-        msk = df.variant.str.startswith("Omicron")
+        msk = df.index.get_level_values("variant").str.startswith("Omicron")
         # Group
-        dfg = df[msk].groupby(["location", "date"])
-        # Sum values
+        dfg = df[msk].groupby(level=["location", "date"])
+        # Sum values, get num total
         values = dfg[["num_sequences", "perc_sequences"]].sum()
-        # Get num total
-        num_seq_ttl = dfg["num_sequences_total"].unique()
-        assert (num_seq_ttl.apply(len) == 1).all()
-        num_seq_ttl = num_seq_ttl.apply(lambda x: x[0])
-        # Build df
-        values = values.merge(num_seq_ttl, left_index=True, right_index=True).reset_index().assign(variant="Omicron")
-        df = pd.concat([df, values], ignore_index=True)
-        return df
+        values = values.assign(num_sequences_total=dfg.num_sequences_total.first())
+        return self._add_variants(df, {"Omicron": values})
 
     def pipe_out(self, df: pd.DataFrame) -> pd.DataFrame:
-        return df[self.columns_out].sort_values(["location", "date", "variant"])  #  + ["perc_sequences_raw"]
+        df = df.reset_index()
+        return df.assign(variant=df.variant.astype(str))[self.columns_out]
 
     def run(self):
         data = self.extract()
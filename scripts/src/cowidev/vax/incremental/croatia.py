@@ -2,13 +2,13 @@ from datetime import timedelta
 
 import pandas as pd
 
-from cowidev.utils.web import request_json
+from cowidev.utils.web.aio import request_json_async
 from cowidev.vax.utils.incremental import enrich_data, increment
 
 
-def read(source: str) -> pd.Series:
+async def read(source: str) -> pd.Series:
 
-    data = request_json(source)
+    data = await request_json_async(source)
 
     total_vaccinations = int(data["CijepljenjeBrUtrosenihDoza"])
     people_vaccinated = int(data["CijepljeniJednomDozom"])
@@ -41,9 +41,9 @@ def pipeline(ds: pd.Series) -> pd.Series:
     return ds.pipe(enrich_location).pipe(enrich_vaccine).pipe(enrich_source)
 
 
-def main():
+async def main():
     source = "https://www.koronavirus.hr/data/stats_latest.json"
-    data = read(source).pipe(pipeline)
+    data = (await read(source)).pipe(pipeline)
     increment(
         location=data["location"],
         total_vaccinations=data["total_vaccinations"],
@@ -2,11 +2,10 @@ import re
 import time
 
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 
 from cowidev.utils.clean import clean_count
 from cowidev.utils.clean.dates import clean_date
+from cowidev.utils.web.scraping import get_driver
 from cowidev.vax.utils.incremental import enrich_data
 from cowidev.vax.utils.base import CountryVaxBase
 
@@ -17,10 +16,7 @@ class DominicanRepublic(CountryVaxBase):
     source_url_ref = source_url
 
     def read(self):
-        op = Options()
-        op.add_argument("--headless")
-
-        with webdriver.Chrome(options=op) as driver:
+        with get_driver() as driver:
             driver.get(self.source_url)
             time.sleep(10)
             metrics = self._parse_metrics(driver)
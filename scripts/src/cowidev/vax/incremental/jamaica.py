@@ -2,7 +2,7 @@ import pandas as pd
 
 from cowidev.utils.clean import clean_count
 from cowidev.utils.clean.dates import localdate
-from cowidev.utils.web.scraping import get_soup
+from cowidev.utils.web.aio import get_soup_async
 from cowidev.vax.utils.incremental import enrich_data
 from cowidev.vax.utils.base import CountryVaxBase
 
@@ -12,8 +12,8 @@ class Jamaica(CountryVaxBase):
     source_url: str = "https://vaccination.moh.gov.jm"
     source_url_ref: str = source_url
 
-    def read(self) -> pd.Series:
-        soup = get_soup(self.source_url)
+    async def read(self) -> pd.Series:
+        soup = await get_soup_async(self.source_url)
         return self._parse_data(soup)
 
     def _parse_data(self, soup) -> pd.Series:
@@ -48,10 +48,10 @@ class Jamaica(CountryVaxBase):
     def pipeline(self, ds: pd.Series) -> pd.Series:
         return ds.pipe(self.pipe_vaccine).pipe(self.pipe_metadata)
 
-    def export(self):
-        data = self.read().pipe(self.pipeline)
+    async def export(self):
+        data = (await self.read()).pipe(self.pipeline)
         self.export_datafile(df=data, attach=True)
 
 
-def main():
-    Jamaica().export()
+async def main():
+    await Jamaica().export()
@@ -1,20 +1,22 @@
+from typing import TYPE_CHECKING
+
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 
 from cowidev.utils.clean import clean_count, clean_date
+from cowidev.utils.web.scraping import get_driver
 from cowidev.vax.utils.incremental import increment, enrich_data
 from cowidev.vax.utils.base import CountryVaxBase
 
+if TYPE_CHECKING:
+    from selenium.webdriver.chrome.webdriver import WebDriver
+
 
 class Kazakhstan(CountryVaxBase):
     location = "Kazakhstan"
     source_url = "https://www.coronavirus2020.kz/"
 
     def read(self) -> pd.Series:
-        op = Options()
-        op.add_argument("--headless")
-        with webdriver.Chrome(options=op) as driver:
+        with get_driver() as driver:
             driver.get(self.source_url)
             people_vaccinated, people_fully_vaccinated = self._parse_vaccinations(driver)
             date = self._parse_date(driver)
@@ -31,18 +33,18 @@ class Kazakhstan(CountryVaxBase):
                 data["total_boosters"] = total_boosters
             return pd.Series(data)
 
-    def _parse_vaccinations(self, driver: webdriver.Chrome) -> tuple:
+    def _parse_vaccinations(self, driver: "WebDriver") -> tuple:
         people_vaccinated = clean_count(driver.find_element_by_id("vaccinated_1").text)
         people_fully_vaccinated = clean_count(driver.find_element_by_id("vaccinated_2").text)
         return people_vaccinated, people_fully_vaccinated
 
-    def _parse_boosters(self, driver: webdriver.Chrome) -> tuple:
+    def _parse_boosters(self, driver: "WebDriver") -> tuple:
         elems = driver.find_elements_by_class_name("number_revac_info")
         elem = [e for e in elems if "Всего" in e.find_element_by_xpath("..").text][0]
         total_boosters = clean_count(elem.text)
         return total_boosters
 
-    def _parse_date(self, driver: webdriver.Chrome) -> str:
+    def _parse_date(self, driver: "WebDriver") -> str:
         elem = driver.find_element_by_class_name("tabl_vactination")
         date_str_raw = pd.read_html(elem.get_attribute("innerHTML"))[0].iloc[-1, -1]
         return clean_date(date_str_raw, "*данные на %d.%m.%Y")
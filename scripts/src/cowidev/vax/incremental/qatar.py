@@ -1,11 +1,10 @@
 import time
 
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 
 from cowidev.utils.clean import clean_count
 from cowidev.utils.clean.dates import localdate
+from cowidev.utils.web.scraping import get_driver
 from cowidev.vax.utils.incremental import enrich_data
 from cowidev.vax.utils.base import CountryVaxBase
 from cowidev.vax.utils.utils import add_latest_who_values
@@ -19,10 +18,7 @@ class Qatar(CountryVaxBase):
         return self.connect_parse_data()
 
     def connect_parse_data(self) -> pd.Series:
-        op = Options()
-        op.add_argument("--headless")
-
-        with webdriver.Chrome(options=op) as driver:
+        with get_driver() as driver:
             driver.get(self.source_url)
             time.sleep(5)
 
@@ -1,11 +1,10 @@
-import tweepy
-
-
 class TwitterAPI:
     def __init__(self, consumer_key: str, consumer_secret: str):
         self._api = self._get_api(consumer_key, consumer_secret)
 
     def _get_api(self, consumer_key, consumer_secret):
+        import tweepy
+
         auth = tweepy.AppAuthHandler(consumer_key, consumer_secret)
         return tweepy.API(auth)
 
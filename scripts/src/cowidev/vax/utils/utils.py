@@ -3,7 +3,7 @@ from glob import glob
 
 import pandas as pd
 
-from cowidev.utils.utils import make_monotonic as _make_monotonic
+from cowidev.utils.utils import make_monotonic as _make_monotonic, monotonic_mask
 
 
 def get_latest_file(path, extension):
@@ -30,10 +30,7 @@ def make_monotonic(df: pd.DataFrame, max_removed_rows=10, new_version=False) ->
 
     df = df.sort_values("date")
     metrics = ("total_vaccinations", "people_vaccinated", "people_fully_vaccinated")
-    for metric in metrics:
-        while not df[metric].ffill().fillna(0).is_monotonic:
-            diff = df[metric].ffill().shift(-1) - df[metric].ffill()
-            df = df[(diff >= 0) | (diff.isna())]
+    df = df[monotonic_mask(df, metrics)]
     dates_now = set(df.date)
 
     if max_removed_rows is not None:
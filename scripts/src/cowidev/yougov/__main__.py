@@ -1,8 +1,10 @@
 import os
 import json
 import datetime
+from urllib.error import HTTPError
 import requests
 
+from joblib import Parallel, delayed
 from tqdm import tqdm
 import numpy as np
 import pandas as pd
@@ -25,6 +27,9 @@ MIN_RESPONSES = 100
 # string (e.g. 'M' = "month", "W" = "week").
 FREQ = "M"
 
+# N_JOBS: number of countries downloaded concurrently.
+N_JOBS = 8
+
 # ZERO_DAY: reference date for internal yearIsDay Grapher usage.
 ZERO_DAY = "2020-01-21"
 
@@ -43,9 +48,10 @@ with open(MAPPING_VALUES_PATH, "r") as f:
 
 
 class YouGov:
-    def __init__(self, output_path: str, debug: bool = False):
+    def __init__(self, output_path: str, debug: bool = False, n_jobs: int = N_JOBS):
         self.source_url = "https://github.com/YouGov-Data/covid-19-tracker/raw/master"
         self.debug = debug
+        self.n_jobs = n_jobs
         self.output_path = output_path
         self.dataset_name = DATASET_NAME
 
@@ -73,14 +79,24 @@ class YouGov:
             return countries[:3]
         return countries
 
+    @property
+    def columns_dtypes(self):
+        """Columns (lower-cased) to be read from the source files and their types.
+
+        Only questions kept in mapping.csv are read. Those with preprocessing are categorical answers (strings), the
+        rest are numeric.
+        """
+        mapping = MAPPING[MAPPING.keep & ~MAPPING.derived]
+        dtypes = {"endtime": str}
+        dtypes.update({row.label: float if pd.isnull(row.preprocess) else str for row in mapping.itertuples()})
+        return dtypes
+
     def read(self):
-        """Read data. Reads multiple countries and concatenates them into one file."""
+        """Read data. Reads multiple countries (concurrently) and concatenates them into one file."""
         # Load countries
-        all_data = []
-        for country in tqdm(self.list_countries):
-            tqdm.write(country)
-            df = self.read_country(country)
-            all_data.append(df)
+        all_data = Parallel(n_jobs=self.n_jobs, backend="threading")(
+            delayed(self.read_country)(country) for country in tqdm(self.list_countries)
+        )
         # Build DataFrame
         df = pd.concat(all_data, axis=0)
         if df.columns.nunique() != df.columns.shape[0]:
@@ -88,30 +104,41 @@ class YouGov:
         return df
 
     def read_country(self, country):
-        """Read individual country data."""
+        """Read individual country data.
+
+        Zip files are preferred over CSVs, as in the upstream repository large files are only available zipped.
+        """
         # Load df from web
-        extensions = ["csv", "zip"]
-        df = None
-        for ext in extensions:
-            url = self._get_source_url_country(country, ext)
-            if requests.get(url).ok:
-                df = self._read_country_from_web(url, ext)
-        if df is None:
+        url = self._get_source_url_country(country, "zip")
+        if requests.head(url, allow_redirects=True, timeout=30).ok:
+            ext = "zip"
+        else:
+            url = self._get_source_url_country(country, "csv")
+            ext = "csv"
+        try:
+            df = self._read_country_from_web(url, ext)
+        except HTTPError:
             raise ValueError(f"No file found for {country}")
+        tqdm.write(country)
         # Parse date field
         df = df.assign(country=country)
-        df.columns = df.columns.str.lower()
         return df
 
     def _read_country_from_web(self, source_url_country, extension):
-        """Given URL, reads individual country data."""
+        """Given URL, reads individual country data.
+
+        Only the columns in `columns_dtypes` are parsed (column names are matched case-insensitively). Column names
+        are lower-cased. Non-numeric values in numeric columns are set to NaN.
+        """
         if extension == "csv":
             extension = None
         elif extension != "zip":
             raise ValueError("Invalid extension. Accepted are 'csv' and 'zip'.")
-        return pd.read_csv(
+        dtypes = self.columns_dtypes
+        df = pd.read_csv(
             source_url_country,
-            low_memory=False,
+            usecols=lambda col: col.lower() in dtypes,
+            dtype=str,
             na_values=[
                 "",
                 "Not sure",
@@ -125,6 +152,10 @@ class YouGov:
             ],
             compression=extension,
         )
+        df.columns = df.columns.str.lower()
+        numeric_cols = [col for col in df.columns if dtypes[col] is float]
+        df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors="coerce").astype(float)
+        return df
 
     def pipeline_csv(self, df: pd.DataFrame):
         df = (
@@ -169,9 +200,12 @@ def _subset_and_rename_columns(df):
         MAPPING["code_name"].duplicated().sum() == 0
     ), "All rows in the `code_name` field of mapping.csv must be unique."
     index_cols = ["country", "date"]
-    df2 = df[index_cols]
-    for row in MAPPING[MAPPING.keep & ~MAPPING.derived].itertuples():
-        df2.loc[:, row.code_name] = df[row.label]
+    mapping = MAPPING[MAPPING.keep & ~MAPPING.derived]
+    labels_missing = set(mapping.label).difference(df.columns)
+    if labels_missing:
+        raise KeyError(f"Survey questions in mapping.csv not found in the data: {sorted(labels_missing)}")
+    df2 = df[index_cols + mapping.label.tolist()]
+    df2.columns = index_cols + mapping.code_name.tolist()
     df2 = df2.dropna(subset=["date"])
     return df2
 
@@ -254,65 +288,37 @@ def _standardize_entities(df):
 
 
 def _aggregate(df):
-    s_period = df["date"].dt.to_period(FREQ)
-    if FREQ == "M":
-        df.loc[:, "date_mid"] = s_period.dt.start_time.dt.date + datetime.timedelta(days=14)
-    else:
-        df.loc[:, "date_mid"] = (s_period.dt.start_time + (s_period.dt.end_time - s_period.dt.start_time) / 2).dt.date
-    today = datetime.datetime.utcnow().date()
-    if df["date_mid"].max() > today:
-        df.loc[:, "date_mid"] = df["date_mid"].replace({df["date_mid"].max(): today})
-
     questions = [q for q in MAPPING.code_name.tolist() if q in df.columns]
 
-    # computes the mean for each country-date-question observation
-    # (returned in long format)
-    df_means = (
-        df.groupby(["entity", "date_mid"])[questions]
-        .mean()
-        .rename_axis("question", axis=1)
-        .stack()
-        .rename("mean")
-        .to_frame()
-    )
-
-    # counts the number of non-NaN responses for each country-date-question
-    # observation (returned in long format)
-    df_counts = (
-        df.groupby(["entity", "date_mid"])[questions]
-        .apply(lambda gp: gp.notnull().sum())
-        .rename_axis("question", axis=1)
-        .stack()
-        .rename("num_responses")
-        .to_frame()
-    )
-
-    df_agg = pd.merge(
-        df_means,
-        df_counts,
-        left_index=True,
-        right_index=True,
-        how="outer",
-        validate="1:1",
-    )
+    # computes the mean and the number of non-NaN responses for each
+    # country-period-question observation. All questions are aggregated at
+    # once, over a single (entity, period) index.
+    grouped = df.groupby(["entity", df["date"].dt.to_period(FREQ).rename("period")])[questions]
+    df_counts = grouped.count()
+    df_means = grouped.mean().reindex(columns=df_counts.columns)
 
     if MIN_RESPONSES:
-        df_agg = df_agg[df_agg["num_responses"] >= MIN_RESPONSES]
-
-    # converts dataframe back to wide format.
-    df_agg = df_agg.unstack().reset_index()
-    new_columns = []
-    for lvl0, lvl1 in df_agg.columns:
-        if lvl1:
-            if lvl0 == "num_responses":
-                col = f"{lvl1}__{lvl0}"
-            else:
-                col = lvl1
-        else:
-            col = lvl0
-        new_columns.append(col)
-    df_agg.columns = new_columns
-    df_agg.rename(columns={"date_mid": "date"}, inplace=True)
+        msk = df_counts >= MIN_RESPONSES
+    else:
+        msk = df_counts.notnull()
+    rows, cols = msk.any(axis=1), msk.any(axis=0)
+    df_agg = pd.concat(
+        [
+            df_means.where(msk).loc[rows, cols],
+            df_counts.where(msk).loc[rows, cols].add_suffix("__num_responses"),
+        ],
+        axis=1,
+    ).reset_index()
+
+    # dates are set to the middle of each period (capped to today)
+    s_period = df_agg.pop("period")
+    if FREQ == "M":
+        df_agg.loc[:, "date"] = s_period.dt.start_time.dt.date + datetime.timedelta(days=14)
+    else:
+        df_agg.loc[:, "date"] = (s_period.dt.start_time + (s_period.dt.end_time - s_period.dt.start_time) / 2).dt.date
+    today = datetime.datetime.utcnow().date()
+    if df_agg["date"].max() > today:
+        df_agg.loc[:, "date"] = df_agg["date"].replace({df_agg["date"].max(): today})
 
     # constructs date variable for internal Grapher usage.
     df_agg.loc[:, "date_internal_use"] = (
@@ -345,16 +351,11 @@ def _create_composite_cols(df):
             }
         ).sort_values(["entity", "date"], ascending=True)
         date_range = list(range(df_vac["date"].min(), df_vac["date"].max() + 1))
-        df_vac[df_vac["entity"] == "United States"].set_index("date").reindex(date_range)
-        df_vac = (
-            df_vac.groupby("entity")
-            .apply(lambda gp: gp.set_index("date").reindex(date_range))
-            .drop("entity", axis=1)
-            .reset_index()
-            .sort_values(["entity", "date"])
+        df_vac = df_vac.set_index(["entity", "date"]).reindex(
+            pd.MultiIndex.from_product([df_vac["entity"].unique(), date_range], names=["entity", "date"])
         )
-        df_vac[var_name] = df_vac.groupby("entity")[var_name].apply(lambda gp: gp.ffill(limit=ffill_limit)).dropna()
-        df_vac.dropna(subset=[var_name], inplace=True)
+        df_vac[var_name] = df_vac.groupby(level="entity")[var_name].ffill(limit=ffill_limit)
+        df_vac = df_vac.dropna(subset=[var_name]).reset_index()
 
         vac_entities = df_vac["entity"].unique()
         yougov_entities_not_found = [ent for ent in df["entity"].drop_duplicates() if ent not in vac_entities]
@@ -0,0 +1,15 @@
+"""Test configuration.
+
+`cowidev` reads its paths from environment variables at import time, so these are set (unless already defined) to the
+files in this repository before any test module is collected.
+"""
+import os
+import sys
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("OWID_COVID_PROJECT_DIR", os.path.dirname(SCRIPTS_DIR))
+os.environ.setdefault("OWID_COVID_CONFIG", os.path.join(SCRIPTS_DIR, "config.yaml"))
+os.environ.setdefault("OWID_COVID_SECRETS", os.path.join(SCRIPTS_DIR, "secrets.yaml"))
+sys.path.insert(0, os.path.join(SCRIPTS_DIR, "src"))
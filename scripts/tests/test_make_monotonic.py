@@ -0,0 +1,119 @@
+"""Equivalence of the single-pass `make_monotonic` functions with the iterative loops they replaced."""
+import numpy as np
+import pandas as pd
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from cowidev.testing.utils.utils import make_monotonic as make_monotonic_testing
+from cowidev.utils.utils import make_monotonic
+from cowidev.vax.utils.utils import make_monotonic as make_monotonic_vax
+
+
+VAX_METRICS = ["total_vaccinations", "people_vaccinated", "people_fully_vaccinated"]
+
+
+def _make_monotonic_loop(df, column_date, column_metrics, max_removed_rows, message):
+    """Previous implementation: drop adjacent violators until each metric is monotonic."""
+    n_rows_before = len(df)
+    dates_before = set(df[column_date])
+    df_before = df.copy()
+
+    df = df.sort_values(column_date)
+    for metric in column_metrics:
+        while not df[metric].ffill().fillna(0).is_monotonic_increasing:
+            diff = df[metric].ffill().shift(-1) - df[metric].ffill()
+            df = df[(diff >= 0) | (diff.isna())]
+    dates_now = set(df[column_date])
+
+    if max_removed_rows is not None:
+        num_removed_rows = n_rows_before - len(df)
+        if num_removed_rows > max_removed_rows:
+            dates_wrong = dates_before.difference(dates_now)
+            df_wrong = df_before[df_before[column_date].isin(dates_wrong)]
+            raise Exception(message(num_removed_rows, max_removed_rows, df_wrong))
+    return df
+
+
+def _message_utils(column_metrics):
+    def _message(num_removed_rows, max_removed_rows, df_wrong):
+        df_wrong = df_wrong[["date"] + column_metrics]
+        return (
+            f"{num_removed_rows} rows would be removed. That is more than maximum allowed ({max_removed_rows})"
+            f" by make_monotonic() - check the data. Check \n{df_wrong}"
+        )
+
+    return _message
+
+
+def _message_vax(num_removed_rows, max_removed_rows, df_wrong):
+    return (
+        f"{num_removed_rows} rows have been removed. That is more than maximum allowed ({max_removed_rows}) by"
+        f" make_monotonic() - check the data. Check \n{df_wrong}"
+    )
+
+
+# Values are non-negative: the old loop never ends if a leading NaN is followed by a negative value
+_values = st.one_of(st.none(), st.integers(min_value=0, max_value=20))
+_max_removed_rows = st.one_of(st.none(), st.integers(min_value=0, max_value=10))
+
+
+@st.composite
+def _series(draw, column_date, column_metrics):
+    rows = draw(st.lists(st.tuples(*[_values] * len(column_metrics)), min_size=1, max_size=40))
+    dates = pd.date_range("2021-01-01", periods=len(rows)).strftime("%Y-%m-%d")
+    order = draw(st.permutations(range(len(rows))))
+    df = pd.DataFrame(rows, columns=column_metrics, dtype=float)
+    df.insert(0, column_date, np.array(dates)[list(order)])
+    df["location"] = "Country"
+    return df
+
+
+def _assert_equivalent(func_new, func_old):
+    try:
+        expected = func_old()
+    except Exception as e:
+        with pytest.raises(Exception) as excinfo:
+            func_new()
+        assert str(excinfo.value) == str(e)
+    else:
+        pd.testing.assert_frame_equal(func_new(), expected)
+
+
+@settings(max_examples=300, deadline=None)
+@given(df=_series("date", VAX_METRICS), max_removed_rows=_max_removed_rows)
+def test_make_monotonic(df, max_removed_rows):
+    _assert_equivalent(
+        lambda: make_monotonic(df, "date", VAX_METRICS, max_removed_rows=max_removed_rows),
+        lambda: _make_monotonic_loop(df, "date", VAX_METRICS, max_removed_rows, _message_utils(VAX_METRICS)),
+    )
+
+
+@settings(max_examples=300, deadline=None)
+@given(df=_series("date", VAX_METRICS), max_removed_rows=_max_removed_rows)
+def test_make_monotonic_vax(df, max_removed_rows):
+    _assert_equivalent(
+        lambda: make_monotonic_vax(df, max_removed_rows=max_removed_rows),
+        lambda: _make_monotonic_loop(df, "date", VAX_METRICS, max_removed_rows, _message_vax),
+    )
+
+
+@settings(max_examples=300, deadline=None)
+@given(df=_series("Date", ["Cumulative total"]), max_removed_rows=_max_removed_rows)
+def test_make_monotonic_testing(df, max_removed_rows):
+    _assert_equivalent(
+        lambda: make_monotonic_testing(df, max_removed_rows=max_removed_rows),
+        lambda: _make_monotonic_loop(df, "Date", ["Cumulative total"], max_removed_rows, _message_vax),
+    )
+
+
+def test_make_monotonic_keeps_latest_values():
+    df = pd.DataFrame(
+        {
+            "date": ["2021-01-01", "2021-01-02", "2021-01-03", "2021-01-04", "2021-01-05"],
+            "total_vaccinations": [np.nan, 10, 50, 20, 30],
+            "people_vaccinated": [1, 2, 3, 4, 5],
+            "people_fully_vaccinated": [0, 0, 0, 0, 0],
+        }
+    )
+    df = make_monotonic(df, "date", VAX_METRICS)
+    assert df["date"].tolist() == ["2021-01-01", "2021-01-02", "2021-01-04", "2021-01-05"]
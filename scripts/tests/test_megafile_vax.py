@@ -0,0 +1,71 @@
+"""Equivalence of the grouped `add_rolling_vaccinations` with the per-location apply it replaced.
+
+Values must be identical, including at .5 ties of the rounded window sums: `fixtures/megafile/rolling_vaccinations.csv`
+holds sparse series whose windows are off by one when summed from a cumulative sum of the (fractional) daily values.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+from hypothesis import given, settings, strategies as st
+
+from cowidev.megafile.steps.vax import add_rolling_vaccinations
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "megafile")
+
+
+def _add_rolling(df):
+    """Previous implementation, run on each location."""
+    last_known_date = df.loc[df.total_vaccinations.notnull(), "date"].max()
+    for n_months in (6, 9, 12):
+        n_days = round(365.2425 * n_months / 12)
+        df[f"rolling_vaccinations_{n_months}m"] = (
+            df.total_vaccinations.interpolate(method="linear").diff().rolling(n_days, min_periods=1).sum().round()
+        )
+        df.loc[df.date > last_known_date, f"rolling_vaccinations_{n_months}m"] = np.NaN
+        df[f"rolling_vaccinations_{n_months}m_per_hundred"] = (
+            df[f"rolling_vaccinations_{n_months}m"] * 100 / df.population
+        ).round(2)
+    return df
+
+
+def _add_rolling_vaccinations_apply(df):
+    return df.groupby("location").apply(_add_rolling).reset_index(drop=True)
+
+
+@st.composite
+def _locations(draw):
+    dfs = []
+    for i in range(draw(st.integers(min_value=1, max_value=4))):
+        # Totals are sparse: mostly gaps (interpolated with fractional values), with leading and trailing gaps
+        values = draw(
+            st.lists(
+                st.one_of(st.none(), st.none(), st.none(), st.integers(min_value=0, max_value=10**9)),
+                min_size=1,
+                max_size=500,
+            )
+        )
+        dfs.append(
+            pd.DataFrame(
+                {
+                    "location": f"Country {i}",
+                    "date": pd.date_range("2021-01-01", periods=len(values)).strftime("%Y-%m-%d"),
+                    "total_vaccinations": pd.Series(values, dtype=float).cummax(),
+                    "population": draw(st.integers(min_value=1, max_value=10**9)),
+                }
+            )
+        )
+    df = pd.concat(dfs, ignore_index=True)
+    return df.iloc[draw(st.permutations(range(len(df))))].sort_values("date", kind="stable").reset_index(drop=True)
+
+
+@settings(max_examples=200, deadline=None)
+@given(df=_locations())
+def test_add_rolling_vaccinations(df):
+    pd.testing.assert_frame_equal(add_rolling_vaccinations(df.copy()), _add_rolling_vaccinations_apply(df.copy()))
+
+
+def test_add_rolling_vaccinations_ties():
+    df = pd.read_csv(os.path.join(FIXTURES_DIR, "rolling_vaccinations.csv"), dtype={"total_vaccinations": float})
+    pd.testing.assert_frame_equal(add_rolling_vaccinations(df.copy()), _add_rolling_vaccinations_apply(df.copy()))
@@ -0,0 +1,69 @@
+"""ETag-keyed cache of `read_cached`: when the cache is used, invalidated or bypassed."""
+import pandas as pd
+import pytest
+import requests
+
+from cowidev.utils.web import download
+
+
+URL = "https://example.com/data.csv"
+
+
+class _Head:
+    def __init__(self, etag, ok=True):
+        self.ok = ok
+        self.headers = {"ETag": etag} if etag else {}
+
+
+@pytest.fixture
+def head(monkeypatch):
+    """Set `head.response` (or `head.error`) to control the HEAD request."""
+
+    def _head(url, **kwargs):
+        if _head.error:
+            raise _head.error
+        return _head.response
+
+    _head.response, _head.error = _Head('"v1"'), None
+    monkeypatch.setattr(download.requests, "head", _head)
+    return _head
+
+
+@pytest.fixture
+def reader():
+    """Reader of the remote file, counting its calls."""
+
+    def _reader(url, value=1):
+        _reader.calls += 1
+        return pd.DataFrame({"value": [value]})
+
+    _reader.calls = 0
+    return _reader
+
+
+def test_read_cached(head, reader, tmp_path):
+    cache_file = str(tmp_path / "cache" / "data.feather")
+    df = download.read_cached(URL, reader, cache_file)
+    assert download.read_cached(URL, reader, cache_file).equals(df)
+    assert reader.calls == 1
+    # Upstream file changed
+    head.response = _Head('"v2"')
+    download.read_cached(URL, reader, cache_file)
+    assert reader.calls == 2
+    # Reader arguments or salt changed
+    assert download.read_cached(URL, reader, cache_file, value=2).value.tolist() == [2]
+    download.read_cached(URL, reader, cache_file, salt="v2", value=2)
+    assert reader.calls == 4
+
+
+@pytest.mark.parametrize(
+    "response, error",
+    [(_Head(None), None), (_Head('"v1"', ok=False), None), (None, requests.ConnectionError())],
+)
+def test_read_cached_without_etag(head, reader, tmp_path, response, error):
+    cache_file = str(tmp_path / "data.feather")
+    download.read_cached(URL, reader, cache_file)
+    head.response, head.error = response, error
+    download.read_cached(URL, reader, cache_file)
+    download.read_cached(URL, reader, cache_file)
+    assert reader.calls == 3
@@ -0,0 +1,39 @@
+"""Golden-output test of the variants transform on a recorded CoVariants sample.
+
+`fixtures/variants/perCountryData.json` and `update.json` mimic the CoVariants files (a few countries over eight
+two-week periods, with zero totals, missing periods, several clusters mapped to the same variant, countries renamed
+by OWID and a country missing from the population file), and `population.csv` the UN population file. The expected
+variants and sequencing outputs were produced with the previous (merge-based) implementation.
+"""
+import json
+import os
+
+import pytest
+
+from cowidev.variants import etl
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "variants")
+
+
+def _read_fixture(filename):
+    with open(os.path.join(FIXTURES_DIR, filename)) as f:
+        return f.read()
+
+
+@pytest.fixture
+def covariants(monkeypatch):
+    responses = {
+        etl.VariantsETL().source_url: json.loads(_read_fixture("perCountryData.json")),
+        etl.VariantsETL().source_url_date: json.loads(_read_fixture("update.json")),
+    }
+    monkeypatch.setattr(etl, "request_json", lambda url, **kwargs: responses[url])
+    monkeypatch.setattr(etl.PATHS, "INTERNAL_INPUT_UN_POPULATION_FILE", os.path.join(FIXTURES_DIR, "population.csv"))
+
+
+def test_transform(covariants):
+    variants_etl = etl.VariantsETL()
+    df = variants_etl.transform(variants_etl.extract())
+    df_seq = variants_etl.transform_seq(df)
+    assert df.to_csv(index=False) == _read_fixture("expected.csv")
+    assert df_seq.to_csv(index=False) == _read_fixture("expected_sequencing.csv")
@@ -0,0 +1,51 @@
+"""Golden-output test of the YouGov aggregation on a synthetic survey.
+
+`fixtures/yougov/survey.csv` mimics the data returned by `YouGov.read` (individual responses of three countries over
+four months, some with less than MIN_RESPONSES answers to a question, and questions of mapping.csv without answers),
+and `vaccinations.json` the OWID vaccination variable used for the composite variables. The expected outputs were
+produced with the previous (apply-based) implementation.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+from cowidev.yougov import __main__ as yougov
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "yougov")
+
+
+class _Response:
+    ok = True
+
+    def __init__(self, content):
+        self.content = content
+
+
+@pytest.fixture
+def vaccinations(monkeypatch):
+    with open(os.path.join(FIXTURES_DIR, "vaccinations.json"), "rb") as f:
+        content = f.read()
+    monkeypatch.setattr(yougov.requests, "get", lambda url, **kwargs: _Response(content))
+
+
+def _read_survey():
+    dtypes = yougov.YouGov(output_path=FIXTURES_DIR).columns_dtypes
+    return pd.read_csv(os.path.join(FIXTURES_DIR, "survey.csv"), dtype=dtypes)
+
+
+def _read_expected(filename):
+    with open(os.path.join(FIXTURES_DIR, filename)) as f:
+        return f.read()
+
+
+def test_pipeline_csv(vaccinations):
+    df, df_comp = yougov.YouGov(output_path=FIXTURES_DIR).pipeline_csv(_read_survey())
+    assert df.to_csv(index=False) == _read_expected("expected.csv")
+    assert df_comp.to_csv(index=False) == _read_expected("expected_composite.csv")
+
+
+def test_pipeline_csv_missing_question(vaccinations):
+    with pytest.raises(KeyError, match="i12_health_1"):
+        yougov.YouGov(output_path=FIXTURES_DIR).pipeline_csv(_read_survey().drop(columns=["i12_health_1"]))